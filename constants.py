@@ -37,8 +37,11 @@ TCP_ART_TIMEOUT = 20
 # Wire protocol spoken with the Mini Dock app. 2 added the art_id handshake, so
 # unchanged album art is not re-sent on every play/pause event. 3 added the IDLE
 # status, pushed when Windows has no media session, and UDP discovery. 4 added
-# the `light` field, driving the dock's ambient light from the artwork.
-PROTOCOL_VERSION = 4
+# the `light` field, driving the dock's ambient light from the artwork. 5 added
+# the binary header, for devices that report 5 - see device_link.py. 6 added the
+# watch connection, over which the dock reports back - see DockWatch. 7 added
+# the `progress` field, from which the dock draws its own position bar.
+PROTOCOL_VERSION = 7
 
 # Ambient light brightness, 0-100, as the dock's peripherals API takes it. Only
 # a default: the value in use is per-installation, via settings.py. 60 rather
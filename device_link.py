@@ -1,14 +1,24 @@
 """The Now Playing wire protocol, as spoken to the Mini Dock.
 
 Header is one line of JSON; the device replies with a JSON ack that says whether
-it already holds the artwork, and reports its own panel geometry.
+it already holds the artwork, and reports its own panel geometry. A device that
+reports proto 5 or later is sent a compact binary header instead - see
+encode_binary_header(). One that reports 6 or later also takes a watch
+connection, held open for it to report back on - see DockWatch.
 """
 
+import asyncio
 import json
 import logging
+import random
 import socket
+import struct
+import time
+from collections import deque
+from collections.abc import Callable
 from dataclasses import dataclass
 
+import metrics
 import settings
 from constants import (
     FRAME_SIZE_DEFAULT,
@@ -16,10 +26,166 @@ from constants import (
     TCP_ART_TIMEOUT,
     TCP_TIMEOUT,
 )
+from media_image import content_box
 
 logger = logging.getLogger(__name__)
 
 
+# Proto 5: the device also takes a binary header, which it parses in place
+# rather than through readline(), decode() and json.loads() - three heap
+# allocations per push on a device where each collection they bring closer
+# freezes the panel. Only used once the device has said it understands it, so
+# the first push to any device is always JSON.
+BINARY_HEADER_PROTO = 5
+
+# The binary header. A JSON header always opens with '{', so the first byte
+# alone tells the two apart.
+#
+#   magic u8, layout u8, body length u16, then the body:
+#   status u8, light mode u8, r u8, g u8, b u8, level u8, width u16, height u16,
+#   image_len u32, rect x, y, width, height (u16 each, width 0 for none),
+#   text revision u16 (0 for none), progress position ms u32, duration ms u32,
+#   rate u16 (thousandths; duration 0 for none), art_id (u8 length + ASCII),
+#   title, artist, album (each u16 length + UTF-8). All little-endian.
+BINARY_MAGIC = 0xB5
+BINARY_LAYOUT = 3
+_BINARY_PREFIX = struct.Struct('<BBH')
+_BINARY_FIXED = struct.Struct('<BBBBBBHHIHHHHHIIH')
+# The largest value each field of _BINARY_FIXED can carry, in order.
+_BINARY_LIMITS = tuple((1 << 8 * struct.calcsize(code)) - 1 for code in _BINARY_FIXED.format[1:])
+
+# Status by its code in the binary header. Anything not here goes as JSON.
+BINARY_STATUSES = ('', 'PLAYING', 'PAUSED', 'STOPPED', 'CLOSED', 'OPENED', 'CHANGING', 'IDLE')
+
+# Light modes: absent leaves the light alone, release hands it back, colour owns
+# it. The same three states as the JSON field's absent / null / [r, g, b, level].
+LIGHT_ABSENT, LIGHT_RELEASE, LIGHT_COLOUR = 0, 1, 2
+
+
+def encode_binary_header(header: dict) -> bytes | None:
+    """The binary form of a push header, or None if it can only go as JSON."""
+    status = header.get('status') or ''
+    if status not in BINARY_STATUSES:
+        return None
+    art_id = header.get('art_id') or ''
+    if not art_id.isascii() or len(art_id) > 0xFF:
+        return None
+    art_bytes = art_id.encode('ascii')
+
+    if 'light' not in header:
+        light_mode, light = LIGHT_ABSENT, (0, 0, 0, 0)
+    elif header['light'] is None:
+        light_mode, light = LIGHT_RELEASE, (0, 0, 0, 0)
+    else:
+        light_mode, light = LIGHT_COLOUR, tuple(int(value) for value in header['light'])
+    rect = tuple(header.get('rect') or (0, 0, 0, 0))
+    progress = tuple(header.get('progress') or (0, 0, 0))
+    if len(light) != 4 or len(rect) != 4 or len(progress) != 3:
+        return None
+    fields = (
+        BINARY_STATUSES.index(status),
+        light_mode,
+        *light,
+        int(header.get('width') or 0),
+        int(header.get('height') or 0),
+        int(header.get('image_len') or 0),
+        *rect,
+        int(header.get('text_rev') or 0),
+        *progress,
+    )
+    # JSON carries anything; this only what each field's width does.
+    if not all(0 <= value <= limit for value, limit in zip(fields, _BINARY_LIMITS, strict=True)):
+        return None
+
+    body = bytearray(_BINARY_FIXED.pack(*fields))
+    body += bytes((len(art_bytes),)) + art_bytes
+    for key in ('title', 'artist', 'album'):
+        text = (header.get(key) or '').encode('utf-8')
+        body += struct.pack('<H', len(text)) + text
+    if len(body) > 0xFFFF:
+        return None
+    return _BINARY_PREFIX.pack(BINARY_MAGIC, BINARY_LAYOUT, len(body)) + bytes(body)
+
+
+def decode_binary_header(body: bytes) -> dict:
+    """The header dict a binary body stands for. Raises ValueError if malformed.
+
+    The device parses its own copy in place; this one is for the stand-in dock
+    in tools/, and for checking the two ends agree.
+    """
+    try:
+        status, light_mode, red, green, blue, level, width, height, image_len, *rest = _BINARY_FIXED.unpack_from(body)
+        rect, text_rev, progress = rest[:4], rest[4], rest[5:]
+        offset = _BINARY_FIXED.size
+        art_len = body[offset]
+        art_id = bytes(body[offset + 1 : offset + 1 + art_len]).decode('ascii') or None
+        offset += 1 + art_len
+        header = {
+            'status': BINARY_STATUSES[status],
+            'art_id': art_id,
+            'width': width,
+            'height': height,
+            'image_len': image_len,
+        }
+        for key in ('title', 'artist', 'album'):
+            (length,) = struct.unpack_from('<H', body, offset)
+            offset += 2
+            header[key] = bytes(body[offset : offset + length]).decode('utf-8')
+            offset += length
+        if offset != len(body):
+            raise ValueError('trailing bytes')
+    except (struct.error, IndexError, UnicodeDecodeError) as exc:
+        raise ValueError(f'bad binary header: {exc}') from exc
+    if rect[2]:
+        header['rect'] = rect
+    if text_rev:
+        header['text_rev'] = text_rev
+    if progress[1]:
+        header['progress'] = progress
+    if light_mode == LIGHT_RELEASE:
+        header['light'] = None
+    elif light_mode == LIGHT_COLOUR:
+        header['light'] = [red, green, blue, level]
+    return header
+
+
+def progress_for(timeline, playing: bool) -> list[int]:
+    """A Timeline as the header's `progress`: [position ms, duration ms, rate].
+
+    The rate is in thousandths, and 0 unless playing. Worked out at send time,
+    so the device counts on from the moment the header lands and never needs a
+    clock that agrees with this one.
+    """
+    position = timeline.position_at(playing) - timeline.start
+    rate = max(timeline.rate, 0.0) if playing else 0.0
+    return [max(round(position * 1000), 0), max(round(timeline.duration * 1000), 0), round(rate * 1000)]
+
+
+# Proto 6: the device takes a watch connection. See DockWatch.
+WATCH_PROTO = 6
+
+# Proto 7: the device draws a position bar from the header's `progress`.
+PROGRESS_PROTO = 7
+
+# The device pings a watch connection every 5 seconds. Silence for this long
+# means it is gone - rebooted, off the network, or the app closed - without
+# having been able to say so.
+WATCH_TIMEOUT = 12
+
+# Between attempts to open a watch connection, doubling up to the maximum while
+# the device stays unreachable: a dock that is switched off should not be
+# connected to every two seconds all evening.
+WATCH_RETRY_SECONDS = 2
+WATCH_RETRY_MAX_SECONDS = 60
+
+# Exchanges kept for the diagnostics window. See PushRecord.
+PUSH_HISTORY = 50
+
+# How much each exchange moves DeviceLink.handshake_cost. Enough that a dock
+# gone slow shows within a few pushes, not so much that one stall is the rate.
+HANDSHAKE_COST_WEIGHT = 0.25
+
+
 @dataclass(frozen=True)
 class SendResult:
     """Outcome of a push, carrying enough detail for the UI to explain itself."""
@@ -31,19 +197,83 @@ class SendResult:
         return self.ok
 
 
+@dataclass(frozen=True)
+class PushRecord:
+    """One exchange with the device, as the diagnostics window lists it.
+
+    The histograms in metrics say how pushes go in general; these say how the
+    last few went, which is what someone looking at a slow dock right now is
+    asking.
+    """
+
+    at: float  # time.time()
+    ok: bool
+    handshake: float | None = None  # seconds, connect to first ack
+    body: float | None = None  # seconds, frame sent to final ack; None for no frame
+    frame_bytes: int = 0
+    dock_kbps: float | None = None  # the device's own receive rate, where it reports one
+    error: str | None = None
+
+
 class DeviceLink:
     """Talks the Now Playing wire protocol to the Mini Dock.
 
     Holds the last artwork the device acknowledged so unchanged album art is not
     re-sent. That matters because playback_info_changed fires on every play,
     pause and seek - previously each one pushed a fresh 150KB frame.
+
+    Panel geometry is remembered per address rather than for the link as a
+    whole, so moving between docks of different sizes starts each one at the
+    size it last reported instead of at the default, which it would only reject.
     """
 
     def __init__(self, host: str | None = None, port: int | None = None):
         self.host = host if host is not None else settings.device_host()
         self.port = port if port is not None else settings.device_port()
-        self.frame_size = FRAME_SIZE_DEFAULT
         self._device_art_id: str | None = None
+        self._frame_sizes: dict[tuple[str, int], tuple[int, int]] = {}
+        # Protocol version each device last reported, by address, which is what
+        # decides whether it is sent the binary header.
+        self._protocols: dict[tuple[str, int], int] = {}
+        # Bumped whenever title, artist or album differ from the last push, so
+        # the device can tell unchanged text from the number alone and skip
+        # decoding and laying it out. Starts anywhere, so a restarted client is
+        # unlikely to reuse the number the device last saw with other text.
+        self._text: tuple | None = None
+        self._text_rev = random.randrange(1, 0x10000)
+        # content_box() of the last frame sent, by the frame itself. The same
+        # bytes object comes back from the frame cache on every push of a track.
+        self._boxed: tuple[bytes, tuple[int, int, int, int] | None] | None = None
+        # Called with the new (width, height) when an ack reports a geometry
+        # other than the one frames were being encoded for. Runs inside send(),
+        # so whoever sets it owns keeping it cheap - it is for starting work,
+        # not doing it.
+        self.on_frame_size: Callable[[tuple[int, int]], None] | None = None
+        # What the device reported about the last frame it received. See
+        # _record_dock_stats().
+        self.last_dock_stats: dict | None = None
+        # The last few exchanges. Appended to by the worker and copied whole by
+        # the GUI thread, which a deque allows without a lock.
+        self.recent_pushes: deque[PushRecord] = deque(maxlen=PUSH_HISTORY)
+        # See handshake_cost.
+        self._handshake_cost: float | None = None
+
+    @property
+    def frame_size(self) -> tuple[int, int]:
+        """Geometry the current device last reported, or the default if it has not."""
+        return self._frame_sizes.get((self.host, self.port), FRAME_SIZE_DEFAULT)
+
+    def restore(self, frame_size: tuple[int, int], protocol: int) -> None:
+        """Start from what an earlier run learned about the current device.
+
+        Only fills in what this run has not heard yet, and the first ack
+        corrects both. The protocol matters most: it is what lets the first
+        push use the binary header and the watch connection open at once,
+        rather than after a JSON exchange has found out.
+        """
+        address = (self.host, self.port)
+        self._frame_sizes.setdefault(address, frame_size)
+        self._protocols.setdefault(address, protocol)
 
     def set_address(self, host: str, port: int) -> None:
         """Point at a different device, forgetting what the old one held."""
@@ -53,7 +283,11 @@ class DeviceLink:
         self.host = host
         self.port = port
         self._device_art_id = None
-        self.frame_size = FRAME_SIZE_DEFAULT
+
+    @property
+    def protocol(self) -> int:
+        """Protocol version the current device last reported, 0 if unknown."""
+        return self._protocols.get((self.host, self.port), 0)
 
     @property
     def device_art_id(self) -> str | None:
@@ -66,6 +300,17 @@ class DeviceLink:
         """
         return self._device_art_id
 
+    @property
+    def handshake_cost(self) -> float | None:
+        """What an exchange without a frame has been costing, in seconds.
+
+        A moving average of connect to first ack, over exchanges that went
+        through. One that failed says how long the timeout is, not what the
+        link costs, and counting it would keep pushes slowed for a good while
+        after the dock came back. None until the first exchange goes through.
+        """
+        return self._handshake_cost
+
     def _read_ack(self, sock: socket.socket, buffer: bytearray) -> dict:
         """Read one newline-terminated JSON object, keeping any trailing bytes."""
         while b'\n' not in buffer:
@@ -77,34 +322,150 @@ class DeviceLink:
         buffer[:] = rest
         return json.loads(line.decode('utf-8'))
 
+    def _record_dock_stats(self, stats, frame_len: int) -> float | None:
+        """File the device's own account of a frame next to ours.
+
+        Returns the receive rate it implies, in KB/s, if there is one.
+
+        The body time measured here ends when the device acks, so it already
+        contains everything below - but only the device can say how much of it
+        was the network, how much was putting the frame on screen, and whether a
+        garbage collection got in the way. Absent from devices that predate it.
+        """
+        if not isinstance(stats, dict):
+            self.last_dock_stats = None
+            return None
+        self.last_dock_stats = stats
+        logger.debug('Device stats: %s', stats)
+        for name, key in (('dock.receive', 'recv_ms'), ('dock.swap', 'swap_ms')):
+            seconds = _ms(stats.get(key))
+            if seconds is not None:
+                metrics.observe(name, seconds)
+        kbps = None
+        recv_ms = stats.get('recv_ms')
+        if isinstance(recv_ms, int | float) and recv_ms > 0:
+            kbps = round(frame_len / recv_ms * 1000 / 1024, 1)
+            metrics.set_gauge('dock.receive_kbps', kbps)
+        if isinstance(stats.get('reads'), int):
+            metrics.set_gauge('dock.reads_per_frame', stats['reads'])
+        if isinstance(stats.get('heap_free'), int):
+            metrics.set_gauge('dock.heap_free', stats['heap_free'])
+        if isinstance(stats.get('area'), int) and frame_len:
+            # Share of the panel redrawn for the frame; under 1 when only the
+            # artwork inside its letterboxing was.
+            metrics.set_gauge('dock.redraw_fraction', round(stats['area'] * 2 / frame_len, 3))
+        gc_seconds = _ms(stats.get('gc_ms'))
+        if stats.get('gc') and gc_seconds is not None:
+            metrics.increment('dock.collections')
+            metrics.observe('dock.gc', gc_seconds)
+        return kbps
+
+    def _content_rect(self, image_bytes, width, height) -> list[int] | None:
+        """The `rect` header field for a frame: where it is not letterbox black.
+
+        None when that is the whole frame, which tells the device nothing it
+        would act on.
+        """
+        if not image_bytes or not width or not height or len(image_bytes) != width * height * 2:
+            return None
+        if self._boxed is None or self._boxed[0] is not image_bytes:
+            self._boxed = (image_bytes, content_box(image_bytes, width, height))
+        box = self._boxed[1]
+        if box is None or box == (0, 0, width, height):
+            return None
+        return list(box)
+
+    def _text_revision(self, meta: dict) -> int:
+        """The revision of meta's title, artist and album. 1-65535, wrapping."""
+        text = (meta.get('title'), meta.get('artist'), meta.get('album'))
+        if text != self._text:
+            self._text = text
+            self._text_rev = self._text_rev % 0xFFFF + 1
+        return self._text_rev
+
     def send(self, meta: dict, image_bytes: bytes | None) -> SendResult:
+        """One update: the header, then the frame if the device asks for it."""
+        record = {}
+        started = time.perf_counter()
+        result = self._exchange(meta, image_bytes, record)
+        if result.ok:
+            cost = record.get('handshake', time.perf_counter() - started)
+            if self._handshake_cost is None:
+                self._handshake_cost = cost
+            else:
+                self._handshake_cost += (cost - self._handshake_cost) * HANDSHAKE_COST_WEIGHT
+        self.recent_pushes.append(
+            PushRecord(
+                at=time.time(),
+                ok=result.ok,
+                handshake=record.get('handshake'),
+                body=record.get('body'),
+                frame_bytes=record.get('frame_bytes', 0),
+                dock_kbps=record.get('dock_kbps'),
+                error=result.error,
+            )
+        )
+        return result
+
+    def _exchange(self, meta: dict, image_bytes: bytes | None, record: dict) -> SendResult:
         art_id = meta.get('art_id')
         header = dict(meta)
         header['proto'] = PROTOCOL_VERSION
         header['image_len'] = len(image_bytes) if image_bytes else 0
-
+        header['text_rev'] = self._text_revision(meta)
+        timeline = header.pop('timeline', None)
+        if timeline is not None:
+            header['progress'] = progress_for(timeline, header.get('status') == 'PLAYING')
+        rect = self._content_rect(image_bytes, meta.get('width'), meta.get('height'))
+        if rect is not None:
+            header['rect'] = rect
+
+        address = (self.host, self.port)
+        encoded = None
+        if self._protocols.get(address, 0) >= BINARY_HEADER_PROTO:
+            encoded = encode_binary_header(header)
+        binary = encoded is not None
+        if not binary:
+            encoded = json.dumps(header).encode('utf-8') + b'\n'
+
+        started = time.perf_counter()
         try:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
                 sock.settimeout(TCP_TIMEOUT)
-                sock.connect((self.host, self.port))
+                sock.connect(address)
 
-                sock.sendall(json.dumps(header).encode('utf-8') + b'\n')
+                sock.sendall(encoded)
                 buffer = bytearray()
                 ack = self._read_ack(sock, buffer)
+                record['handshake'] = time.perf_counter() - started
+                metrics.observe('push.handshake', record['handshake'])
+                metrics.increment('push.binary_headers' if binary else 'push.json_headers')
                 logger.debug('Device ack: %s', ack)
 
+                proto = ack.get('proto')
+                if isinstance(proto, int):
+                    self._protocols[address] = proto
+                if binary and ack.get('error') == 'bad header':
+                    # Reported a version it cannot parse: the app was swapped
+                    # for an older one behind the same address. Back to JSON.
+                    logger.warning('Device did not understand the binary header; using JSON')
+                    self._protocols.pop(address, None)
+
                 # Adopt whatever geometry the device reports so a panel that is
                 # not 320x240 still gets correctly sized frames next time.
                 width, height = ack.get('w'), ack.get('h')
                 if width and height and (width, height) != self.frame_size:
                     logger.info('Device frame size is %dx%d', width, height)
-                    self.frame_size = (width, height)
+                    self._frame_sizes[(self.host, self.port)] = (width, height)
                     self._device_art_id = None
+                    if self.on_frame_size is not None:
+                        self.on_frame_size((width, height))
 
                 if not ack.get('ok', False):
                     error = ack.get('error') or 'Device rejected the update'
                     logger.warning('Device rejected update: %s', error)
                     self._device_art_id = None
+                    metrics.increment('push.rejected')
                     return SendResult(False, error)
 
                 if ack.get('send_art'):
@@ -114,25 +475,144 @@ class DeviceLink:
                         return SendResult(False, 'Device asked for artwork we do not have')
                     # Past the handshake now; the body needs a real budget.
                     sock.settimeout(TCP_ART_TIMEOUT)
+                    body_started = time.perf_counter()
                     sock.sendall(image_bytes)
                     final = self._read_ack(sock, buffer)
+                    record['body'] = time.perf_counter() - body_started
+                    record['frame_bytes'] = len(image_bytes)
+                    metrics.observe('push.body', record['body'])
                     if not final.get('ok', False):
                         error = final.get('error') or 'Device rejected the artwork'
                         logger.warning('Device rejected artwork: %s', error)
                         self._device_art_id = None
+                        metrics.increment('push.rejected')
                         return SendResult(False, error)
                     logger.debug('Sent %d bytes of artwork', len(image_bytes))
+                    record['dock_kbps'] = self._record_dock_stats(final.get('stats'), len(image_bytes))
+                    metrics.increment('push.frames')
+                    metrics.increment('push.frame_bytes', len(image_bytes))
 
                 # Device is now known to hold this artwork (or none at all).
                 self._device_art_id = art_id
+                metrics.increment('push.ok')
+                metrics.observe('push.total', time.perf_counter() - started)
                 return SendResult(True)
         except Exception as exc:  # noqa: BLE001 - any failure here just means "resend everything"
             # Force a full resend once the device is reachable again.
             self._device_art_id = None
+            metrics.increment('push.failed')
             logger.warning('Send to %s:%d failed: %s', self.host, self.port, exc)
             return SendResult(False, describe_socket_error(exc))
 
 
+class DockWatch:
+    """A connection held open to the device, for it to report back on.
+
+    Everything else in the protocol is the client asking, so a client had no
+    way to learn that the dock restarted, or lost its picture, except by
+    pushing again on a timer and seeing whether it asked for the frame. Over
+    this the device says so itself, and passes on its own controls:
+
+        -> {"watch": true, "proto": 6}\\n
+        <- {"ok": true, "event": "hello", "art_id", "fresh", "proto"}\\n
+        <- {"event": "ping"}\\n                           every 5 seconds
+        <- {"event": "resumed"}\\n                        app back in front
+        <- {"event": "command", "command": "next"}\\n     knob or button
+
+    `fresh` is true until the device has shown a push since it started, so a
+    hello that is fresh, or holds other artwork than was last sent, is a dock
+    that needs the current state again. The connection dropping, or going
+    quiet for WATCH_TIMEOUT, is reported as a "lost" event before retrying.
+
+    Only opened to a device that has reported WATCH_PROTO in an ack. Runs on
+    the worker's loop, with asyncio's own streams: it spends nearly all its
+    time waiting, and must never hold the loop while it does.
+    """
+
+    def __init__(self, link: DeviceLink, on_event: Callable[[dict], None]):
+        self.link = link
+        self.on_event = on_event
+        self.connected = False
+        self._task: asyncio.Task | None = None
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        task, self._task = self._task, None
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+        # Cancelled mid-connection, _run() never got to say so.
+        self._lost()
+
+    async def restart(self):
+        """Drop the connection, if any, and open one to wherever the link now points."""
+        await self.stop()
+        self.start()
+
+    async def _run(self):
+        delay = WATCH_RETRY_SECONDS
+        while True:
+            if not self.link.host or self.link.protocol < WATCH_PROTO:
+                # Not known to be a device that can; the next successful push
+                # says whether it is.
+                await asyncio.sleep(WATCH_RETRY_SECONDS)
+                continue
+            try:
+                await self._watch(self.link.host, self.link.port)
+                delay = WATCH_RETRY_SECONDS
+            except (OSError, TimeoutError, ValueError) as exc:
+                logger.debug('Watch connection to %s:%d: %s', self.link.host, self.link.port, exc)
+            if self._lost():
+                # Straight back: an app restart drops the connection and is
+                # listening again within moments. Backing off is for failures.
+                continue
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, WATCH_RETRY_MAX_SECONDS)
+
+    def _lost(self) -> bool:
+        """Report a connection that was up as gone. Whether one was."""
+        if not self.connected:
+            return False
+        self.connected = False
+        metrics.increment('watch.lost')
+        self.on_event({'event': 'lost'})
+        return True
+
+    async def _watch(self, host: str, port: int):
+        reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), TCP_TIMEOUT)
+        try:
+            writer.write(json.dumps({'watch': True, 'proto': PROTOCOL_VERSION}).encode('utf-8') + b'\n')
+            await writer.drain()
+            while True:
+                line = await asyncio.wait_for(reader.readline(), WATCH_TIMEOUT)
+                if not line:
+                    logger.debug('Device closed the watch connection')
+                    return
+                event = json.loads(line.decode('utf-8'))
+                if not self.connected:
+                    if not event.get('ok', False):
+                        raise ValueError(event.get('error') or 'watch refused')
+                    self.connected = True
+                    metrics.increment('watch.connected')
+                    logger.info('Watching %s:%d', host, port)
+                if event.get('event') != 'ping':
+                    logger.debug('Device event: %s', event)
+                    self.on_event(event)
+        finally:
+            writer.close()
+
+
+def _ms(value) -> float | None:
+    return value / 1000 if isinstance(value, int | float) else None
+
+
 def probe(host: str, port: int, timeout: float = TCP_TIMEOUT) -> SendResult:
     """Check the device is listening, without disturbing what it is showing.
 
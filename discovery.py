@@ -13,6 +13,8 @@ import socket
 import time
 from dataclasses import dataclass
 
+import metrics
+
 logger = logging.getLogger(__name__)
 
 # Must match DISCOVERY_PORT / DISCOVERY_MAGIC in the Mini Dock app.
@@ -48,6 +50,8 @@ def discover(timeout: float = DEFAULT_TIMEOUT) -> list[Device]:
 
     Blocking - call it off the GUI thread.
     """
+    started = time.monotonic()
+    metrics.increment('discovery.searches')
     # Resolved once and threaded through: it is a host name lookup, and both the
     # sockets and the reply preference are derived from it.
     local_addresses = _local_addresses()
@@ -88,6 +92,10 @@ def discover(timeout: float = DEFAULT_TIMEOUT) -> list[Device]:
                 device = _parse_reply(data, addr)
                 if device is None:
                     continue
+                if not found:
+                    # The search itself always runs its full timeout; this is
+                    # how much of it was actually needed.
+                    metrics.observe('discovery.first_reply', time.monotonic() - started)
                 # One dock answers once per interface the probe went out on, so
                 # the same device can arrive under several addresses. Collapse
                 # on its id and keep the address we are most likely to reach.
@@ -104,6 +112,7 @@ def discover(timeout: float = DEFAULT_TIMEOUT) -> list[Device]:
                 sock.close()
             except OSError:
                 pass
+        metrics.observe('discovery.search', time.monotonic() - started)
 
 
 def _parse_reply(data: bytes, addr) -> Device | None:
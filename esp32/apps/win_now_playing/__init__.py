@@ -17,10 +17,19 @@ Memory design (the reason this file looks the way it does):
     pixels LVGL is still drawing from.
   * The two buffers swap: the network fills the back buffer while LVGL displays
     the front one, so a partially received frame is never on screen.
+  * Unless the heap cannot spare the second 150KB, or the user has asked it not
+    to - then there is one buffer, and the frame streams into the one on screen.
+    See _allocate_back_buffer() for what that costs.
+  * Except when only part of the picture changed. Square artwork on a 4:3 panel
+    sits between black bars that are identical from one cover to the next, so
+    that frame is copied across inside the bars and only that rectangle is
+    redrawn - see _present_frame().
   * The socket reads straight into a slice of the back buffer, so receiving a
     frame allocates nothing of consequence. Reading into fresh bytes objects and
     copying instead produced ~150KB of garbage per frame, and gc.collect() costs
     200-280ms here - see _read_frame().
+  * Collections are scheduled rather than run where the garbage was made, so
+    they land while nothing is arriving - see run_gc_scheduler().
 
 Frame transfer, measured on firmware v1.2.6 over WiFi at -50dBm. Recorded so the
 obvious next lever is not pulled for nothing:
@@ -97,8 +106,11 @@ logger = logging.getLogger(NAME.lower().replace(' ', '_'))
 # the UDP discovery service below. 4 adds the `light` header field, driving the
 # ambient light from the artwork. Both ends ignore each other's version field, so
 # an older client still works - it simply never sends IDLE or `light`, and a
-# missing `light` is defined to mean "leave the light alone".
-PROTOCOL_VERSION = 4
+# missing `light` is defined to mean "leave the light alone". 5 adds the binary
+# header, which a client only sends once it has seen 5 in an ack - see
+# _parse_binary_header(). 6 adds the watch connection - see _serve_watch(). 7
+# adds the `progress` field, for the position bar - see _apply_progress().
+PROTOCOL_VERSION = 7
 
 DEFAULT_PORT = 32150
 
@@ -110,9 +122,33 @@ DISCOVERY_MAGIC = b'VOBOT-NOW-PLAYING-DISCOVER'
 DISCOVERY_REPLY_MAGIC = 'VOBOT-NOW-PLAYING'
 # A probe is a short fixed string; anything longer is not for us.
 MAX_PROBE = 256
+# How often to check for a probe, on asyncio builds that cannot wait for one -
+# see _io_readable(). The client waits well over a second for replies.
+DISCOVERY_POLL_MS = 150
+
+# A watch connection is pinged this often, which is how a client learns the
+# dock has gone without being able to say so. Must stay well inside the
+# client's WATCH_TIMEOUT.
+WATCH_PING_MS = 5000
+# One per client, and a second for the moment a client reconnects before the
+# dock has noticed its last connection is dead.
+MAX_WATCHERS = 2
 
 # Anything longer than this is not a header we sent for.
 MAX_HEADER = 1024
+
+# Proto 5 binary header: magic, layout, u16 body length, then the body - see
+# _parse_binary_header() for the fields. A JSON header always opens with '{',
+# so the first byte says which one is arriving.
+BINARY_MAGIC = 0xB5
+BINARY_LAYOUT = 3
+BINARY_PREFIX = 4
+# Status by its code in the binary header. Must match BINARY_STATUSES in the
+# client's device_link.py.
+BINARY_STATUSES = ('', 'PLAYING', 'PAUSED', 'STOPPED', 'CLOSED', 'OPENED', 'CHANGING', 'IDLE')
+# Bytes ahead of the art_id: status, light mode, r, g, b, level, width, height,
+# image_len, rect, text revision, progress.
+BINARY_FIXED = 34
 # Body copy granularity. Small transient allocations the GC handles trivially,
 # versus the ~150KB temporaries that repeated `buf += chunk` would produce.
 CHUNK = 2048
@@ -141,6 +177,45 @@ def _screen_resolution():
 FRAME_W, FRAME_H = _screen_resolution()
 FRAME_SIZE = FRAME_W * FRAME_H * 2  # RGB565, 2 bytes/pixel
 
+# Garbage collection. A collection stops everything here - the scroll, the
+# socket, the next exchange - for 200-280ms, and MicroPython's collector is not
+# generational: every one marks and sweeps the whole heap, so there is no small,
+# cheap collection to run instead of a big one. What this app can choose is
+# when. A frame change asks for one; run_gc_scheduler() runs it once the client
+# has gone quiet, rather than between the frame and the header-only pushes that
+# follow it while the client is still settling on the track.
+GC_POLL_MS = 250
+# No exchange for this long counts as quiet. The client's artwork chase pushes
+# every 150ms or so for a few reads after a track change, then stops.
+GC_QUIET_MS = 1500
+# A collection put off this long runs at the next gap between exchanges, quiet
+# or not, so a client that never stops talking cannot starve it.
+GC_MAX_DEFER_MS = 15000
+# Below this much free heap, a collection that is due runs at the first gap
+# rather than waiting for quiet. Well above anything one exchange allocates, so
+# the automatic collection - which runs inside whatever allocation tripped it,
+# mid-transfer included - is not reached.
+GC_LOW_HEAP = 48 * 1024
+# Allocation between automatic collections while the app runs. A backstop, set
+# so the scheduler gets there first: the receive path allocates next to nothing
+# per frame, so this only trips if something else starts producing garbage.
+# The firmware's own value is put back in on_stop().
+GC_THRESHOLD = 96 * 1024
+
+# The position bar. One step per pixel across the panel, so the bar is only
+# redrawn when it would visibly move: on a three minute track that is under
+# twice a second, and on an hour-long one every eleven seconds.
+PROGRESS_STEPS = FRAME_W
+# The shortest wait between two steps, for short tracks, where a step per pixel
+# would be more redraws than anyone could see.
+PROGRESS_TICK_MS = 500
+PROGRESS_H = 3
+
+# Free heap that must remain after the second frame buffer for it to be
+# allocated. Below this the app runs single-buffered rather than leave the other
+# apps, and its own exchanges, too little to work in.
+DOUBLE_BUFFER_HEADROOM = 64 * 1024
+
 
 # ---------------------------------------------------------------------------
 # Ambient light
@@ -204,6 +279,10 @@ def _apply_light(spec):
         return
     if not light_available:
         return
+    if light_owned and spec is light_state:
+        # A binary header hands back the applied tuple itself when the colour
+        # is unchanged, which is most pushes - see _parse_binary_header().
+        return
 
     try:
         red, green, blue, level = (int(v) for v in spec)
@@ -284,9 +363,13 @@ artist_label = None
 state_label = None  # play/pause glyph badge
 status_label = None  # centred error text
 placeholder = None  # app mark, shown whenever there is no artwork
+progress_bar = None  # playback position, along the top edge of info_bar
 
 canvas_buf = None  # front buffer - what LVGL is displaying
-back_buf = None  # back buffer - what the socket streams into
+back_buf = None  # back buffer - what the socket streams into; canvas_buf itself when single-buffered
+# (x, y, w, h) outside which canvas_buf is known to be black, or None when it is
+# not - the placeholder ground, or a frame that came without a `rect`.
+canvas_rect = None
 
 server = None
 server_task = None
@@ -298,6 +381,14 @@ discovery_socket = None
 discovery_task = None
 discovery_running = False
 
+# Writers of the clients' open watch connections. See _serve_watch().
+watchers = []
+# Whether a push has been shown since on_start(). A watching client that sees
+# this false knows the dock has nothing of its to show.
+shown_push = False
+# Key code -> transport command, filled in by _bind_keys().
+_key_commands = {}
+
 art_id = None  # id of the artwork currently in canvas_buf
 have_art = False
 # Whether the canvas already holds the placeholder ground. Repainting it is a
@@ -308,6 +399,45 @@ ground_is_idle = False
 # What is currently on the widgets, so repeat pushes become no-ops. See
 # _set_label() for why writing the same value again is not harmless.
 _shown = {}
+# The subtitle last built from (artist, album), so a repeat push does not
+# format a new string only for _set_label() to find it unchanged.
+_subtitle_from = None
+_subtitle = ''
+
+# Binary headers are read into this and parsed where they lie. Module globals
+# for the same reason as the frame buffers: allocated once, at import.
+_header_buf = bytearray(MAX_HEADER)
+_header_view = memoryview(_header_buf)
+# What _parse_binary_header() fills in: one dict, reused for every push.
+_binary_meta = {}
+# The raw bytes behind each string in _binary_meta, so an unchanged field keeps
+# the str it already decoded instead of decoding a new one.
+_binary_raw = {}
+_binary_rect = None  # the rect tuple last parsed, reused while it is unchanged
+# Text revision behind the strings in _binary_meta; 0 when they have none.
+_binary_text_rev = 0
+# The `progress` of a binary header, filled in place rather than rebuilt.
+_binary_progress = [0, 0, 0]
+
+# The last collection the scheduler ran, reported in the next frame's final
+# ack. It runs after the exchange that asked for it has closed, so that one can
+# never report it itself.
+last_gc_ms = None
+collected = False  # a collection has run since the last report
+gc_task = None
+gc_due_since = None  # ticks_ms of the frame change still waiting on a collection
+last_exchange = 0  # ticks_ms an exchange last started or finished
+gc_threshold_saved = None  # the firmware's threshold, to restore on stop
+
+# The last `progress` anchor: position and duration in ms, rate in thousandths
+# (0 while not playing), and the ticks_ms it arrived at. run_progress() counts
+# on from it, so the client never has to push just to move the bar.
+progress_position = 0
+progress_duration = 0  # 0 for no bar
+progress_rate = 0
+progress_at = 0
+progress_task = None
+progress_wake = None  # set when the bar may have started moving
 
 # Bumped on teardown. An exchange that was in flight when the app stopped keeps
 # its own reference to the buffer it was filling, so its writes land somewhere
@@ -343,16 +473,97 @@ def _blank(buf):
 
 def _swap_frame():
     """Show the back buffer and hand the old front buffer back for reuse."""
-    global canvas_buf, back_buf
+    global canvas_buf, back_buf, canvas_rect
     if not (canvas and back_buf):
         return
     canvas.set_buffer(back_buf, FRAME_W, FRAME_H, lv.COLOR_FORMAT.RGB565)
     canvas_buf, back_buf = back_buf, canvas_buf
+    canvas_rect = None
     canvas.invalidate()
 
 
+def _present_frame(rect):
+    """Put the frame received into back_buf on screen. Returns pixels redrawn.
+
+    set_buffer() invalidates the whole canvas, and a full-screen redraw is
+    ~33ms of SPI. When the outgoing and incoming frames are both black outside
+    a known rectangle, everything outside the two rectangles together is the
+    same on both, so only that region is copied into the front buffer and
+    invalidated. The copy is synchronous - LVGL cannot draw halfway through it.
+
+    Otherwise, and for the placeholder ground, it is the usual swap.
+    """
+    global canvas_rect
+
+    old = canvas_rect
+    if rect is None or old is None or not (canvas and back_buf and canvas_buf):
+        _swap_frame()
+        canvas_rect = rect
+        return FRAME_W * FRAME_H
+
+    left = min(old[0], rect[0])
+    top = min(old[1], rect[1])
+    right = max(old[0] + old[2], rect[0] + rect[2])
+    bottom = max(old[1] + old[3], rect[1] + rect[3])
+    if back_buf is canvas_buf:
+        # Single-buffered: the frame is already where it is drawn from.
+        _invalidate_region(left, top, right, bottom)
+        canvas_rect = rect
+        return (right - left) * (bottom - top)
+
+    front = memoryview(canvas_buf)
+    back = memoryview(back_buf)
+    if left == 0 and right == FRAME_W:
+        start, end = top * FRAME_W * 2, bottom * FRAME_W * 2
+        front[start:end] = back[start:end]
+    else:
+        for row in range(top, bottom):
+            start = (row * FRAME_W + left) * 2
+            end = (row * FRAME_W + right) * 2
+            front[start:end] = back[start:end]
+    _invalidate_region(left, top, right, bottom)
+    canvas_rect = rect
+    return (right - left) * (bottom - top)
+
+
+def _invalidate_region(left, top, right, bottom):
+    """Invalidate part of the canvas, in canvas coordinates, end exclusive.
+
+    invalidate_area() takes screen coordinates, hence the canvas's own. Not
+    every binding exposes it; the whole canvas is always correct, just slower.
+    """
+    invalidate_area = getattr(canvas, 'invalidate_area', None)
+    if invalidate_area is not None:
+        try:
+            area = lv.area_t()
+            canvas.get_coords(area)
+            x, y = area.x1, area.y1
+            area.x1 = x + left
+            area.y1 = y + top
+            area.x2 = x + right - 1
+            area.y2 = y + bottom - 1
+            invalidate_area(area)
+            return
+        except Exception as exc:
+            logger.warning('Partial invalidate failed (%s); redrawing the canvas', exc)
+    canvas.invalidate()
+
+
+def _valid_rect(rect):
+    """A header's `rect` if it is a real (x, y, w, h) on this panel, else None."""
+    if not rect:
+        return None
+    try:
+        x, y, width, height = rect
+    except Exception:
+        return None
+    if width <= 0 or height <= 0 or x < 0 or y < 0 or x + width > FRAME_W or y + height > FRAME_H:
+        return None
+    return rect
+
+
 async def _read_frame(reader, buf, total):
-    """Stream `total` bytes into `buf`. Returns the number of bytes read.
+    """Stream `total` bytes into `buf`. Returns (bytes read, ms taken, reads).
 
     Reads straight into a slice of the destination through readinto(), so a whole
     frame allocates nothing but the memoryview slices - a few dozen bytes each.
@@ -397,7 +608,7 @@ async def _read_frame(reader, buf, total):
             reads,
             '' if readinto is not None else ' (no readinto)',
         )
-    return read
+    return read, elapsed, reads
 
 
 # ---------------------------------------------------------------------------
@@ -478,6 +689,8 @@ def _show_idle(title):
         _show_placeholder()
         _set_label(title_label, 'title', title)
         _set_label(artist_label, 'artist', '{}:{}'.format(_local_ip(), _configured_port()))
+        _shown['text_rev'] = None
+        _apply_progress(None)
         _set_label(state_label, 'state', lv.SYMBOL.STOP)
         _set_visible(info_bar, 'bar_shown', True)
     except Exception as exc:
@@ -486,12 +699,13 @@ def _show_idle(title):
 
 def _apply_metadata(meta):
     try:
-        artist = meta.get('artist') or ''
-        album = meta.get('album') or ''
-        if artist and album:
-            subtitle = '{} - {}'.format(artist, album)
-        else:
-            subtitle = artist or album or ''
+        # The text revision is the client's promise that title, artist and
+        # album are what it sent under that number before. When the labels
+        # already show that push, there is nothing to compare or build.
+        text_rev = meta.get('text_rev')
+        if not text_rev or _shown.get('text_rev') != text_rev:
+            _apply_text(meta)
+            _shown['text_rev'] = text_rev
 
         status = (meta.get('status') or '').lower()
         if status.startswith('play'):
@@ -501,9 +715,8 @@ def _apply_metadata(meta):
         else:
             symbol = lv.SYMBOL.STOP
 
-        _set_label(title_label, 'title', meta.get('title') or 'Unknown title')
-        _set_label(artist_label, 'artist', subtitle)
         _set_label(state_label, 'state', symbol)
+        _apply_progress(meta.get('progress'))
 
         _set_visible(info_bar, 'bar_shown', True)
         _set_visible(status_label, 'status_shown', False)
@@ -513,6 +726,78 @@ def _apply_metadata(meta):
         logger.warning('Metadata update failed: %s', exc)
 
 
+def _apply_text(meta):
+    global _subtitle_from, _subtitle
+
+    artist = meta.get('artist') or ''
+    album = meta.get('album') or ''
+    if _subtitle_from != (artist, album):
+        if artist and album:
+            _subtitle = '{} - {}'.format(artist, album)
+        else:
+            _subtitle = artist or album or ''
+        _subtitle_from = (artist, album)
+    _set_label(title_label, 'title', meta.get('title') or 'Unknown title')
+    _set_label(artist_label, 'artist', _subtitle)
+
+
+def _apply_progress(progress):
+    """Take a new `progress` anchor: [position ms, duration ms, rate], the rate
+    in thousandths and 0 while not playing. None, or a client too old to send
+    one, hides the bar."""
+    global progress_position, progress_duration, progress_rate, progress_at
+
+    if not progress or not progress_bar:
+        progress_duration = 0
+        _set_visible(progress_bar, 'progress_shown', False)
+        return
+    progress_position = progress[0]
+    progress_duration = progress[1]
+    progress_rate = progress[2]
+    progress_at = time.ticks_ms()
+    _draw_progress()
+    _set_visible(progress_bar, 'progress_shown', True)
+    if progress_rate and progress_wake:
+        progress_wake.set()
+
+
+def _draw_progress():
+    """Move the bar to where playback has reached.
+
+    Returns how long until it next moves a step, or None while it stands still.
+    """
+    duration = progress_duration
+    if duration <= 0 or not progress_bar:
+        return None
+    position = progress_position
+    if progress_rate:
+        position += time.ticks_diff(time.ticks_ms(), progress_at) * progress_rate // 1000
+    position = min(position, duration)
+    step = position * PROGRESS_STEPS // duration
+    if _shown.get('progress') != step:
+        progress_bar.set_value(step, lv.ANIM.OFF)
+        _shown['progress'] = step
+    if not progress_rate or position >= duration:
+        return None
+    return max(PROGRESS_TICK_MS, duration * 1000 // (PROGRESS_STEPS * progress_rate))
+
+
+async def run_progress():
+    """Keep the position bar moving between pushes.
+
+    The client sends one anchor per push and this counts on from it, waking
+    once per step of the bar rather than on a fixed tick. While nothing is
+    moving - paused, stopped, no bar - it sleeps until a push says otherwise.
+    """
+    while True:
+        progress_wake.clear()
+        delay = _draw_progress()
+        if delay is None:
+            await progress_wake.wait()
+        else:
+            await asyncio.sleep_ms(delay)
+
+
 def _local_ip():
     try:
         cfg = net.config()
@@ -536,6 +821,40 @@ def _device_identity():
     return identity
 
 
+def _configured_buffers():
+    """Frame buffers the user allows: 2, or 1 to give 150KB back to other apps."""
+    try:
+        if app_mgr and int((app_mgr.config() or {}).get('buffers', 2)) == 1:
+            return 1
+    except Exception:
+        pass
+    return 2
+
+
+def _allocate_back_buffer():
+    """The back buffer, or canvas_buf itself to run single-buffered.
+
+    One buffer means the frame streams into the pixels LVGL draws from. The
+    panel keeps showing the old frame regardless - nothing redraws the canvas
+    until the frame is complete and invalidated - except where something on top
+    of it animates, the scrolling title in particular, which can pick up the new
+    frame a strip at a time while it arrives. A second or two of that, against
+    150KB of heap held for as long as the app runs.
+    """
+    if _configured_buffers() == 1:
+        logger.info('Single-buffered, as configured')
+        return canvas_buf
+    free = gc.mem_free()
+    if free - FRAME_SIZE < DOUBLE_BUFFER_HEADROOM:
+        logger.warning('Single-buffered: %d bytes free is too little for a second frame', free)
+        return canvas_buf
+    try:
+        return bytearray(FRAME_SIZE)
+    except MemoryError:
+        logger.warning('Single-buffered: no room for a second frame')
+        return canvas_buf
+
+
 def _configured_port():
     port = DEFAULT_PORT
     try:
@@ -552,8 +871,12 @@ def _configured_port():
 # TCP server
 # ---------------------------------------------------------------------------
 async def _reply(writer, payload):
+    return await _send(writer, (json.dumps(payload) + '\n').encode('utf-8'))
+
+
+async def _send(writer, data):
     try:
-        writer.write((json.dumps(payload) + '\n').encode('utf-8'))
+        writer.write(data)
         await writer.drain()
         return True
     except Exception as exc:
@@ -561,6 +884,311 @@ async def _reply(writer, payload):
         return False
 
 
+def _ack(send_art):
+    return (
+        json.dumps({'ok': True, 'proto': PROTOCOL_VERSION, 'send_art': send_art, 'w': FRAME_W, 'h': FRAME_H}) + '\n'
+    ).encode('utf-8')
+
+
+# The two acks nearly every exchange ends up sending, encoded once rather than
+# through json.dumps() on every push. Errors are rare and keep _reply().
+_ACK_SEND_ART = _ack(True)
+_ACK_HAVE_ART = _ack(False)
+
+
+_PING = b'{"event": "ping"}\n'
+
+
+def _notify(event):
+    """Send an event to every watching client. Safe from LVGL callbacks: the
+    writes run as tasks, so nothing here waits on the network."""
+    if not watchers:
+        return
+    data = (json.dumps(event) + '\n').encode('utf-8')
+    for writer in list(watchers):
+        asyncio.create_task(_send(writer, data))
+
+
+async def _serve_watch(reader, writer, my_session):
+    """Hold a client's watch connection open, until it closes or the app stops.
+
+    Everything else in the protocol is the client asking. This is the dock
+    telling: a hello on connect saying what it holds, a ping every
+    WATCH_PING_MS, and then whatever _notify() is handed - the app coming back
+    to the front, the knob and button. A client that has this open no longer
+    needs to push on a timer to find out whether the dock restarted: the
+    connection dropping tells it, and the hello on the way back says what was
+    lost.
+
+    The client never writes after its header, so a read returning at all is
+    it closing.
+    """
+    if len(watchers) >= MAX_WATCHERS:
+        await _reply(writer, {'ok': False, 'error': 'too many watchers'})
+        return
+    hello = {
+        'ok': True,
+        'event': 'hello',
+        'proto': PROTOCOL_VERSION,
+        'art_id': art_id if have_art else None,
+        'fresh': not shown_push,
+    }
+    if not await _reply(writer, hello):
+        return
+    watchers.append(writer)
+    logger.info('Client watching (%d)', len(watchers))
+    try:
+        while my_session == session:
+            try:
+                data = await asyncio.wait_for_ms(reader.read(16), WATCH_PING_MS)
+            except asyncio.TimeoutError:
+                if not await _send(writer, _PING):
+                    break
+                continue
+            if not data:
+                break
+    finally:
+        if writer in watchers:
+            watchers.remove(writer)
+
+
+def _close_watchers():
+    for writer in watchers:
+        try:
+            writer.close()
+        except Exception:
+            pass
+    watchers.clear()
+
+
+def _bind_keys(obj):
+    """Pass the knob and button on to watching clients as transport commands.
+
+    The knob arrives as LEFT/RIGHT key events on the focused object while its
+    group is in edit mode, and pressing it as ENTER. ESC stays the system's, to
+    leave the app. Feature-detected throughout: a firmware that routes keys
+    some other way loses the controls, not the app.
+    """
+    global _key_commands
+
+    try:
+        _key_commands = {lv.KEY.ENTER: 'play_pause', lv.KEY.RIGHT: 'next', lv.KEY.LEFT: 'previous'}
+        add_event = getattr(obj, 'add_event_cb', None) or getattr(obj, 'add_event', None)
+        add_event(_on_key, lv.EVENT.KEY, None)
+        group = lv.group_get_default()
+        if group:
+            group.add_obj(obj)
+            focus = getattr(group, 'focus_obj', None) or getattr(lv, 'group_focus_obj', None)
+            if focus:
+                focus(obj)
+            group.set_editing(True)
+    except Exception as exc:
+        logger.warning('Knob and buttons unavailable: %s', exc)
+
+
+def _on_key(event):
+    try:
+        command = _key_commands.get(event.get_key())
+    except Exception:
+        return
+    if command:
+        logger.info('Key: %s (%d watching)', command, len(watchers))
+        _notify({'event': 'command', 'command': command})
+
+
+async def _read_into(reader, view, total):
+    """Read exactly `total` bytes into `view`. Returns how many arrived.
+
+    Short only at end of stream. readinto() is feature-detected, as in
+    _read_frame().
+    """
+    readinto = getattr(reader, 'readinto', None)
+    read = 0
+    while read < total:
+        if readinto is None:
+            chunk = await reader.read(total - read)
+            if not chunk:
+                break
+            got = len(chunk)
+            view[read : read + got] = chunk
+        else:
+            got = await readinto(view[read:total])
+            if not got:
+                break
+        read += got
+    return read
+
+
+async def _read_header(reader):
+    """The header as a dict, b'' on a bare connect, or None if malformed.
+
+    A JSON header goes through readline() and json.loads(), as it always has. A
+    binary one is read into _header_buf and parsed there. Raises ValueError for
+    a header longer than MAX_HEADER, after draining it.
+
+    While another exchange is in flight a binary header is read but not parsed,
+    and an empty dict stands in for it. Parsing fills _binary_meta, which is the
+    `meta` that exchange is still reading across its frame transfer, and this
+    one is about to be refused as busy anyway.
+    """
+    if await _read_into(reader, _header_view, 1) == 0:
+        return b''
+    if _header_buf[0] != BINARY_MAGIC:
+        line = await reader.readline()
+        if len(line) + 1 > MAX_HEADER:
+            raise ValueError('header too long')
+        try:
+            return json.loads((bytes(_header_view[:1]) + line).decode('utf-8').strip())
+        except Exception as exc:
+            logger.warning('Bad header: %s', exc)
+            return None
+
+    if await _read_into(reader, _header_view[1:], BINARY_PREFIX - 1) != BINARY_PREFIX - 1:
+        return None
+    layout = _header_buf[1]
+    length = _header_buf[2] | (_header_buf[3] << 8)
+    if length > MAX_HEADER:
+        # Drain it first; see handle_client() on closing with unread data.
+        while length > 0:
+            got = await _read_into(reader, _header_view, min(length, MAX_HEADER))
+            if not got:
+                break
+            length -= got
+        raise ValueError('header too long')
+    if await _read_into(reader, _header_view, length) != length:
+        return None
+    if busy:
+        return {}
+    try:
+        parsed = layout == BINARY_LAYOUT and _parse_binary_header(length)
+    except UnicodeError:
+        parsed = False
+    if not parsed:
+        logger.warning('Bad binary header (layout %d, %d bytes)', layout, length)
+        return None
+    return _binary_meta
+
+
+def _parse_binary_header(length):
+    """Fill _binary_meta from the `length`-byte body now in _header_buf.
+
+    Returns False if it is malformed. Layout, little-endian:
+
+        status u8, light mode u8 (0 absent, 1 release, 2 colour), r u8, g u8,
+        b u8, level u8, width u16, height u16, image_len u32, rect x, y, w, h
+        (u16 each, w 0 for none), text revision u16 (0 for none), progress
+        position ms u32, duration ms u32, rate u16 (duration 0 for none),
+        art_id (u8 length + ASCII, empty for none), title, artist, album (each
+        u16 length + UTF-8)
+
+    The point is what it does not allocate. json.loads() builds a new dict and
+    a new str for every field of every push, and the client pushes several
+    times a second while a track plays - all of it garbage bringing the next
+    200-280ms collection closer. Here the dict is reused, numbers are small
+    ints, and a string is only decoded when its bytes differ from last time,
+    which on a play/pause or timeline push is never. When the text revision
+    is the one already parsed, the strings are not even compared.
+    """
+    global _binary_rect, _binary_text_rev
+
+    buf = _header_buf
+    if length < BINARY_FIXED + 1 or buf[0] >= len(BINARY_STATUSES):
+        return False
+    meta = _binary_meta
+    meta['status'] = BINARY_STATUSES[buf[0]]
+
+    mode = buf[1]
+    if mode == 0:
+        meta['light'] = _NO_LIGHT
+    elif mode == 1:
+        meta['light'] = None
+    else:
+        state = light_state
+        if (
+            state is not None
+            and state[0] == buf[2]
+            and state[1] == buf[3]
+            and state[2] == buf[4]
+            and state[3] == buf[5]
+        ):
+            meta['light'] = state
+        else:
+            meta['light'] = (buf[2], buf[3], buf[4], buf[5])
+
+    meta['width'] = buf[6] | (buf[7] << 8)
+    meta['height'] = buf[8] | (buf[9] << 8)
+    meta['image_len'] = buf[10] | (buf[11] << 8) | (buf[12] << 16) | (buf[13] << 24)
+
+    x = buf[14] | (buf[15] << 8)
+    y = buf[16] | (buf[17] << 8)
+    width = buf[18] | (buf[19] << 8)
+    height = buf[20] | (buf[21] << 8)
+    rect = _binary_rect
+    if not width:
+        meta['rect'] = None
+    elif rect is not None and rect[0] == x and rect[1] == y and rect[2] == width and rect[3] == height:
+        meta['rect'] = rect
+    else:
+        _binary_rect = meta['rect'] = (x, y, width, height)
+    text_rev = buf[22] | (buf[23] << 8)
+    meta['text_rev'] = text_rev
+
+    duration = buf[28] | (buf[29] << 8) | (buf[30] << 16) | (buf[31] << 24)
+    if duration:
+        progress = _binary_progress
+        progress[0] = buf[24] | (buf[25] << 8) | (buf[26] << 16) | (buf[27] << 24)
+        progress[1] = duration
+        progress[2] = buf[32] | (buf[33] << 8)
+        meta['progress'] = progress
+    else:
+        meta['progress'] = None
+
+    offset = BINARY_FIXED + 1
+    end = offset + buf[BINARY_FIXED]
+    if end > length:
+        return False
+    if end == offset:
+        meta['art_id'] = None
+        _binary_raw['art_id'] = None
+    else:
+        _decode_field('art_id', offset, end)
+    offset = end
+
+    same_text = text_rev and text_rev == _binary_text_rev
+    # Cleared until the strings are all decoded, so a header that fails half
+    # way through cannot leave its number on a mix of old and new text.
+    _binary_text_rev = 0
+    for key in ('title', 'artist', 'album'):
+        if offset + 2 > length:
+            return False
+        end = offset + 2 + (buf[offset] | (buf[offset + 1] << 8))
+        if end > length:
+            return False
+        if not same_text:
+            _decode_field(key, offset + 2, end)
+        offset = end
+    if offset != length:
+        return False
+    _binary_text_rev = text_rev
+    return True
+
+
+def _decode_field(key, start, end):
+    """Set _binary_meta[key] from _header_buf[start:end], reusing the last str if
+    the bytes have not changed."""
+    raw = _binary_raw.get(key)
+    buf = _header_buf
+    if raw is not None and len(raw) == end - start:
+        index = 0
+        while index < len(raw) and raw[index] == buf[start + index]:
+            index += 1
+        if index == len(raw):
+            return
+    raw = bytes(_header_view[start:end])
+    _binary_meta[key] = raw.decode('utf-8')
+    _binary_raw[key] = raw
+
+
 async def _close(writer):
     try:
         writer.close()
@@ -574,10 +1202,18 @@ async def handle_client(reader, writer):
 
     Wire format:
         -> {"title","artist","album","status","art_id","image_len","width","height",
-            "light"}\\n
+            "light"}\\n                        (or the binary form, below)
         <- {"ok","proto","send_art","w","h"}\\n
         -> <image_len raw RGB565 bytes>        (only when send_art is true)
-        <- {"ok"}\\n
+        <- {"ok","stats"}\\n
+
+    `stats` is telemetry on the frame just received, for the client to log and
+    aggregate, since without a serial console attached nothing on this side can
+    be seen: `recv_ms` and `reads` from _read_frame(), `swap_ms` for putting it
+    on screen and `area` for how many pixels that redrew, `heap_free` after it,
+    and `gc`/`gc_ms` for whether a scheduled collection has run since the last
+    report and how long the latest took - see run_gc_scheduler(). Clients that
+    predate it ignore it.
 
     `light` is optional and tri-state, which is what lets one field cover three
     situations that are genuinely different:
@@ -590,26 +1226,46 @@ async def handle_client(reader, writer):
         null              release the light - nothing is playing, or the user has
                           the feature switched off.
         [r, g, b, level]  own it and show this colour at this brightness.
+
+    Proto 5 adds `rect`, optional: [x, y, w, h] of the frame outside which it
+    is black, which lets a frame change redraw only part of the panel - see
+    _present_frame(). Absent or malformed just means a full redraw.
+
+    Proto 5: the header may instead arrive binary - the same fields, a magic
+    byte in place of the '{', read into a preallocated buffer and parsed without
+    allocating. See _parse_binary_header(). A client only sends it after an ack
+    from us has said proto 5, so the first push is always JSON, and an older
+    dock is never sent one.
     """
-    global busy, client_task, art_id, have_art, ground_is_idle
+    global busy, client_task, art_id, have_art, ground_is_idle, collected, gc_due_since, last_exchange
+    global canvas_rect, shown_push
 
     claimed = False
     changed_frame = False
     my_session = session
+    last_exchange = time.ticks_ms()
     try:
         # Always drain the header before any early return. Closing a socket
         # while its receive buffer still holds data is an abortive close, and
         # the peer then loses the reply we just wrote.
-        header = await reader.readline()
-        if not header:
-            return
-        if len(header) > MAX_HEADER:
+        try:
+            meta = await _read_header(reader)
+        except ValueError:
             await _reply(writer, {'ok': False, 'error': 'header too long'})
             return
+        if meta == b'':
+            return
+        if meta is not None and meta.get('watch'):
+            # Never claims busy: it is held open for as long as the client
+            # runs, and exchanges go on around it.
+            await _serve_watch(reader, writer, my_session)
+            return
 
         if busy:
-            # Overlapping pushes would race for back_buf. Refuse rather than
-            # corrupt; the client retries on its next media event.
+            # Overlapping pushes would race for back_buf, and a binary header
+            # for _binary_meta - _read_header() has left that to the exchange in
+            # flight. Refuse rather than corrupt; the client retries on its
+            # next media event.
             await _reply(writer, {'ok': False, 'error': 'busy'})
             return
 
@@ -622,10 +1278,7 @@ async def handle_client(reader, writer):
         except Exception:
             client_task = None
 
-        try:
-            meta = json.loads(header.decode('utf-8').strip())
-        except Exception as exc:
-            logger.warning('Bad header: %s', exc)
+        if meta is None:
             await _reply(writer, {'ok': False, 'error': 'bad header'})
             return
 
@@ -634,8 +1287,10 @@ async def handle_client(reader, writer):
         width = int(meta.get('width') or FRAME_W)
         height = int(meta.get('height') or FRAME_H)
         # Proto 3: Windows has no media session at all, as opposed to a track
-        # that merely has no artwork.
-        idle = (meta.get('status') or '').upper() == 'IDLE'
+        # that merely has no artwork. A binary header's status is already
+        # upper case, so it never reaches the upper() and its new string.
+        status = meta.get('status') or ''
+        idle = status == 'IDLE' or status.upper() == 'IDLE'
 
         send_art = False
         clear_art = False
@@ -652,16 +1307,21 @@ async def handle_client(reader, writer):
         else:
             send_art = True
 
-        ack = {
-            'ok': geometry_error is None,
-            'proto': PROTOCOL_VERSION,
-            'send_art': send_art,
-            'w': FRAME_W,
-            'h': FRAME_H,
-        }
         if geometry_error:
-            ack['error'] = geometry_error
-        if not await _reply(writer, ack):
+            replied = await _reply(
+                writer,
+                {
+                    'ok': False,
+                    'proto': PROTOCOL_VERSION,
+                    'send_art': False,
+                    'w': FRAME_W,
+                    'h': FRAME_H,
+                    'error': geometry_error,
+                },
+            )
+        else:
+            replied = await _send(writer, _ACK_SEND_ART if send_art else _ACK_HAVE_ART)
+        if not replied:
             return
 
         if send_art:
@@ -670,15 +1330,24 @@ async def handle_client(reader, writer):
             target = back_buf
             if target is None:
                 return
-            received = await _read_frame(reader, target, FRAME_SIZE)
+            received, recv_ms, reads = await _read_frame(reader, target, FRAME_SIZE)
             if my_session != session:
                 return  # app was stopped while we were reading; drop the frame
             if received != FRAME_SIZE:
                 # Leave art_id alone so the client resends on the next update.
+                if target is canvas_buf:
+                    # Unless the half-frame went over the one on screen: then
+                    # what is held is no longer that artwork, or the ground.
+                    # Not invalidated - the panel still shows the old frame.
+                    art_id = None
+                    ground_is_idle = False
+                    canvas_rect = None
                 _set_status('Short read: {}/{}'.format(received, FRAME_SIZE))
                 await _reply(writer, {'ok': False, 'error': 'short read', 'received': received})
                 return
-            _swap_frame()
+            swap_started = time.ticks_ms()
+            area = _present_frame(_valid_rect(meta.get('rect')))
+            swap_ms = time.ticks_diff(time.ticks_ms(), swap_started)
             art_id = incoming_art
             have_art = True
             ground_is_idle = False
@@ -695,6 +1364,7 @@ async def handle_client(reader, writer):
             _show_idle('Nothing playing')
         else:
             _apply_metadata(meta)
+        shown_push = True
         # Deliberately after the frame swap rather than straight off the header:
         # a transfer takes seconds, and changing the light at the top would leave
         # it announcing the next track while the panel still showed the last one.
@@ -703,7 +1373,17 @@ async def handle_client(reader, writer):
             _set_status(geometry_error)
 
         if send_art:
-            await _reply(writer, {'ok': True})
+            stats = {
+                'recv_ms': recv_ms,
+                'reads': reads,
+                'swap_ms': swap_ms,
+                'area': area,
+                'heap_free': gc.mem_free(),
+                'gc': collected,
+                'gc_ms': last_gc_ms,
+            }
+            collected = False
+            await _reply(writer, {'ok': True, 'stats': stats})
 
     except asyncio.CancelledError:
         raise
@@ -715,11 +1395,80 @@ async def handle_client(reader, writer):
             busy = False
             client_task = None
         await _close(writer)
-        # Only after a real frame change. collect() costs ~200-280ms on this
-        # device, and the client sends several metadata-only updates per second
-        # while a track plays - collecting on those froze the UI mid-scroll.
-        if changed_frame:
-            gc.collect()
+        last_exchange = time.ticks_ms()
+        # Only after a real frame change - the client sends several
+        # metadata-only updates per second while a track plays, and collecting
+        # on those froze the UI mid-scroll. Not here, either: the scheduler
+        # runs it once the burst of pushes around a track change is over.
+        if changed_frame and gc_due_since is None:
+            gc_due_since = last_exchange
+
+
+def _collect():
+    global last_gc_ms, collected, gc_due_since
+
+    started = time.ticks_ms()
+    gc.collect()
+    last_gc_ms = time.ticks_diff(time.ticks_ms(), started)
+    collected = True
+    gc_due_since = None
+    logger.info('GC: %dms, %d bytes free', last_gc_ms, gc.mem_free())
+
+
+async def run_gc_scheduler():
+    """Run the collection a frame change asked for, when it will be least seen.
+
+    Never during an exchange: that is the freeze this exists to avoid, and the
+    socket stalls with it. Otherwise once the client has been quiet for
+    GC_QUIET_MS, or at the first gap after GC_MAX_DEFER_MS or with the heap
+    running low.
+
+    Only ever for a frame change. A heap that simply sits below GC_LOW_HEAP -
+    the two frame buffers take most of it - would otherwise be collected four
+    times a second, which is the stutter this is here to remove.
+    """
+    while True:
+        await asyncio.sleep_ms(GC_POLL_MS)
+        if busy or gc_due_since is None:
+            continue
+        now = time.ticks_ms()
+        if (
+            time.ticks_diff(now, last_exchange) >= GC_QUIET_MS
+            or time.ticks_diff(now, gc_due_since) >= GC_MAX_DEFER_MS
+            or gc.mem_free() < GC_LOW_HEAP
+        ):
+            _collect()
+
+
+def _tune_gc():
+    """Set GC_THRESHOLD, keeping the firmware's own to restore.
+
+    Feature-detected like the rest of the firmware surface: a build without
+    gc.threshold() just keeps its own policy, and the scheduler still runs.
+    """
+    global gc_threshold_saved
+
+    threshold = getattr(gc, 'threshold', None)
+    if threshold is None:
+        return
+    try:
+        gc_threshold_saved = threshold()
+        threshold(GC_THRESHOLD)
+    except Exception as exc:
+        logger.warning('gc.threshold unavailable: %s', exc)
+        gc_threshold_saved = None
+
+
+def _restore_gc():
+    global gc_threshold_saved
+
+    if gc_threshold_saved is None:
+        return
+    try:
+        gc.threshold(gc_threshold_saved)
+    except Exception:
+        pass
+    gc_threshold_saved = None
 
 
 async def run_server():
@@ -754,13 +1503,38 @@ async def run_server():
 # ---------------------------------------------------------------------------
 # UDP discovery
 # ---------------------------------------------------------------------------
+def _io_readable(sock):
+    """Suspend until `sock` has something to read, via asyncio's own poller.
+
+    MicroPython's asyncio has no datagram transport, but its streams wait on
+    sockets through an internal select.poll() queue, and a plain socket can
+    wait there too. A generator rather than a coroutine because that is what
+    the queue expects to be yielded from - Stream.read() does the same.
+    """
+    yield _io_queue.queue_read(sock)
+
+
+async def _sleep_until_polled(sock):
+    await asyncio.sleep_ms(DISCOVERY_POLL_MS)
+
+
+try:
+    _io_queue = asyncio.core._io_queue
+    _wait_readable = _io_readable
+except AttributeError:
+    # Not every asyncio build exposes it. Polling still answers, just later.
+    _io_queue = None
+    _wait_readable = _sleep_until_polled
+
+
 async def run_discovery_server():
     """Answer broadcast probes so the client can find this dock by itself.
 
-    MicroPython's asyncio has no datagram transport, so this is a non-blocking
-    socket polled from a task. recvfrom() raises EAGAIN when nothing is waiting,
-    which is the normal case - hence the bare sleep on OSError rather than
-    treating it as a failure.
+    Probes are rare - one search from the client, now and then - so the task
+    sleeps in asyncio's poller until a datagram arrives, instead of waking
+    several times a second for the life of the app to find nothing queued. See
+    _io_readable(). recvfrom() raising EAGAIN is the normal way to find the
+    queue drained, not a failure.
     """
     global discovery_socket, discovery_running
 
@@ -786,9 +1560,10 @@ async def run_discovery_server():
             try:
                 data, addr = sock.recvfrom(MAX_PROBE)
             except OSError:
-                # Nothing queued (EAGAIN). Poll rate sets discovery latency;
-                # the client waits well over a second for replies.
-                await asyncio.sleep_ms(150)
+                if discovery_socket is not sock:
+                    break  # closed by stop_discovery_server()
+                # Nothing queued (EAGAIN).
+                await _wait_readable(sock)
                 continue
 
             if not data or DISCOVERY_MAGIC not in data:
@@ -814,7 +1589,8 @@ async def run_discovery_server():
         logger.warning('Discovery server error: %s', exc)
     finally:
         discovery_running = False
-        discovery_socket = None
+        if discovery_socket is sock:
+            discovery_socket = None
         if sock:
             try:
                 sock.close()
@@ -823,12 +1599,15 @@ async def run_discovery_server():
 
 
 async def stop_discovery_server():
-    global discovery_task
+    global discovery_task, discovery_socket
 
-    if discovery_socket:
-        # Closing under the task unblocks it even if cancellation is late.
+    sock, discovery_socket = discovery_socket, None
+    if sock:
+        # Closing under the task unblocks it even if cancellation is late: the
+        # poller reports a closed socket as readable, and the task then sees
+        # discovery_socket is no longer its own.
         try:
-            discovery_socket.close()
+            sock.close()
         except Exception:
             pass
     if discovery_task:
@@ -916,12 +1695,14 @@ def _make_placeholder(parent):
 
 
 async def on_start():
-    global scr, canvas, canvas_buf, back_buf
+    global scr, canvas, canvas_buf, back_buf, canvas_rect
     global info_bar, title_label, artist_label, state_label, status_label
     global placeholder, server_task, discovery_task, art_id, have_art, ground_is_idle
-    global light_owned, light_state
+    global light_owned, light_state, gc_task, gc_due_since, shown_push
+    global progress_bar, progress_task, progress_wake, progress_duration
 
     logger.info('on start')
+    shown_push = False
     art_id = None
     have_art = False
     # on_stop() released the light, so nothing is held and no colour is current.
@@ -931,6 +1712,7 @@ async def on_start():
     light_state = None
     # Both buffers are filled with the idle ground a few lines down.
     ground_is_idle = True
+    canvas_rect = None
     # Widgets are about to be rebuilt, so nothing is on screen yet.
     _shown.clear()
 
@@ -941,13 +1723,15 @@ async def on_start():
     scr.set_style_border_width(0, lv.PART.MAIN)
     _clear_flag(scr, lv.obj.FLAG.SCROLLABLE)
 
-    # Two full frames so a transfer in progress never touches what is on screen.
+    # Two full frames so a transfer in progress never touches what is on screen,
+    # heap and settings allowing.
     canvas_buf = bytearray(FRAME_SIZE)
-    back_buf = bytearray(FRAME_SIZE)
+    back_buf = _allocate_back_buffer()
     # Start on the placeholder ground, so the first thing drawn is the idle view
     # rather than a black rectangle.
     _fill(canvas_buf, _IDLE_PATTERN)
-    _fill(back_buf, _IDLE_PATTERN)
+    if back_buf is not canvas_buf:
+        _fill(back_buf, _IDLE_PATTERN)
 
     canvas = lv.canvas(scr)
     canvas.set_buffer(canvas_buf, FRAME_W, FRAME_H, lv.COLOR_FORMAT.RGB565)
@@ -987,6 +1771,23 @@ async def on_start():
     artist_label.align(lv.ALIGN.TOP_LEFT, 0, 20)
     artist_label.set_text('')
 
+    # Along the top edge of the strip, outside its padding, so it reads as the
+    # strip's border rather than a third line squeezed under the artist.
+    try:
+        progress_bar = lv.bar(info_bar)
+        progress_bar.set_size(FRAME_W, PROGRESS_H)
+        progress_bar.align(lv.ALIGN.TOP_LEFT, -6, -6)
+        progress_bar.set_range(0, PROGRESS_STEPS)
+        progress_bar.set_style_radius(0, lv.PART.MAIN)
+        progress_bar.set_style_radius(0, lv.PART.INDICATOR)
+        progress_bar.set_style_bg_color(lv.color_hex(0x3A4558), lv.PART.MAIN)
+        progress_bar.set_style_bg_opa(255, lv.PART.MAIN)
+        progress_bar.set_style_bg_color(lv.color_hex(0xB4C4D8), lv.PART.INDICATOR)
+        progress_bar.add_flag(lv.obj.FLAG.HIDDEN)
+    except Exception as exc:
+        logger.warning('Position bar unavailable: %s', exc)
+        progress_bar = None
+
     # Long titles scroll rather than truncate. Guarded because the enum path
     # moved between LVGL 8 and 9 and a mismatch here would abort on_start.
     try:
@@ -1012,10 +1813,17 @@ async def on_start():
     state_label.align(lv.ALIGN.TOP_RIGHT, -8, 8)
     state_label.set_text(lv.SYMBOL.STOP)
 
+    _bind_keys(scr)
     lv.scr_load(scr)
 
     server_task = asyncio.create_task(run_server())
     discovery_task = asyncio.create_task(run_discovery_server())
+    gc_due_since = None
+    _tune_gc()
+    gc_task = asyncio.create_task(run_gc_scheduler())
+    progress_duration = 0
+    progress_wake = asyncio.Event()
+    progress_task = asyncio.create_task(run_progress())
 
 
 async def on_pause():
@@ -1036,12 +1844,16 @@ async def on_resume():
     # The feed is the app's only page, so ESC should exit the app.
     if app_mgr:
         app_mgr.enter_root_page()
+    # Shown all along, since the server stays up while paused - but a watching
+    # client confirms it, which costs it one header.
+    _notify({'event': 'resumed'})
 
 
 async def on_stop():
-    global scr, canvas, canvas_buf, back_buf
+    global scr, canvas, canvas_buf, back_buf, canvas_rect
     global info_bar, title_label, artist_label, state_label, status_label
-    global placeholder, art_id, have_art, ground_is_idle, session
+    global placeholder, art_id, have_art, ground_is_idle, session, gc_task
+    global progress_bar, progress_task
 
     logger.info('on stop')
 
@@ -1058,6 +1870,7 @@ async def on_stop():
     have_art = False
     # The buffers are about to go; nothing holds the idle ground any more.
     ground_is_idle = False
+    canvas_rect = None
     _shown.clear()
 
     # UI first, and with no await before it finishes: the system swaps in the
@@ -1078,9 +1891,28 @@ async def on_stop():
     state_label = None
     status_label = None
     placeholder = None
+    progress_bar = None
     canvas_buf = None
     back_buf = None
 
+    if progress_task:
+        try:
+            progress_task.cancel()
+        except Exception:
+            pass
+        progress_task = None
+
+    if gc_task:
+        try:
+            gc_task.cancel()
+        except Exception:
+            pass
+        gc_task = None
+    _restore_gc()
+
+    # The next on_start() shows nothing of theirs; dropping the connections is
+    # what tells the clients so, and their hello on the way back in confirms it.
+    _close_watchers()
     await stop_server()
     await stop_discovery_server()
     gc.collect()
@@ -1110,5 +1942,18 @@ def get_settings_json():
                     'maxLength': 5,
                 },
             },
+            {
+                'type': 'input',
+                'default': '2',
+                'caption': 'Frame buffers',
+                'name': 'buffers',
+                'tip': '2 changes artwork cleanly. 1 frees 150KB for other apps, at the cost '
+                'of new artwork showing through behind the scrolling title as it arrives. '
+                'The app drops to 1 by itself when memory is short. Restart the app after changing.',
+                'attributes': {
+                    'placeholder': '2',
+                    'maxLength': 1,
+                },
+            },
         ],
     }
@@ -1,11 +1,121 @@
+"""Logging for the whole client, set up on import.
+
+Every record goes onto a queue, and one listener thread does the formatting and
+the writing. A track change raises a dozen WinRT events in an instant, and each
+used to format and print its lines on the thread that raised it - which for the
+worker is the asyncio loop that should have been reading the session instead.
+Now the calling thread only files the record, arguments unformatted.
+
+Two sinks behind the queue: coloured lines on the console from a source
+checkout, and once add_file_sink() is called, a JSON-lines file beside the
+settings, rotated, for diagnosing an installed copy. Debug and info lines from
+any one call site are also rate limited, so a burst from a misbehaving source
+is summarised rather than written out in full.
+"""
+
+import atexit
+import json
 import logging
+import queue
 import sys
+import threading
+import time
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 is_frozen = getattr(sys, 'frozen', False) and hasattr(sys, '_MEIPASS')
 
+# Per call site: this many debug/info records in RATE_LIMIT_WINDOW seconds, then
+# the rest are dropped and counted until the window ends. Sized to let a whole
+# track change through - a dozen events, each logging a line or two - and stop
+# only a source that keeps firing.
+RATE_LIMIT_BURST = 30
+RATE_LIMIT_WINDOW = 5.0
+
+# The file sink keeps info and above. Debug is for a console someone is reading.
+LOG_FILE_LEVEL = logging.INFO
+LOG_FILE_BYTES = 1_000_000
+LOG_FILE_BACKUPS = 3
+
+_listener: QueueListener | None = None
+
+
+class RateLimit(logging.Filter):
+    """Drop debug and info records from a call site that is logging too fast.
+
+    Keyed on where the call is rather than what it says, so a line that logs a
+    different track each time is still one line. The first record let through
+    after some were dropped says how many.
+    """
+
+    def __init__(self, burst: int = RATE_LIMIT_BURST, window: float = RATE_LIMIT_WINDOW):
+        super().__init__()
+        self.burst = burst
+        self.window = window
+        self._lock = threading.Lock()
+        # (pathname, lineno) -> [window start, records in window, dropped]
+        self._sites: dict[tuple[str, int], list] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        key = (record.pathname, record.lineno)
+        now = time.monotonic()
+        with self._lock:
+            site = self._sites.get(key)
+            if site is None or now - site[0] >= self.window:
+                dropped = site[2] if site is not None else 0
+                self._sites[key] = [now, 1, 0]
+            elif site[1] < self.burst:
+                site[1] += 1
+                dropped = 0
+            else:
+                site[2] += 1
+                return False
+        if dropped:
+            record.msg = f'{record.getMessage()} ({dropped} similar suppressed)'
+            record.args = None
+        return True
+
+
+class _LazyQueueHandler(QueueHandler):
+    """A QueueHandler that leaves formatting to the listener.
+
+    The stock one formats the message before queueing, on the calling thread,
+    which is the very cost the queue is there to move. A traceback is still
+    rendered here, since it cannot outlive the frame it describes. Everything
+    logged in this client passes arguments it does not go on to change, so
+    formatting them a moment later gives the same line.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line: readable as text, and by anything that reads JSON."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record, '%Y-%m-%dT%H:%M:%S') + f'.{int(record.msecs):03d}',
+            'level': record.levelname,
+            'logger': record.name,
+            'thread': record.threadName,
+            'message': record.getMessage(),
+        }
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False)
+
 
 def setup_logging(ignore_frozen=False):
-    if not is_frozen or ignore_frozen:
+    root = logging.getLogger()
+    # No stderr is pythonw, which is how a source checkout starts at login:
+    # there is no console to colour, and coloredlogs is a slow import to make
+    # for one.
+    if (not is_frozen or ignore_frozen) and sys.stderr is not None:
         import coloredlogs
 
         coloredlogs.install(
@@ -43,6 +153,38 @@ def setup_logging(ignore_frozen=False):
                 },
             },
         )
+    else:
+        root.setLevel(LOG_FILE_LEVEL)
+
+    # Whatever coloredlogs installed moves behind the queue.
+    global _listener
+    sinks = tuple(root.handlers)
+    for handler in sinks:
+        root.removeHandler(handler)
+    handler = _LazyQueueHandler(queue.SimpleQueue())
+    handler.addFilter(RateLimit())
+    root.addHandler(handler)
+    _listener = QueueListener(handler.queue, *sinks, respect_handler_level=True)
+    _listener.start()
+    atexit.register(_listener.stop)
+
+
+def add_file_sink(path: str):
+    """Also write info and above to `path` as JSON lines, rotated by size.
+
+    Separate from setup_logging() because the path is beside the settings, and
+    that folder is not known until the application has its names.
+    """
+    try:
+        sink = RotatingFileHandler(path, maxBytes=LOG_FILE_BYTES, backupCount=LOG_FILE_BACKUPS, encoding='utf-8')
+    except OSError as exc:
+        logger.warning('Could not open the log file %s: %s', path, exc)
+        return
+    sink.setLevel(LOG_FILE_LEVEL)
+    sink.setFormatter(JsonFormatter())
+    # The listener reads its handlers per record, and swapping the tuple is a
+    # single assignment, so this is safe with it running.
+    _listener.handlers = (*_listener.handlers, sink)
 
 
 setup_logging()
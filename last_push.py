@@ -0,0 +1,105 @@
+"""The last state the dock confirmed, kept on disk for the next launch.
+
+A client started at login used to show nothing until it had bound a session,
+read the thumbnail, and decoded, resized, packed and pushed a frame - all of it
+to put back the cover the dock had been showing since before the reboot. With
+the last push saved, the window shows that track straight away, and the worker
+announces its art_id to the dock in a header while the session is still being
+bound. A dock that still holds it answers without asking for the frame, and the
+session's own state then only costs a push if it is different.
+
+Two files beside settings.ini: the payload and what was learned about the dock
+as JSON, and the raw thumbnail it was made from, which is what the window needs
+to draw the cover. The thumbnail only changes with the artwork and is only
+believed while it still hashes to the art_id in the JSON, so the two can never
+be paired wrongly by a write that was cut short.
+"""
+
+import json
+import logging
+import os
+from dataclasses import dataclass, replace
+
+from media_image import art_id_for
+
+logger = logging.getLogger(__name__)
+
+STATE_FILE = 'last_push.json'
+THUMBNAIL_FILE = 'last_push.thumb'
+
+
+@dataclass(frozen=True)
+class LastPush:
+    """One confirmed push, and the dock that confirmed it."""
+
+    host: str
+    port: int
+    protocol: int
+    frame_size: tuple[int, int]
+    payload: dict  # as pushed, less the timeline, which is stale by next launch
+    thumbnail: bytes | None = None
+
+
+def save(directory: str, last: LastPush):
+    """Write the last push, replacing each file whole. Failures are only logged.
+
+    The thumbnail is left as it is when `last.thumbnail` is None, for a push
+    that changed everything but the artwork.
+    """
+    state = {
+        'host': last.host,
+        'port': last.port,
+        'protocol': last.protocol,
+        'frame_size': list(last.frame_size),
+        'payload': {key: value for key, value in last.payload.items() if key != 'timeline'},
+    }
+    try:
+        if last.thumbnail is not None:
+            _replace(os.path.join(directory, THUMBNAIL_FILE), last.thumbnail)
+        _replace(os.path.join(directory, STATE_FILE), json.dumps(state).encode('utf-8'))
+    except OSError as exc:
+        logger.warning('Could not save the last push: %s', exc)
+
+
+def load(directory: str) -> LastPush | None:
+    """The last push saved, or None if there is none that can be trusted."""
+    try:
+        with open(os.path.join(directory, STATE_FILE), 'rb') as file:
+            state = json.loads(file.read())
+        payload = dict(state['payload'])
+        # Hashed for the dedupe key, so it has to come back a tuple.
+        if isinstance(payload.get('light'), list):
+            payload['light'] = tuple(payload['light'])
+        width, height = state['frame_size']
+        last = LastPush(
+            host=str(state['host']),
+            port=int(state['port']),
+            protocol=int(state['protocol']),
+            frame_size=(int(width), int(height)),
+            payload=payload,
+        )
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError, KeyError, TypeError) as exc:
+        logger.warning('Ignoring the saved last push: %s', exc)
+        return None
+
+    art_id = payload.get('art_id')
+    if art_id is None:
+        return last
+    try:
+        with open(os.path.join(directory, THUMBNAIL_FILE), 'rb') as file:
+            thumbnail = file.read()
+    except OSError:
+        return last
+    if art_id_for(thumbnail) != art_id:
+        logger.debug('Saved thumbnail is not the saved artwork; leaving it out')
+        return last
+    return replace(last, thumbnail=thumbnail)
+
+
+def _replace(path: str, data: bytes):
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as file:
+        file.write(data)
+    os.replace(temp_path, path)
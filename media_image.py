@@ -1,22 +1,30 @@
 """Artwork handling: ranking the thumbnails Windows hands out, packing the
 chosen one into the RGB565 frame the Mini Dock draws, and reading a colour off
 it for the dock's ambient light.
+
+Pillow is imported where it is used rather than up here. This module is loaded
+with the window, on the GUI thread, and Pillow is one of the slowest imports the
+client has; done lazily, it first loads on the worker with the first cover,
+while the window is already up.
 """
 
 import colorsys
 import hashlib
 import logging
+from collections import OrderedDict
 from io import BytesIO
+from typing import TYPE_CHECKING
 
-from PIL import Image, ImageChops
-from PIL.Image import Resampling
-
+import metrics
 from constants import FRAME_SIZE_DEFAULT
 
+if TYPE_CHECKING:
+    from PIL import Image
+
 logger = logging.getLogger(__name__)
 
 
-def to_rgb565_bytes(image: Image.Image) -> bytes:
+def to_rgb565_bytes(image: 'Image.Image') -> bytes:
     """Pack an image to little-endian RGB565.
 
     Done with per-band lookup tables rather than a per-pixel Python loop: the
@@ -26,6 +34,8 @@ def to_rgb565_bytes(image: Image.Image) -> bytes:
     ImageChops.add doubles as a bitwise OR, and merging as 'LA' interleaves
     low/high bytes in one pass.
     """
+    from PIL import Image, ImageChops
+
     if image.mode != 'RGB':
         image = image.convert('RGB')
 
@@ -50,8 +60,11 @@ def resize_thumbnail(thumbnail_bytes, size=FRAME_SIZE_DEFAULT):
     """
     if thumbnail_bytes is None:
         return None, 0, 0
+    from PIL import Image
+    from PIL.Image import Resampling
+
     try:
-        with Image.open(BytesIO(thumbnail_bytes)) as opened:
+        with metrics.timed('frame.decode'), Image.open(BytesIO(thumbnail_bytes)) as opened:
             image = opened.convert('RGB')
     except Exception:
         logger.warning(
@@ -74,7 +87,8 @@ def resize_thumbnail(thumbnail_bytes, size=FRAME_SIZE_DEFAULT):
     if fitted != image.size:
         # LANCZOS over BICUBIC: 0.12ms more on a 4x enlarge and slightly cleaner
         # on the reductions, against ~4ms to read the thumbnail in the first place.
-        image = image.resize(fitted, Resampling.LANCZOS)
+        with metrics.timed('frame.resize'):
+            image = image.resize(fitted, Resampling.LANCZOS)
     width, height = image.size
 
     # Add padding on a black background if needed
@@ -86,11 +100,32 @@ def resize_thumbnail(thumbnail_bytes, size=FRAME_SIZE_DEFAULT):
         width = size[0]
         height = size[1]
 
-    thumb_bytes = to_rgb565_bytes(image)
+    with metrics.timed('frame.pack'):
+        thumb_bytes = to_rgb565_bytes(image)
     logger.debug('Resized thumbnail to %dx%d, %d bytes (RGB565)', width, height, len(thumb_bytes))
     return thumb_bytes, width, height
 
 
+def content_box(frame: bytes, width: int, height: int) -> tuple[int, int, int, int] | None:
+    """Where a packed frame is not black, as (x, y, width, height).
+
+    None for a frame that is black throughout. Outside the box is letterboxing,
+    or artwork that is black at its edges, and so is pixel for pixel the same
+    from one frame to the next - which is what lets the dock leave it alone.
+    Works on the packed bytes as an 8-bit image twice as wide, since a pixel is
+    only black when both its bytes are zero.
+    """
+    from PIL import Image
+
+    box = Image.frombuffer('L', (width * 2, height), frame, 'raw', 'L', 0, 1).getbbox()
+    if box is None:
+        return None
+    left, top, right, bottom = box
+    left //= 2
+    right = (right + 1) // 2
+    return left, top, right - left, bottom - top
+
+
 def art_id_for(thumbnail_bytes) -> str | None:
     """Stable id for a piece of artwork, derived from the raw thumbnail."""
     if not thumbnail_bytes:
@@ -159,8 +194,11 @@ def dominant_colour(thumbnail_bytes) -> tuple[int, int, int] | None:
     """
     if not thumbnail_bytes:
         return None
+    from PIL import Image
+    from PIL.Image import Resampling
+
     try:
-        with Image.open(BytesIO(thumbnail_bytes)) as opened:
+        with metrics.timed('colour.extract'), Image.open(BytesIO(thumbnail_bytes)) as opened:
             sample = opened.convert('RGB').resize(
                 COLOUR_SAMPLE_SIZE,
                 Resampling.BILINEAR,
@@ -239,6 +277,8 @@ def thumbnail_rank(thumbnail_bytes) -> tuple[int, int]:
     """
     if not thumbnail_bytes:
         return 0, 0
+    from PIL import Image
+
     try:
         with Image.open(BytesIO(thumbnail_bytes)) as image:
             width, height = image.size
@@ -424,32 +464,64 @@ class ArtworkPicker:
         return thumbnail_bytes
 
 
+# Encoded frames kept at once. Enough for the current cover at two panel
+# geometries plus the one before it: a client alternating between docks of
+# different sizes, or a dock changing its own, otherwise re-encodes on every
+# switch. Each entry is 150KB at 320x240, so this is deliberately small.
+FRAME_CACHE_LIMIT = 4
+
+# The only encoding the dock takes today. Part of the cache key regardless, so
+# a second one cannot be handed a frame packed for the first.
+ENCODING_RGB565 = 'rgb565'
+
+
 class FrameCache:
-    """Encoded RGB565 frame for the current artwork.
+    """Encoded frames for recent artwork, keyed by artwork, geometry and encoding.
 
     Re-sending after a device restart, or a heartbeat push, would otherwise
-    re-run the resize and pack work for artwork that has not changed.
+    re-run the resize and pack work for artwork that has not changed. Keyed on
+    the geometry as well as the artwork because the geometry is the dock's to
+    decide: it reports its own in every ack, and a cache that held one size
+    threw the frame away each time that answer changed.
+
+    Least recently used goes first. Frames that failed to encode are never
+    stored, so a bad thumbnail is retried rather than remembered as None.
     """
 
-    def __init__(self):
-        self._art_id: str | None = None
-        self._frame: bytes | None = None
-        self._size: tuple[int, int] = (0, 0)
+    def __init__(self, limit: int = FRAME_CACHE_LIMIT):
+        self._limit = limit
+        self._frames: OrderedDict[tuple, tuple[bytes, int, int]] = OrderedDict()
+
+    def get(self, art_id, target_size, encoding=ENCODING_RGB565):
+        """The cached (frame, width, height), or None if it has not been encoded."""
+        key = (art_id, target_size[0], target_size[1], encoding)
+        entry = self._frames.get(key)
+        if entry is not None:
+            self._frames.move_to_end(key)
+        metrics.increment('frame_cache.hit' if entry is not None else 'frame_cache.miss')
+        return entry
+
+    def store(self, art_id, target_size, entry, encoding=ENCODING_RGB565):
+        """Keep a (frame, width, height) encoded elsewhere - off the loop, say."""
+        if art_id is None or entry[0] is None:
+            return
+        key = (art_id, target_size[0], target_size[1], encoding)
+        self._frames[key] = entry
+        self._frames.move_to_end(key)
+        while len(self._frames) > self._limit:
+            self._frames.popitem(last=False)
 
-    def frame_for(self, thumbnail_bytes, art_id, target_size):
-        if art_id == self._art_id and self._frame is not None and self._size == target_size:
-            return self._frame, target_size[0], target_size[1]
+    def frame_for(self, thumbnail_bytes, art_id, target_size, encoding=ENCODING_RGB565):
+        entry = self.get(art_id, target_size, encoding)
+        if entry is not None:
+            return entry
 
-        frame, width, height = resize_thumbnail(thumbnail_bytes, target_size)
-        self._art_id = art_id
-        self._frame = frame
-        self._size = (width, height)
-        return frame, width, height
+        entry = resize_thumbnail(thumbnail_bytes, target_size)
+        self.store(art_id, target_size, entry, encoding)
+        return entry
 
     def clear(self):
-        self._art_id = None
-        self._frame = None
-        self._size = (0, 0)
+        self._frames.clear()
 
 
 class ColourCache:
@@ -468,7 +540,9 @@ class ColourCache:
 
     def colour_for(self, thumbnail_bytes, art_id) -> tuple[int, int, int] | None:
         if art_id is not None and art_id == self._art_id:
+            metrics.increment('colour_cache.hit')
             return self._colour
+        metrics.increment('colour_cache.miss')
         self._art_id = art_id
         self._colour = dominant_colour(thumbnail_bytes)
         return self._colour
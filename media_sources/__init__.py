@@ -0,0 +1,192 @@
+"""Where the worker learns what is playing.
+
+Everything NotificationsWrapper needs from a media player goes through the two
+classes here, so the refresh coalescing, the session grace period, the artwork
+chase and the push logic do not care whether the answers come from Windows or
+from somewhere else. Two backends:
+
+  * `windows` - the Global System Media Transport Controls, via winrt. What the
+    client ships with, and the only one that knows about real players.
+  * `fake` - an in-process stand-in driven by a script, so the worker can be run
+    and measured on any platform against a timeline of events reproduced from a
+    real player.
+
+Backends call their callbacks from whatever thread they like. WinRT uses its own
+pool threads, so the worker already hops every callback onto its loop and
+nothing here has to.
+"""
+
+import logging
+import os
+import sys
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import UTC, datetime
+
+logger = logging.getLogger(__name__)
+
+# Transport commands a session may be asked to run. Which ones it will actually
+# honour is reported per source in PlaybackInfo.
+TRANSPORT_COMMANDS = ('previous', 'next', 'play_pause')
+
+# What a session's change callback is told about. Sources raise these
+# separately, and what is worth re-reading depends on which one it was.
+EVENT_PROPERTIES = 'properties'  # title, artist, album or thumbnail
+EVENT_PLAYBACK = 'playback'  # status, rate or available controls
+EVENT_TIMELINE = 'timeline'  # position only: a seek, or the source re-dating its anchor
+
+
+@dataclass(frozen=True)
+class Timeline:
+    """How far into the track the source says it had got, and when it said so.
+
+    `position` is a snapshot rather than a running counter, and the difference
+    matters: Edge publishes one, then leaves it alone for about a minute, raising
+    no event in between. Read twenty seconds apart it is the same number twice,
+    so anything displaying it directly would sit still and then jump.
+
+    `updated_at` is what makes it usable - it says when the snapshot was taken,
+    so a reader can work out how far playback has moved since. Measured against
+    Edge, that extrapolation lands within half a second after a full minute of
+    drift, which is well inside a pixel on screen.
+    """
+
+    position: float  # seconds from the start of the media
+    start: float  # usually 0, but a source may report a window
+    end: float
+    updated_at: datetime
+    rate: float = 1.0
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+    def position_at(self, playing: bool, now: datetime | None = None) -> float:
+        """Where playback has reached now, extrapolated from the snapshot.
+
+        Only while playing. A paused source leaves `position` where playback
+        stopped and lets `updated_at` age, so counting from it would run the
+        display on through the pause - a five second pause measured five
+        seconds of error, against hundredths for the extrapolation itself.
+        """
+        if not playing:
+            return self.position
+
+        age = ((now or datetime.now(UTC)) - self.updated_at).total_seconds()
+        if not 0.0 <= age <= self.duration:
+            # Older than the track is long, or dated in the future: the anchor
+            # cannot say anything useful about now, so show what the source
+            # last claimed rather than a number derived from a bad timestamp.
+            return self.position
+
+        return min(self.position + age * self.rate, self.end)
+
+
+@dataclass(frozen=True)
+class MediaProperties:
+    """What a session says it is playing.
+
+    `thumbnail` is the backend's own handle on the artwork, not its bytes:
+    reading those is a separate and much dearer call, which the worker skips
+    once it holds artwork good enough. Pass it back to read_thumbnail().
+    """
+
+    title: str
+    artist: str
+    album: str
+    thumbnail: object = None
+
+
+@dataclass(frozen=True)
+class PlaybackInfo:
+    """A session's transport state, and which controls it will accept."""
+
+    status: str  # 'PLAYING', 'PAUSED', 'STOPPED', ... as Windows names them
+    rate: float = 1.0
+    can_previous: bool = False
+    can_next: bool = False
+    can_play_pause: bool = False
+
+
+class MediaSession(ABC):
+    """One player's session."""
+
+    @property
+    @abstractmethod
+    def source_id(self) -> str:
+        """Which player this is. Stable across the sessions it rebuilds per track."""
+
+    @abstractmethod
+    async def read_properties(self) -> MediaProperties:
+        """Current metadata. Raises if the session cannot be read yet."""
+
+    @abstractmethod
+    async def read_thumbnail(self, properties: MediaProperties) -> bytes | None:
+        """The artwork behind `properties.thumbnail`, or None if there is none."""
+
+    @abstractmethod
+    def playback_info(self) -> PlaybackInfo:
+        """Transport state. Cheap and synchronous."""
+
+    @abstractmethod
+    def timeline(self, playback: PlaybackInfo) -> Timeline | None:
+        """Playback position, or None from a source that does not report one."""
+
+    @abstractmethod
+    def subscribe(self, callback: Callable[[str], None]) -> None:
+        """Call `callback(event)` on every change, from any thread. See EVENT_*."""
+
+    @abstractmethod
+    def unsubscribe(self) -> None:
+        """Undo subscribe(). Must not raise on a session already torn down."""
+
+    @abstractmethod
+    async def run_command(self, command: str) -> bool:
+        """Run one of TRANSPORT_COMMANDS. True if the source accepted it."""
+
+
+class MediaSource(ABC):
+    """The system-wide view: which session is current, and when that changes."""
+
+    @abstractmethod
+    async def start(self, on_session_changed: Callable[[], None]) -> None:
+        """Begin listening. `on_session_changed()` may be called from any thread."""
+
+    @abstractmethod
+    def stop(self) -> None:
+        """Stop listening and let go of anything held on the system's side."""
+
+    @abstractmethod
+    def current_session(self) -> MediaSession | None:
+        """The session the system considers current, if any."""
+
+
+# Set to a file path to record everything the worker reads into a trace that
+# tools/replay.py can play back. See media_sources/recording.py.
+TRACE_ENV = 'VOBOT_TRACE'
+
+
+def default_source() -> MediaSource:
+    """The backend for this platform, recording to a trace if asked to.
+
+    Imported lazily, so winrt is never loaded where it cannot work, and a
+    platform with no backend of its own still gets a worker that runs - it just
+    never sees anything playing.
+    """
+    if sys.platform == 'win32':
+        from media_sources.windows import WindowsMediaSource
+
+        source = WindowsMediaSource()
+    else:
+        from media_sources.fake import FakeMediaSource
+
+        logger.warning('No media backend for %s; nothing will be seen playing', sys.platform)
+        source = FakeMediaSource()
+
+    trace_path = os.environ.get(TRACE_ENV)
+    if trace_path:
+        from media_sources.recording import RecordingMediaSource
+
+        source = RecordingMediaSource(source, trace_path)
+    return source
@@ -0,0 +1,208 @@
+"""A media source driven by a script rather than by a real player.
+
+For running the worker where there is no Windows session to watch, and for
+replaying the awkward things real players do - a session that vanishes for
+half a second on every skip, artwork published in phases - on demand and with
+repeatable timing.
+
+Everything is set from the loop's thread. Callbacks fire synchronously from
+the setter that caused them, which is the same contract WinRT honours, just
+from a different thread.
+"""
+
+import asyncio
+import logging
+from collections.abc import Callable
+from datetime import UTC, datetime
+
+from media_sources import (
+    EVENT_PLAYBACK,
+    EVENT_PROPERTIES,
+    EVENT_TIMELINE,
+    TRANSPORT_COMMANDS,
+    MediaProperties,
+    MediaSession,
+    MediaSource,
+    PlaybackInfo,
+    Timeline,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class FakeMediaSession(MediaSession):
+    """A session whose every answer is set by hand.
+
+    `read_delay` and `thumbnail_delay` stand in for the cross-process calls a
+    real session makes, which are what leave room for the races the worker
+    guards against. Measured against Windows they are a few milliseconds each.
+    """
+
+    def __init__(self, source_id: str, read_delay: float = 0.0, thumbnail_delay: float = 0.0):
+        self._source_id = source_id
+        self.read_delay = read_delay
+        self.thumbnail_delay = thumbnail_delay
+        self._properties = MediaProperties('', '', '')
+        self._playback = PlaybackInfo('PLAYING', can_previous=True, can_next=True, can_play_pause=True)
+        self._timeline: Timeline | None = None
+        self._readable = True
+        self._callback: Callable[[str], None] | None = None
+        # Every command the worker ran, in order.
+        self.commands: list[str] = []
+        # Reads the worker made, for measuring what a change cost it.
+        self.property_reads = 0
+        self.thumbnail_reads = 0
+
+    @property
+    def source_id(self) -> str:
+        return self._source_id
+
+    # -- Script side -------------------------------------------------------
+
+    def set_properties(self, title='', artist='', album='', thumbnail: bytes | None = None, notify=True):
+        """Change the metadata. The thumbnail handle here is simply its bytes."""
+        self._properties = MediaProperties(title, artist, album, thumbnail)
+        if notify:
+            self._notify(EVENT_PROPERTIES)
+
+    def set_thumbnail(self, thumbnail: bytes | None, notify=True):
+        """Swap the artwork alone, which is how sources publish it in phases."""
+        current = self._properties
+        self._properties = MediaProperties(current.title, current.artist, current.album, thumbnail)
+        if notify:
+            self._notify(EVENT_PROPERTIES)
+
+    def set_playback(
+        self, status='PLAYING', rate=1.0, can_previous=True, can_next=True, can_play_pause=True, notify=True
+    ):
+        self._playback = PlaybackInfo(status, rate, can_previous, can_next, can_play_pause)
+        if notify:
+            self._notify(EVENT_PLAYBACK)
+
+    def set_timeline(
+        self, position: float, end: float, start: float = 0.0, updated_at: datetime | None = None, notify=True
+    ):
+        """Publish a position snapshot, as a seek or a source re-dating its anchor does."""
+        self._timeline = Timeline(
+            position=position,
+            start=start,
+            end=end,
+            updated_at=updated_at or datetime.now(UTC),
+            rate=self._playback.rate,
+        )
+        if notify:
+            self._notify(EVENT_TIMELINE)
+
+    def set_readable(self, readable: bool):
+        """An unreadable session raises from read_properties(), like Windows
+        Media Player does for a moment after opening a file."""
+        self._readable = readable
+
+    def _notify(self, event: str):
+        if self._callback is not None:
+            self._callback(event)
+
+    # -- MediaSession ------------------------------------------------------
+
+    async def read_properties(self) -> MediaProperties:
+        self.property_reads += 1
+        if self.read_delay:
+            await asyncio.sleep(self.read_delay)
+        if not self._readable:
+            raise OSError('The device is not ready')
+        return self._properties
+
+    async def read_thumbnail(self, properties: MediaProperties) -> bytes | None:
+        self.thumbnail_reads += 1
+        if self.thumbnail_delay:
+            await asyncio.sleep(self.thumbnail_delay)
+        # What is on offer at the time of the read, not at the time of the
+        # properties read before it - real sessions behave the same way, and
+        # that gap is where a previous track's artwork leaks across.
+        return self._properties.thumbnail
+
+    def playback_info(self) -> PlaybackInfo:
+        return self._playback
+
+    def timeline(self, playback: PlaybackInfo) -> Timeline | None:
+        return self._timeline
+
+    def subscribe(self, callback):
+        self._callback = callback
+
+    def unsubscribe(self):
+        self._callback = None
+
+    async def run_command(self, command: str) -> bool:
+        if command not in TRANSPORT_COMMANDS:
+            raise ValueError(f'Unknown command {command!r}')
+        self.commands.append(command)
+        if command == 'play_pause' and self._playback.can_play_pause:
+            status = 'PAUSED' if self._playback.status == 'PLAYING' else 'PLAYING'
+            playback = self._playback
+            self.set_playback(status, playback.rate, playback.can_previous, playback.can_next, playback.can_play_pause)
+            return True
+        return {'previous': self._playback.can_previous, 'next': self._playback.can_next}.get(command, False)
+
+
+class FakeMediaSource(MediaSource):
+    """A system with as many fake sessions as the script opens."""
+
+    def __init__(self):
+        self._sessions: dict[str, FakeMediaSession] = {}
+        self._current: FakeMediaSession | None = None
+        self._on_session_changed: Callable[[], None] | None = None
+
+    async def start(self, on_session_changed):
+        self._on_session_changed = on_session_changed
+
+    def stop(self):
+        self._on_session_changed = None
+
+    def current_session(self) -> FakeMediaSession | None:
+        return self._current
+
+    # -- Script side -------------------------------------------------------
+
+    def open_session(self, source_id: str, **kwargs) -> FakeMediaSession:
+        """Create a session, without making it current."""
+        session = FakeMediaSession(source_id, **kwargs)
+        self._sessions[source_id] = session
+        return session
+
+    def session(self, source_id: str) -> FakeMediaSession:
+        return self._sessions[source_id]
+
+    def set_current(self, source_id: str | None):
+        """Make a session current - or none, which is a player going away.
+
+        Passing the id of the session already current replaces it with a new
+        object under the same id, which is what a source that rebuilds its
+        session per track looks like from the outside.
+        """
+        if source_id is None:
+            self._current = None
+        else:
+            previous = self._sessions[source_id]
+            if previous is self._current:
+                rebuilt = FakeMediaSession(source_id, previous.read_delay, previous.thumbnail_delay)
+                rebuilt._properties = previous._properties
+                rebuilt._playback = previous._playback
+                rebuilt._timeline = previous._timeline
+                rebuilt.commands = previous.commands
+                self._sessions[source_id] = rebuilt
+                previous = rebuilt
+            self._current = previous
+        if self._on_session_changed is not None:
+            self._on_session_changed()
+
+    async def run_script(self, steps):
+        """Play `(delay_seconds, action)` pairs in order, each after its delay.
+
+        Delays are relative to the step before, which is how a timeline noted
+        down from a real player reads most naturally.
+        """
+        for delay, action in steps:
+            if delay:
+                await asyncio.sleep(delay)
+            action()
@@ -0,0 +1,259 @@
+"""Recording what a real player does, and playing it back through the fake.
+
+A trace is what the worker saw, in the order and at the time it saw it: which
+session was current, every change event, and the result of every read it made.
+Recorded from the WinRT backend on a real machine, it captures the things that
+are awkward to describe and impossible to reproduce by hand - Edge dropping its
+session for 0.55-0.76s on every skip, Firefox publishing artwork in three
+phases - and replays them anywhere the fake backend runs.
+
+The file is JSON lines. The first is a header, every one after it a list led by
+its time in seconds from the start of the recording:
+
+    [t, "current", source_id | null]
+    [t, "event", source_id, "properties" | "playback" | "timeline"]
+    [t, "props", source_id, title, artist, album]
+    [t, "unreadable", source_id]
+    [t, "blob", blob_id, base64]          - a thumbnail, once, before first use
+    [t, "thumb", source_id, blob_id | null]
+    [t, "playback", source_id, status, rate, can_previous, can_next, can_play_pause]
+    [t, "timeline", source_id, position, start, end, age]
+
+Timeline anchors keep their age rather than their timestamp, so a replay dates
+them against its own clock.
+
+Set VOBOT_TRACE to a path to record the shipped client. See default_source().
+"""
+
+import base64
+import hashlib
+import json
+import logging
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+from media_sources import MediaSession, MediaSource
+from media_sources.fake import FakeMediaSource
+
+logger = logging.getLogger(__name__)
+
+TRACE_VERSION = 1
+
+
+class TraceWriter:
+    """Appends trace records. Thread-safe: WinRT calls back on its own threads."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'w', encoding='utf-8')  # noqa: SIM115 - held for the life of the recording
+        self._lock = threading.Lock()
+        self._started = time.monotonic()
+        self._blobs: set[str] = set()
+        self._write_line({'trace': TRACE_VERSION, 'recorded': datetime.now(UTC).isoformat()})
+        logger.info('Recording media session trace to %s', path)
+
+    def _write_line(self, value):
+        self._file.write(json.dumps(value, separators=(',', ':')) + '\n')
+        self._file.flush()
+
+    def record(self, kind: str, *fields):
+        with self._lock:
+            if self._file.closed:
+                return
+            self._write_line([round(time.monotonic() - self._started, 4), kind, *fields])
+
+    def record_thumbnail(self, source_id: str, data: bytes | None):
+        blob_id = hashlib.sha1(data).hexdigest()[:16] if data else None
+        with self._lock:
+            if self._file.closed:
+                return
+            now = round(time.monotonic() - self._started, 4)
+            if blob_id is not None and blob_id not in self._blobs:
+                self._blobs.add(blob_id)
+                self._write_line([now, 'blob', blob_id, base64.b64encode(data).decode('ascii')])
+            self._write_line([now, 'thumb', source_id, blob_id])
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+class RecordingMediaSession(MediaSession):
+    """Passes everything through to a real session, writing down what came back."""
+
+    def __init__(self, inner: MediaSession, writer: TraceWriter):
+        self._inner = inner
+        self._writer = writer
+
+    @property
+    def source_id(self) -> str:
+        return self._inner.source_id
+
+    async def read_properties(self):
+        try:
+            properties = await self._inner.read_properties()
+        except Exception:
+            self._writer.record('unreadable', self.source_id)
+            raise
+        self._writer.record('props', self.source_id, properties.title, properties.artist, properties.album)
+        return properties
+
+    async def read_thumbnail(self, properties):
+        data = await self._inner.read_thumbnail(properties)
+        self._writer.record_thumbnail(self.source_id, data)
+        return data
+
+    def playback_info(self):
+        info = self._inner.playback_info()
+        self._writer.record(
+            'playback', self.source_id, info.status, info.rate, info.can_previous, info.can_next, info.can_play_pause
+        )
+        return info
+
+    def timeline(self, playback):
+        timeline = self._inner.timeline(playback)
+        if timeline is not None:
+            age = (datetime.now(UTC) - timeline.updated_at).total_seconds()
+            self._writer.record(
+                'timeline', self.source_id, timeline.position, timeline.start, timeline.end, round(age, 4)
+            )
+        return timeline
+
+    def subscribe(self, callback):
+        source_id = self.source_id
+
+        def recorded(event):
+            self._writer.record('event', source_id, event)
+            callback(event)
+
+        self._inner.subscribe(recorded)
+
+    def unsubscribe(self):
+        self._inner.unsubscribe()
+
+    async def run_command(self, command):
+        return await self._inner.run_command(command)
+
+
+class RecordingMediaSource(MediaSource):
+    def __init__(self, inner: MediaSource, path: str):
+        self._inner = inner
+        self._writer = TraceWriter(path)
+
+    async def start(self, on_session_changed):
+        def recorded():
+            session = self._inner.current_session()
+            self._writer.record('current', session.source_id if session is not None else None)
+            on_session_changed()
+
+        await self._inner.start(recorded)
+        session = self._inner.current_session()
+        self._writer.record('current', session.source_id if session is not None else None)
+
+    def stop(self):
+        self._inner.stop()
+        self._writer.close()
+
+    def current_session(self):
+        session = self._inner.current_session()
+        return RecordingMediaSession(session, self._writer) if session is not None else None
+
+
+def read_trace(path: str) -> tuple[dict, list[list], dict[str, bytes]]:
+    """Header, records (blobs removed) and the thumbnails they refer to."""
+    records = []
+    blobs = {}
+    with open(path, encoding='utf-8') as file:
+        header = json.loads(file.readline())
+        if header.get('trace') != TRACE_VERSION:
+            raise ValueError(f'{path} is not a version {TRACE_VERSION} trace')
+        for line in file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            if record[1] == 'blob':
+                blobs[record[2]] = base64.b64decode(record[3])
+            else:
+                records.append(record)
+    return header, records, blobs
+
+
+# Applied before the event at the same instant, which is the order the player
+# did them in: state first, then the notification that it changed.
+_STATE_FIRST, _CURRENT, _EVENT = 0, 1, 2
+
+
+def replay_steps(records: list[list], blobs: dict[str, bytes], source: FakeMediaSource) -> list[tuple]:
+    """Turn trace records into run_script() steps against `source`.
+
+    A trace holds what each read returned, which is later than when the player
+    changed it - the read follows the event. Replayed at face value, the same
+    read by a replayed worker would see the old value. So state is moved back to
+    the last event or session change that announced it.
+    """
+    announced: dict[str, float] = {}
+    timed = []
+    for sequence, record in enumerate(records):
+        t, kind = record[0], record[1]
+        if kind == 'current':
+            source_id = record[2]
+            if source_id is not None:
+                announced[source_id] = t
+                _ensure_session(source, source_id)
+            timed.append((t, _CURRENT, sequence, _set_current(source, source_id)))
+        elif kind == 'event':
+            announced[record[2]] = t
+            _ensure_session(source, record[2])
+            timed.append((t, _EVENT, sequence, _notify(source, record[2], record[3])))
+        else:
+            source_id = record[2]
+            _ensure_session(source, source_id)
+            at = announced.get(source_id, t)
+            timed.append((at, _STATE_FIRST, sequence, _apply_state(source, record, blobs)))
+
+    timed.sort(key=lambda item: item[:3])
+    steps = []
+    previous = 0.0
+    for t, _, _, action in timed:
+        steps.append((max(0.0, t - previous), action))
+        previous = max(previous, t)
+    return steps
+
+
+def _ensure_session(source: FakeMediaSource, source_id: str):
+    try:
+        source.session(source_id)
+    except KeyError:
+        source.open_session(source_id)
+
+
+def _set_current(source, source_id):
+    return lambda: source.set_current(source_id)
+
+
+def _notify(source, source_id, event):
+    return lambda: source.session(source_id)._notify(event)
+
+
+def _apply_state(source, record, blobs):
+    kind, source_id, fields = record[1], record[2], record[3:]
+
+    def apply():
+        session = source.session(source_id)
+        if kind == 'props':
+            title, artist, album = fields
+            session.set_readable(True)
+            current = session._properties
+            session.set_properties(title, artist, album, current.thumbnail, notify=False)
+        elif kind == 'unreadable':
+            session.set_readable(False)
+        elif kind == 'thumb':
+            session.set_thumbnail(blobs.get(fields[0]) if fields[0] else None, notify=False)
+        elif kind == 'playback':
+            session.set_playback(*fields, notify=False)
+        elif kind == 'timeline':
+            position, start, end, age = fields
+            session.set_timeline(position, end, start, datetime.now(UTC) - timedelta(seconds=age), notify=False)
+
+    return apply
@@ -0,0 +1,207 @@
+"""Media sessions from Windows' Global System Media Transport Controls."""
+
+import logging
+from datetime import UTC
+
+import winrt.windows.media.control as media_control
+from winrt.windows.storage import streams
+
+from media_sources import (
+    EVENT_PLAYBACK,
+    EVENT_PROPERTIES,
+    EVENT_TIMELINE,
+    MediaProperties,
+    MediaSession,
+    MediaSource,
+    PlaybackInfo,
+    Timeline,
+)
+
+logger = logging.getLogger(__name__)
+
+# Transport commands, mapped to the session method that performs them.
+_COMMAND_METHODS = {
+    'previous': 'try_skip_previous_async',
+    'next': 'try_skip_next_async',
+    'play_pause': 'try_toggle_play_pause_async',
+}
+
+
+def _available_controls(playback_info) -> tuple[bool, bool, bool]:
+    """Which transport buttons this source will honour.
+
+    Reported by Windows per session rather than assumed: a browser tab commonly
+    offers play/pause with no track skipping, and a source that has just started
+    may briefly offer nothing at all.
+    """
+    try:
+        controls = playback_info.controls
+        if controls is None:
+            return False, False, False
+        return (
+            bool(controls.is_previous_enabled),
+            bool(controls.is_next_enabled),
+            bool(controls.is_play_pause_toggle_enabled or controls.is_play_enabled or controls.is_pause_enabled),
+        )
+    except Exception:
+        logger.debug('Could not read the available controls', exc_info=True)
+        return False, False, False
+
+
+async def get_thumbnail_data(thumbnail):
+    if thumbnail is None:
+        return None
+
+    with await thumbnail.open_read_async() as stream, stream.get_input_stream_at(0) as input_stream:
+        # Allocate a buffer.
+        logger.debug('Reading into buffer of size: %d bytes', stream.size)
+        buffer = streams.Buffer(stream.size)
+        read_buffer = await input_stream.read_async(buffer, buffer.capacity, streams.InputStreamOptions.NONE)
+
+        # Read bytes from IBuffer using DataReader.
+        with streams.DataReader.from_buffer(read_buffer) as data_reader:
+            byte_array = bytearray(read_buffer.length)
+            data_reader.read_bytes(byte_array)
+            return bytes(byte_array)
+
+
+class WindowsMediaSession(MediaSession):
+    """One GlobalSystemMediaTransportControlsSession."""
+
+    def __init__(self, session):
+        self._session = session
+        self._source_id = session.source_app_user_model_id
+        self._tokens: tuple | None = None
+
+    @property
+    def source_id(self) -> str:
+        return self._source_id
+
+    async def read_properties(self) -> MediaProperties:
+        properties = await self._session.try_get_media_properties_async()
+        return MediaProperties(
+            title=properties.title or '',
+            artist=properties.artist or '',
+            album=properties.album_title or '',
+            thumbnail=properties.thumbnail,
+        )
+
+    async def read_thumbnail(self, properties: MediaProperties) -> bytes | None:
+        return await get_thumbnail_data(properties.thumbnail)
+
+    def playback_info(self) -> PlaybackInfo:
+        info = self._session.get_playback_info()
+        can_previous, can_next, can_play_pause = _available_controls(info)
+        return PlaybackInfo(
+            status=info.playback_status.name,
+            # Podcast apps and browsers both offer speed controls, and the
+            # position advances at that rate rather than in real time.
+            rate=float(info.playback_rate or 1.0),
+            can_previous=can_previous,
+            can_next=can_next,
+            can_play_pause=can_play_pause,
+        )
+
+    def timeline(self, playback: PlaybackInfo) -> Timeline | None:
+        """The source's playback position, or None if it does not report one.
+
+        Synchronous and cheap, unlike the media properties and the thumbnail, so
+        it rides along with every refresh the client already does. The anchor
+        carries its own timestamp, so one read ten seconds ago is as accurate as
+        one read now - until the user drags the source's own scrubber, which is
+        what EVENT_TIMELINE is for. Some sources raise that every second of
+        plain playback, so the worker keeps it off the full refresh path.
+        """
+        try:
+            timeline = self._session.get_timeline_properties()
+            start = timeline.start_time.total_seconds()
+            end = timeline.end_time.total_seconds()
+            if end <= start:
+                # Nothing to draw against. A live stream has no end, and plenty
+                # of sources simply leave the timeline empty.
+                return None
+
+            updated_at = timeline.last_updated_time
+            if updated_at.tzinfo is None:
+                # Documented as UTC, and winrt does tag it - but an untagged one
+                # reaching position_at() would raise inside a repaint timer.
+                updated_at = updated_at.replace(tzinfo=UTC)
+
+            return Timeline(
+                position=min(max(timeline.position.total_seconds(), start), end),
+                start=start,
+                end=end,
+                updated_at=updated_at,
+                rate=playback.rate,
+            )
+        except Exception:
+            logger.debug('Could not read the timeline properties', exc_info=True)
+            return None
+
+    def subscribe(self, callback):
+        self.unsubscribe()
+        self._tokens = (
+            self._session.add_media_properties_changed(lambda sender, args: callback(EVENT_PROPERTIES)),
+            self._session.add_playback_info_changed(lambda sender, args: callback(EVENT_PLAYBACK)),
+            self._session.add_timeline_properties_changed(lambda sender, args: callback(EVENT_TIMELINE)),
+        )
+
+    def unsubscribe(self):
+        tokens, self._tokens = self._tokens, None
+        if tokens is None:
+            return
+        properties_token, playback_token, timeline_token = tokens
+        try:
+            self._session.remove_media_properties_changed(properties_token)
+            self._session.remove_playback_info_changed(playback_token)
+            self._session.remove_timeline_properties_changed(timeline_token)
+        except Exception:
+            # The session may already be gone; nothing to unhook.
+            logger.debug('Could not detach from the previous session', exc_info=True)
+
+    async def run_command(self, command: str) -> bool:
+        method_name = _COMMAND_METHODS[command]
+        return bool(await getattr(self._session, method_name)())
+
+
+class WindowsMediaSource(MediaSource):
+    def __init__(self):
+        # The manager has to be held for as long as we are listening: letting
+        # it go unsubscribes us from the session-changed event. stop() releases
+        # it deliberately on the way out.
+        self._manager = None
+        self._token = None
+
+    async def start(self, on_session_changed):
+        self._manager = await media_control.GlobalSystemMediaTransportControlsSessionManager.request_async()
+        self._token = self._manager.add_current_session_changed(lambda sender, args: on_session_changed())
+
+    def stop(self):
+        """Let go of the session manager and its subscription.
+
+        Left attached, WinRT keeps a delegate into this process alive until it
+        exits, and can call it while the loop is already closing.
+
+        This does not silence the "Exception ignored in
+        _DeleteDummyThreadOnDel.__del__" pair sometimes printed on exit. That
+        comes from the Thread objects CPython fabricates for the Windows
+        thread-pool threads WinRT calls back on: they stay registered until
+        those threads die, which is never, so they are collected during
+        interpreter finalization after threading's own globals have gone. The
+        message is harmless and not ours to fix - but unhooking is still right.
+        """
+        manager, token = self._manager, self._token
+        self._manager = None
+        self._token = None
+        if manager is None or token is None:
+            return
+        try:
+            manager.remove_current_session_changed(token)
+        except Exception:
+            logger.debug('Could not detach from the session manager', exc_info=True)
+
+    def current_session(self) -> WindowsMediaSession | None:
+        if self._manager is None:
+            return None
+        session = self._manager.get_current_session()
+        return WindowsMediaSession(session) if session is not None else None
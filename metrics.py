@@ -0,0 +1,219 @@
+"""Counters, gauges and timing histograms for the client's hot path.
+
+The log says what happened; this says where the time went. Every stage of a
+track change - reading the session, reading the thumbnail, decoding, resizing,
+packing, the handshake with the dock and the body after it - records how long
+it took, so a slow change can be pinned on one of them rather than guessed at.
+
+Recording is a dictionary lookup and a lock, cheap enough to leave on. Nothing
+leaves the process unless start_snapshots() is called, which writes the lot to a
+JSON file every so often - local, and readable without any tooling:
+
+    %APPDATA%\\overThere\\Vobot Now Playing\\metrics.json
+
+Thread-safe: frames are encoded on executor threads and discovery runs on one.
+"""
+
+import bisect
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds of the histogram buckets, in milliseconds. Spans the cheap stages
+# (a few ms to pack a frame) through to a frame transfer over WiFi (2-3s) and
+# the timeouts beyond it.
+BUCKETS_MS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 20000)
+
+# How often start_snapshots() rewrites the file, if anything has changed.
+SNAPSHOT_SECONDS = 60
+
+
+class Histogram:
+    """Durations, bucketed. Keeps the extremes and the total alongside."""
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def observe(self, ms: float):
+        self.counts[bisect.bisect_left(BUCKETS_MS, ms)] += 1
+        self.count += 1
+        self.total_ms += ms
+        self.max_ms = max(self.max_ms, ms)
+
+    def quantile(self, q: float) -> float | None:
+        """Upper bound of the bucket holding the q-th observation."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max_ms
+        return self.max_ms
+
+    def snapshot(self) -> dict:
+        return {
+            'count': self.count,
+            'mean_ms': round(self.total_ms / self.count, 2) if self.count else None,
+            'p50_ms': self.quantile(0.5),
+            'p90_ms': self.quantile(0.9),
+            'max_ms': round(self.max_ms, 2),
+            'buckets': {
+                str(bound): count for bound, count in zip((*BUCKETS_MS, 'inf'), self.counts, strict=True) if count
+            },
+        }
+
+
+_lock = threading.Lock()
+_counters: dict[str, int] = {}
+_gauges: dict[str, float] = {}
+_histograms: dict[str, Histogram] = {}
+_started = time.time()
+# When this module was imported, which the entry point does before building
+# anything. Start-up milestones are measured from here. See startup().
+_launched = time.perf_counter()
+# Bumped on every change, so the snapshot writer can tell whether to bother.
+_version = 0
+
+
+def increment(name: str, amount: int = 1):
+    global _version
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + amount
+        _version += 1
+
+
+def set_gauge(name: str, value: float):
+    global _version
+    with _lock:
+        _gauges[name] = value
+        _version += 1
+
+
+def observe(name: str, seconds: float):
+    """Record one duration under `name`."""
+    global _version
+    with _lock:
+        histogram = _histograms.get(name)
+        if histogram is None:
+            histogram = _histograms[name] = Histogram()
+        histogram.observe(seconds * 1000)
+        _version += 1
+
+
+@contextmanager
+def timed(name: str):
+    """Time the block under `name`. Fine around awaits: it is wall time either way."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - started)
+
+
+def startup(stage: str):
+    """Record how far into the launch `stage` was reached, the first time only.
+
+    Filed as a timing, `startup.<stage>`, so a slow start at login shows up in
+    metrics.json beside everything else.
+    """
+    global _version
+    name = f'startup.{stage}'
+    with _lock:
+        if name in _histograms:
+            return
+        histogram = _histograms[name] = Histogram()
+        histogram.observe((time.perf_counter() - _launched) * 1000)
+        _version += 1
+    logger.info('Start-up: %s after %.0fms', stage, histogram.max_ms)
+
+
+def counter(name: str) -> int:
+    with _lock:
+        return _counters.get(name, 0)
+
+
+def snapshot() -> dict:
+    with _lock:
+        return {
+            'started': _started,
+            'taken': time.time(),
+            'counters': dict(sorted(_counters.items())),
+            'gauges': dict(sorted(_gauges.items())),
+            'timings': {name: _histograms[name].snapshot() for name in sorted(_histograms)},
+        }
+
+
+def reset():
+    """Forget everything recorded so far."""
+    global _version, _started
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+        _started = time.time()
+        _version += 1
+
+
+def write_snapshot(path: str):
+    """Write snapshot() to `path`, replacing it whole so a reader never sees half."""
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as file:
+        json.dump(snapshot(), file, indent=2)
+    os.replace(temp_path, path)
+
+
+class _SnapshotWriter(threading.Thread):
+    def __init__(self, path: str, interval: float):
+        super().__init__(name='metrics-snapshot', daemon=True)
+        self.path = path
+        self.interval = interval
+        self._stopping = threading.Event()
+        self._written = -1
+
+    def run(self):
+        while not self._stopping.wait(self.interval):
+            self.flush()
+
+    def flush(self):
+        if _version == self._written:
+            return
+        self._written = _version
+        try:
+            write_snapshot(self.path)
+        except OSError as exc:
+            logger.debug('Could not write metrics to %s: %s', self.path, exc)
+
+    def stop(self):
+        self._stopping.set()
+        self.join()
+        self.flush()
+
+
+_writer: _SnapshotWriter | None = None
+
+
+def start_snapshots(path: str, interval: float = SNAPSHOT_SECONDS):
+    """Write a snapshot to `path` every `interval` seconds until stop_snapshots()."""
+    global _writer
+    stop_snapshots()
+    _writer = _SnapshotWriter(path, interval)
+    _writer.start()
+    logger.info('Metrics file: %s', path)
+
+
+def stop_snapshots():
+    """Stop the periodic writer, writing one last snapshot on the way out."""
+    global _writer
+    writer, _writer = _writer, None
+    if writer is not None:
+        writer.stop()
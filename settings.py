@@ -7,12 +7,17 @@ QSettings would default to the registry on Windows. An INI file under %APPDATA%
 is used instead so the values can be read and edited with a text editor:
 
     %APPDATA%\\overThere\\Vobot Now Playing\\settings.ini
+
+It is read once into a Snapshot, which is what the accessors answer from, and
+re-read when the file is edited by hand while the app runs.
 """
 
 import logging
 import os
+from collections.abc import Callable
+from dataclasses import dataclass, replace
 
-from PyQt5.QtCore import QSettings, QStandardPaths
+from PyQt5.QtCore import QFileSystemWatcher, QSettings, QStandardPaths
 
 from constants import LIGHT_BRIGHTNESS_DEFAULT, TCP_IP, TCP_PORT
 
@@ -102,97 +107,225 @@ def init() -> None:
         settings.sync()
 
     logger.info('Settings file: %s', path)
+    _publish(_load())
 
 
-def device_host() -> str:
-    return str(_settings().value(KEY_HOST, DEFAULTS[KEY_HOST]))
+@dataclass(frozen=True)
+class Snapshot:
+    """Every setting but the window geometry, parsed.
+
+    Read on hot paths - the worker on each push, the taskbar on each track and
+    progress tick - where going to QSettings meant resolving the path and
+    consulting the INI parser every time. One of these is built when the file
+    is loaded and replaced whole on any change, so a reader on another thread
+    sees either the old settings or the new ones, never half of each.
+    """
 
+    host: str
+    port: int
+    auto_discover: bool
+    light_enabled: bool
+    light_brightness: int
+    close_to_tray: bool
+    start_minimized: bool
+    tray_hint: bool
+    taskbar_button: bool
+    taskbar_media_controls: bool
+    taskbar_artwork_icon: bool
+    taskbar_progress: bool
 
-def device_port() -> int:
+
+_current: Snapshot | None = None
+_watcher: QFileSystemWatcher | None = None
+
+
+def current() -> Snapshot:
+    """The settings as they stand. Safe from any thread; only the GUI thread
+    changes them."""
+    snapshot = _current
+    if snapshot is None:
+        snapshot = _publish(_load())
+    return snapshot
+
+
+def _publish(snapshot: Snapshot) -> Snapshot:
+    global _current
+    _current = snapshot
+    return snapshot
+
+
+def _load() -> Snapshot:
+    settings = _settings()
+    # Picks up an edit made outside this process; QSettings otherwise answers
+    # from what it read earlier.
+    settings.sync()
+
+    def flag(key):
+        return _to_bool(settings.value(key, DEFAULTS[key]))
+
+    return Snapshot(
+        host=str(settings.value(KEY_HOST, DEFAULTS[KEY_HOST])),
+        port=_read_port(settings),
+        auto_discover=flag(KEY_AUTO_DISCOVER),
+        light_enabled=flag(KEY_LIGHT_ENABLED),
+        light_brightness=_read_brightness(settings),
+        close_to_tray=flag(KEY_CLOSE_TO_TRAY),
+        start_minimized=flag(KEY_START_MINIMIZED),
+        tray_hint=flag(KEY_TRAY_HINT),
+        taskbar_button=flag(KEY_TASKBAR_BUTTON),
+        taskbar_media_controls=flag(KEY_TASKBAR_MEDIA_CONTROLS),
+        taskbar_artwork_icon=flag(KEY_TASKBAR_ARTWORK_ICON),
+        taskbar_progress=flag(KEY_TASKBAR_PROGRESS),
+    )
+
+
+def _read_port(settings: QSettings) -> int:
     fallback = DEFAULTS[KEY_PORT]
     try:
-        return int(_settings().value(KEY_PORT, fallback))
+        return int(settings.value(KEY_PORT, fallback))
     except (TypeError, ValueError):
         logger.warning('Stored port is not a number; falling back to %d', fallback)
         return fallback
 
 
+def _read_brightness(settings: QSettings) -> int:
+    """Clamped as well as parsed, since this is hand-editable and the dock would
+    otherwise be handed a value its API does not accept."""
+    fallback = DEFAULTS[KEY_LIGHT_BRIGHTNESS]
+    try:
+        value = int(settings.value(KEY_LIGHT_BRIGHTNESS, fallback))
+    except (TypeError, ValueError):
+        logger.warning('Stored light brightness is not a number; falling back to %d', fallback)
+        return fallback
+    return max(0, min(100, value))
+
+
+def _set_flag(key: str, field: str, enabled: bool) -> None:
+    _settings().setValue(key, bool(enabled))
+    _publish(replace(current(), **{field: bool(enabled)}))
+
+
+def watch(on_change: Callable[[], None]) -> None:
+    """Call `on_change` whenever settings.ini is edited by hand.
+
+    Call once, from the GUI thread, after init(). Changes made through the
+    setters here are already in the snapshot by the time the file is written,
+    so they reload to the same thing and do not call it.
+
+    The folder is watched as well as the file. QFileSystemWatcher can only
+    watch a file that exists, and the file can be missing when this is called -
+    init() could not write it, or it was deleted - or it can go missing later,
+    when an editor saves by replacing it. The folder changing is the cue to
+    watch whatever now has the name.
+    """
+    global _watcher
+
+    path = ini_path()
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    _watcher = QFileSystemWatcher([directory])
+
+    def reload():
+        previous = _current
+        snapshot = _publish(_load())
+        if snapshot != previous:
+            logger.info('Settings file changed; applying')
+            on_change()
+
+    def rewatch() -> bool:
+        """Watch the file if it exists and is not watched. True if it now is."""
+        if path in _watcher.files() or not os.path.exists(path):
+            return False
+        return _watcher.addPath(path)
+
+    def file_changed(_path):
+        rewatch()
+        reload()
+
+    def directory_changed(_path):
+        # Other files live here too - the log, metrics, the last push - and
+        # change far more often. Only a settings file that has just appeared
+        # is news; edits to one already watched arrive as fileChanged.
+        if rewatch():
+            reload()
+
+    rewatch()
+    _watcher.fileChanged.connect(file_changed)
+    _watcher.directoryChanged.connect(directory_changed)
+
+
+def device_host() -> str:
+    return current().host
+
+
+def device_port() -> int:
+    return current().port
+
+
 def set_device_address(host: str, port: int) -> None:
     settings = _settings()
     settings.setValue(KEY_HOST, host)
     settings.setValue(KEY_PORT, int(port))
-
-
-def _bool_setting(key: str) -> bool:
-    """Read a stored flag, falling back to its default from DEFAULTS."""
-    return _to_bool(_settings().value(key, DEFAULTS[key]))
+    _publish(replace(current(), host=host, port=int(port)))
 
 
 def auto_discover() -> bool:
-    return _bool_setting(KEY_AUTO_DISCOVER)
+    return current().auto_discover
 
 
 def set_auto_discover(enabled: bool) -> None:
-    _settings().setValue(KEY_AUTO_DISCOVER, bool(enabled))
+    _set_flag(KEY_AUTO_DISCOVER, 'auto_discover', enabled)
 
 
 def light_enabled() -> bool:
-    return _bool_setting(KEY_LIGHT_ENABLED)
+    return current().light_enabled
 
 
 def set_light_enabled(enabled: bool) -> None:
-    _settings().setValue(KEY_LIGHT_ENABLED, bool(enabled))
+    _set_flag(KEY_LIGHT_ENABLED, 'light_enabled', enabled)
 
 
 def light_brightness() -> int:
-    """Ambient light brightness, 0-100.
-
-    Clamped on the way out as well as parsed, since this is hand-editable and
-    the dock would otherwise be handed a value its API does not accept.
-    """
-    fallback = DEFAULTS[KEY_LIGHT_BRIGHTNESS]
-    try:
-        value = int(_settings().value(KEY_LIGHT_BRIGHTNESS, fallback))
-    except (TypeError, ValueError):
-        logger.warning('Stored light brightness is not a number; falling back to %d', fallback)
-        return fallback
-    return max(0, min(100, value))
+    """Ambient light brightness, 0-100."""
+    return current().light_brightness
 
 
 def set_light_brightness(value: int) -> None:
-    _settings().setValue(KEY_LIGHT_BRIGHTNESS, max(0, min(100, int(value))))
+    value = max(0, min(100, int(value)))
+    _settings().setValue(KEY_LIGHT_BRIGHTNESS, value)
+    _publish(replace(current(), light_brightness=value))
 
 
 def close_to_tray() -> bool:
-    return _bool_setting(KEY_CLOSE_TO_TRAY)
+    return current().close_to_tray
 
 
 def set_close_to_tray(enabled: bool) -> None:
-    _settings().setValue(KEY_CLOSE_TO_TRAY, bool(enabled))
+    _set_flag(KEY_CLOSE_TO_TRAY, 'close_to_tray', enabled)
 
 
 def start_minimized() -> bool:
-    return _bool_setting(KEY_START_MINIMIZED)
+    return current().start_minimized
 
 
 def set_start_minimized(enabled: bool) -> None:
-    _settings().setValue(KEY_START_MINIMIZED, bool(enabled))
+    _set_flag(KEY_START_MINIMIZED, 'start_minimized', enabled)
 
 
 def tray_hint() -> bool:
-    return _bool_setting(KEY_TRAY_HINT)
+    return current().tray_hint
 
 
 def set_tray_hint(enabled: bool) -> None:
-    _settings().setValue(KEY_TRAY_HINT, bool(enabled))
+    _set_flag(KEY_TRAY_HINT, 'tray_hint', enabled)
 
 
 def taskbar_button() -> bool:
-    return _bool_setting(KEY_TASKBAR_BUTTON)
+    return current().taskbar_button
 
 
 def set_taskbar_button(enabled: bool) -> None:
-    _settings().setValue(KEY_TASKBAR_BUTTON, bool(enabled))
+    _set_flag(KEY_TASKBAR_BUTTON, 'taskbar_button', enabled)
 
 
 def taskbar_media_controls() -> bool:
@@ -202,27 +335,27 @@ def taskbar_media_controls() -> bool:
     the artwork thumbnail that replaces the live window preview - because they
     are one idea rather than three preferences.
     """
-    return _bool_setting(KEY_TASKBAR_MEDIA_CONTROLS)
+    return current().taskbar_media_controls
 
 
 def set_taskbar_media_controls(enabled: bool) -> None:
-    _settings().setValue(KEY_TASKBAR_MEDIA_CONTROLS, bool(enabled))
+    _set_flag(KEY_TASKBAR_MEDIA_CONTROLS, 'taskbar_media_controls', enabled)
 
 
 def taskbar_artwork_icon() -> bool:
-    return _bool_setting(KEY_TASKBAR_ARTWORK_ICON)
+    return current().taskbar_artwork_icon
 
 
 def set_taskbar_artwork_icon(enabled: bool) -> None:
-    _settings().setValue(KEY_TASKBAR_ARTWORK_ICON, bool(enabled))
+    _set_flag(KEY_TASKBAR_ARTWORK_ICON, 'taskbar_artwork_icon', enabled)
 
 
 def taskbar_progress() -> bool:
-    return _bool_setting(KEY_TASKBAR_PROGRESS)
+    return current().taskbar_progress
 
 
 def set_taskbar_progress(enabled: bool) -> None:
-    _settings().setValue(KEY_TASKBAR_PROGRESS, bool(enabled))
+    _set_flag(KEY_TASKBAR_PROGRESS, 'taskbar_progress', enabled)
 
 
 def geometry() -> bytes | None:
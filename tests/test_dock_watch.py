@@ -0,0 +1,63 @@
+"""The watch connection, against the stand-in dock."""
+
+import asyncio
+import socket
+import unittest
+
+from device_link import PROTOCOL_VERSION
+from tools.dock_server import DockServer
+from ui.notifications import NotificationsWrapper
+
+META = {'title': 'One', 'artist': 'Artist', 'album': 'Album', 'status': 'PLAYING'}
+
+
+def unused_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+async def until(condition, timeout: float = 5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        if asyncio.get_running_loop().time() > deadline:
+            raise AssertionError('timed out waiting')
+        await asyncio.sleep(0.01)
+
+
+class RestartTest(unittest.TestCase):
+    def setUp(self):
+        self.dock = DockServer()
+        self.dock.start()
+        self.addCleanup(self.dock.stop)
+
+    def test_heartbeat_resumes_after_restarting_a_connected_watch(self):
+        wrapper = NotificationsWrapper()
+        events = []
+        on_event = wrapper._watch.on_event
+        wrapper._watch.on_event = lambda event: (events.append(event['event']), on_event(event))
+
+        async def scenario():
+            wrapper.device.set_address(self.dock.host, self.dock.port)
+            wrapper.device.restore(self.dock.frame_size, PROTOCOL_VERSION)
+            wrapper._watch.start()
+            await until(lambda: wrapper._watch.connected)
+            # As after a push the watch made unnecessary to repeat.
+            wrapper._last_payload = META
+
+            # Moved to an address with no dock behind it, as a discovery or a
+            # settings change does.
+            wrapper.device.set_address('127.0.0.1', unused_port())
+            await wrapper._watch.restart()
+            try:
+                self.assertFalse(wrapper._watch.connected)
+                self.assertIsNotNone(wrapper._heartbeat_at)
+            finally:
+                await wrapper._watch.stop()
+
+        asyncio.run(scenario())
+        self.assertEqual(events, ['hello', 'lost'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+"""Picking up the last run's push at launch, against the stand-in dock."""
+
+import asyncio
+import io
+import tempfile
+import time
+import unittest
+
+from PIL import Image
+
+from media_sources.fake import FakeMediaSource
+from tools.dock_server import DockServer
+from ui.notifications import NotificationsWrapper
+
+
+def jpeg(colour: str, size: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', (size, size), colour).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+COVER = jpeg('red', 300)
+
+
+async def launch(dock: DockServer, state_dir: str, settle: float = 1.0) -> float:
+    """One run of the worker onto a playing track with a timeline. When it started."""
+    source = FakeMediaSource()
+    session = source.open_session('player')
+    session.set_properties('One', 'Artist', 'Album', COVER, notify=False)
+    session.set_playback('PLAYING', notify=False)
+    session.set_timeline(30.0, 200.0, notify=False)
+    source.set_current('player')
+
+    worker = NotificationsWrapper(source=source, state_dir=state_dir)
+    worker.set_device_address(dock.host, dock.port)
+    started = time.monotonic()
+    main = asyncio.create_task(worker.main())
+    await asyncio.sleep(settle)
+    worker.stop()
+    await main
+    return started
+
+
+class RelaunchTest(unittest.TestCase):
+    def setUp(self):
+        self.dock = DockServer()
+        self.dock.start()
+        self.addCleanup(self.dock.stop)
+        state = tempfile.TemporaryDirectory()
+        self.addCleanup(state.cleanup)
+        self.state_dir = state.name
+
+    def test_relaunch_onto_the_same_track_is_one_header_exchange(self):
+        asyncio.run(launch(self.dock, self.state_dir))
+        self.assertTrue(any(exchange.sent_art for exchange in self.dock.exchanges))
+        first_run = len(self.dock.exchanges)
+
+        started = asyncio.run(launch(self.dock, self.state_dir))
+        relaunch = self.dock.exchanges[first_run:]
+        self.assertEqual(len(relaunch), 1)
+        exchange = relaunch[0]
+        self.assertIsNone(exchange.error)
+        self.assertFalse(exchange.sent_art)
+        self.assertTrue(exchange.binary_header)
+        # Not held up by anything the restore does.
+        self.assertLess(exchange.started - started, 0.5)
+        # The dock's bar needs the new run's position, whatever else it holds.
+        self.assertIsNotNone(exchange.meta.get('progress'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+"""Push pacing, against the stand-in dock and one that has stopped answering."""
+
+import socket
+import unittest
+from unittest import mock
+
+import device_link
+from device_link import DeviceLink
+from tools.dock_server import DockServer
+from ui.notifications import PUSH_BURST, PUSH_INTERVAL_MIN_SECONDS, PushLimiter
+
+META = {'title': 'One', 'artist': 'Artist', 'album': 'Album', 'status': 'PLAYING'}
+
+
+class PacingAfterOutageTest(unittest.TestCase):
+    def setUp(self):
+        self.dock = DockServer()
+        self.dock.start()
+        self.addCleanup(self.dock.stop)
+        # Takes connections into its backlog and never answers: every exchange
+        # with it runs to the timeout.
+        self.stalled = socket.socket()
+        self.stalled.bind(('127.0.0.1', 0))
+        self.stalled.listen(8)
+        self.addCleanup(self.stalled.close)
+
+    def test_pacing_recovers_on_the_first_push_after_an_outage(self):
+        link = DeviceLink(self.dock.host, self.dock.port)
+        limiter = PushLimiter()
+        self.assertTrue(link.send(META, None))
+        limiter.spend(0.0, link.handshake_cost)
+        before = link.handshake_cost
+
+        link.set_address(*self.stalled.getsockname())
+        with mock.patch.object(device_link, 'TCP_TIMEOUT', 0.2):
+            for _ in range(3):
+                self.assertFalse(link.send(META, None))
+        self.assertEqual(link.handshake_cost, before)
+
+        link.set_address(self.dock.host, self.dock.port)
+        self.assertTrue(link.send(META, None))
+        limiter.spend(10.0, link.handshake_cost)
+        self.assertLess(link.handshake_cost, 0.2)
+        self.assertEqual(limiter.interval, PUSH_INTERVAL_MIN_SECONDS)
+        self.assertEqual(limiter.wait(10.0), 0.0)
+        self.assertEqual(limiter.tokens, PUSH_BURST - 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""The replay's scoring, against traces small enough to write by hand."""
+
+import asyncio
+import io
+import unittest
+
+from PIL import Image
+
+from media_image import art_id_for
+from tools import replay
+from tools.dock_server import DockServer
+
+
+def jpeg(colour: str, size: int) -> bytes:
+    buffer = io.BytesIO()
+    Image.new('RGB', (size, size), colour).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+# An Edge skip: the session drops for well under the grace period, and comes
+# back with the new metadata but still offering the last track's cover, which
+# is larger than the new track's own.
+BLOBS = {'old': jpeg('red', 600), 'new': jpeg('blue', 300)}
+EDGE_SKIP = [
+    [0.0, 'current', 'edge'],
+    [0.0, 'event', 'edge', 'properties'],
+    [0.0, 'props', 'edge', 'One', 'Artist', 'Album'],
+    [0.0, 'thumb', 'edge', 'old'],
+    [1.0, 'current', None],
+    [1.6, 'current', 'edge'],
+    [1.6, 'event', 'edge', 'properties'],
+    [1.61, 'props', 'edge', 'Two', 'Artist', 'Album'],
+    [1.62, 'thumb', 'edge', 'old'],
+    [1.9, 'event', 'edge', 'properties'],
+    [1.9, 'thumb', 'edge', 'new'],
+]
+
+
+class ExpectedTracksTest(unittest.TestCase):
+    def test_bridged_drop_is_not_a_track(self):
+        tracks = replay.expected_tracks(EDGE_SKIP, BLOBS)
+        self.assertEqual([track.title for track in tracks], ['One', 'Two'])
+
+    def test_leftover_across_a_bridged_drop_is_not_the_next_tracks_art(self):
+        tracks = replay.expected_tracks(EDGE_SKIP, BLOBS)
+        self.assertEqual(tracks[0].expected_art, art_id_for(BLOBS['old']))
+        self.assertEqual(tracks[1].expected_art, art_id_for(BLOBS['new']))
+
+    def test_long_drop_is_a_track(self):
+        records = [[t + 5.0 if t >= 1.6 else t, *rest] for t, *rest in EDGE_SKIP]
+        tracks = replay.expected_tracks(records, BLOBS)
+        self.assertEqual([track.source_id for track in tracks], ['edge', None, 'edge'])
+
+
+class ReplayTest(unittest.TestCase):
+    def test_bridged_drop_scores_the_new_tracks_own_cover(self):
+        tracks = replay.expected_tracks(EDGE_SKIP, BLOBS)
+        dock = DockServer()
+        dock.start()
+        try:
+            started = asyncio.run(replay.replay(EDGE_SKIP, BLOBS, dock, tail=1.5))
+        finally:
+            dock.stop()
+        replay.score(tracks, dock.exchanges, started)
+
+        two = tracks[1]
+        self.assertIsNotNone(two.frame_after)
+        # The cover only exists from 1.9s; showing it cannot take no time.
+        self.assertGreater(two.frame_after, 0.2)
+        self.assertEqual(two.wasted_frames, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
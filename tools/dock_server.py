@@ -0,0 +1,530 @@
+"""A stand-in for the Mini Dock, speaking its side of the wire protocol.
+
+    python -m tools.dock_server [--port 32150] [--size 320x240] [--bandwidth KB/s]
+                                [--window BYTES] [--gc-pause SECONDS] [--gc-mid-transfer RATE]
+                                [--loss RATE] [--seed N] [--dump DIR] [--log PATH]
+                                [--proto N]
+
+Follows handle_client() in esp32/apps/win_now_playing/__init__.py: the same ack,
+either header format, the same art_id check, the same busy refusal, the same
+geometry rule and the same short-read reply. What it does not do is draw - it
+writes down every exchange instead, and can save each frame it receives as a
+PNG, so the client's behaviour can be measured without a device on the desk.
+
+A desktop on loopback is far kinder than the real thing, so the ways the dock
+differs can be put back on purpose:
+
+  * `bandwidth` - the rate the body is read at. Measured frames take 2-3
+    seconds over WiFi, roughly 60 KB/s.
+  * `window` - the receive buffer, which is what the client's send() actually
+    waits on. lwIP's is a few KB, against megabytes on a desktop.
+  * `gc_pause` - the 200-280ms collection a frame change costs the dock. It is
+    scheduled as the dock schedules it, once no exchange has been seen for
+    GC_QUIET_SECONDS, and blocks the whole dock while it runs;
+    `gc_mid_transfer` is the chance of one landing inside a body regardless.
+  * `loss` - the chance that a read stalls for `retransmit` seconds, which is
+    what a lost segment looks like from the application.
+
+`proto` is the version the dock reports. Below 5 it refuses binary headers the
+way an older dock would, which is how the client's fallback to JSON is tried.
+
+Random choices come from `seed`, so a run that found something can be repeated.
+
+A client's watch connection is held open and pinged, as the dock does. notify()
+sends it an event - a knob turn, say - and restart() drops everything the dock
+holds and every watch connection, as a dock that rebooted would have.
+
+Runs its own loop on its own thread. DeviceLink.send() blocks the worker's loop
+for the length of an exchange, so a dock on that loop would never answer.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import socket
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+
+from constants import FRAME_SIZE_DEFAULT, PROTOCOL_VERSION, TCP_PORT
+from device_link import BINARY_HEADER_PROTO, BINARY_LAYOUT, BINARY_MAGIC, WATCH_PROTO, decode_binary_header
+
+logger = logging.getLogger('dock_server')
+
+# As the dock: the longest header it will read, and the most one read of the
+# body may take.
+MAX_HEADER = 1024
+READ_CHUNK = 8192
+
+# What lwIP waits before resending a lost segment, at its floor.
+RETRANSMIT_SECONDS = 0.25
+
+# As the dock's run_gc_scheduler(): how often it looks, how long the client must
+# have been quiet, and the longest a collection is put off.
+GC_POLL_SECONDS = 0.25
+GC_QUIET_SECONDS = 1.5
+GC_MAX_DEFER_SECONDS = 15.0
+
+# As the dock's WATCH_PING_MS.
+WATCH_PING_SECONDS = 5.0
+
+
+@dataclass
+class Exchange:
+    """One connection, as the dock saw it. Times are time.monotonic()."""
+
+    started: float
+    acked: float = 0.0
+    finished: float = 0.0
+    meta: dict = field(default_factory=dict)
+    header_bytes: int = 0
+    binary_header: bool = False
+    frame_bytes: int = 0
+    # Whether the body was asked for, and whether it then arrived whole.
+    sent_art: bool = False
+    frame_ok: bool = False
+    error: str | None = None
+    # Time lost to injected collections and retransmits during this exchange.
+    stalled: float = 0.0
+    reads: int = 0
+    # Pixels the dock would have redrawn to show the frame. See _redraw_area().
+    redrawn: int = 0
+    # What the panel showed once this exchange was done.
+    art_id: str | None = None
+    have_art: bool = False
+    dumped: str | None = None
+
+
+class DockServer:
+    def __init__(
+        self,
+        host: str = '127.0.0.1',
+        port: int = 0,
+        frame_size: tuple[int, int] = FRAME_SIZE_DEFAULT,
+        bandwidth: float | None = None,
+        window: int | None = None,
+        gc_pause: float = 0.0,
+        gc_mid_transfer: float = 0.0,
+        loss: float = 0.0,
+        retransmit: float = RETRANSMIT_SECONDS,
+        dump_dir: str | None = None,
+        seed: int | None = None,
+        proto: int = PROTOCOL_VERSION,
+    ):
+        self.host = host
+        self.port = port
+        self.frame_size = frame_size
+        self.bandwidth = bandwidth  # bytes per second, None for unlimited
+        self.window = window
+        self.gc_pause = gc_pause
+        self.gc_mid_transfer = gc_mid_transfer
+        self.loss = loss
+        self.retransmit = retransmit
+        self.dump_dir = dump_dir
+        self.proto = proto
+        self.exchanges: list[Exchange] = []
+        self.art_id: str | None = None
+        self.have_art = False
+        # As the dock's canvas_rect: where the frame on screen may not be black.
+        self._canvas_rect: tuple[int, int, int, int] | None = None
+        # As the dock: open watch connections, and whether anything has been
+        # shown since it started.
+        self._watchers: list[asyncio.StreamWriter] = []
+        self.shown_push = False
+        self._random = random.Random(seed)
+        # As the dock: the collection a frame change asks for runs once the
+        # client goes quiet, and is reported in the next frame's final ack.
+        self._last_gc_ms: int | None = None
+        self._collected = False
+        self._gc_due_since: float | None = None
+        self._last_exchange = 0.0
+        # Collections that ran, as (time.monotonic(), seconds).
+        self.collections: list[tuple[float, float]] = []
+        self._busy = False
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._server = None
+        self._thread: threading.Thread | None = None
+        self._ready = threading.Event()
+
+    @property
+    def frame_len(self) -> int:
+        width, height = self.frame_size
+        return width * height * 2
+
+    # -- Lifecycle ---------------------------------------------------------
+
+    def start(self):
+        """Start listening. Returns once the port is bound; see `port`."""
+        if self.dump_dir:
+            os.makedirs(self.dump_dir, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name='dock-server', daemon=True)
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self):
+        loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+        if self._thread is not None:
+            self._thread.join()
+
+    def notify(self, event: dict):
+        """Send an event to watching clients, as the dock's _notify() does."""
+        self._loop.call_soon_threadsafe(self._notify, event)
+
+    def restart(self):
+        """Forget everything shown and drop every watch connection, as a reboot does."""
+        self._loop.call_soon_threadsafe(self._restart)
+
+    def _notify(self, event: dict):
+        data = json.dumps(event).encode('utf-8') + b'\n'
+        for writer in self._watchers:
+            writer.write(data)
+
+    def _restart(self):
+        logger.info('Restarting')
+        self.art_id = None
+        self.have_art = False
+        self.shown_push = False
+        self._canvas_rect = None
+        self._close_watchers()
+
+    def _close_watchers(self):
+        for writer in self._watchers:
+            writer.close()
+        self._watchers.clear()
+
+    def _listen_socket(self) -> socket.socket:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        if self.window:
+            # Set before listen() so accepted sockets inherit it, and it is what
+            # the window is negotiated from.
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.window)
+        sock.bind((self.host, self.port))
+        return sock
+
+    def _run(self):
+        self._loop = asyncio.new_event_loop()
+        sock = self._listen_socket()
+        self._server = self._loop.run_until_complete(asyncio.start_server(self._handle, sock=sock))
+        self.port = sock.getsockname()[1]
+        gc_task = self._loop.create_task(self._gc_scheduler()) if self.gc_pause else None
+        self._ready.set()
+        try:
+            self._loop.run_forever()
+        finally:
+            if gc_task is not None:
+                gc_task.cancel()
+            self._close_watchers()
+            self._server.close()
+            self._loop.run_until_complete(self._server.wait_closed())
+            self._loop.close()
+
+    # -- Link conditions ---------------------------------------------------
+
+    def _stall(self, exchange: Exchange, seconds: float):
+        """Block the whole loop mid-exchange, as a collection landing there does."""
+        time.sleep(seconds)
+        exchange.stalled += seconds
+
+    async def _gc_scheduler(self):
+        while True:
+            await asyncio.sleep(GC_POLL_SECONDS)
+            if self._busy or self._gc_due_since is None:
+                continue
+            now = time.monotonic()
+            if now - self._last_exchange >= GC_QUIET_SECONDS or now - self._gc_due_since >= GC_MAX_DEFER_SECONDS:
+                self._collect(now)
+
+    def _collect(self, now: float):
+        """Block the whole loop, as a collection on the dock does."""
+        time.sleep(self.gc_pause)
+        self.collections.append((now, self.gc_pause))
+        self._last_gc_ms = round(self.gc_pause * 1000)
+        self._collected = True
+        self._gc_due_since = None
+
+    async def _read_body(self, reader, exchange: Exchange) -> bytes:
+        """The body, read the way the dock reads it and at the pace it manages."""
+        total = self.frame_len
+        chunks = []
+        read = 0
+        started = time.monotonic()
+        gc_at = self._random.randrange(total) if self._random.random() < self.gc_mid_transfer else None
+        while read < total:
+            chunk = await reader.read(min(READ_CHUNK, total - read))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            read += len(chunk)
+            exchange.reads += 1
+            if gc_at is not None and read >= gc_at:
+                gc_at = None
+                self._stall(exchange, self.gc_pause)
+                started += self.gc_pause
+            if self.loss and self._random.random() < self.loss:
+                await asyncio.sleep(self.retransmit)
+                exchange.stalled += self.retransmit
+                # The link does not make up for lost time with a burst.
+                started += self.retransmit
+            if self.bandwidth:
+                # Hold the read back until the link would have delivered it. Not
+                # reading is what fills the window and slows the sender down.
+                due = started + read / self.bandwidth
+                delay = due - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        exchange.frame_bytes = read
+        return b''.join(chunks)
+
+    def _dump(self, exchange: Exchange, body: bytes):
+        from PIL import Image
+
+        name = f'{len(self.exchanges):04d}-{exchange.meta.get("art_id")}.png'
+        path = os.path.join(self.dump_dir, name)
+        # BGR;16 is Pillow's name for the dock's little-endian RGB565.
+        Image.frombytes('RGB', self.frame_size, body, 'raw', 'BGR;16').save(path)
+        exchange.dumped = path
+
+    # -- Protocol ----------------------------------------------------------
+
+    async def _handle(self, reader, writer):
+        exchange = Exchange(started=time.monotonic())
+        self._last_exchange = exchange.started
+        claimed = False
+        changed_frame = False
+        watch = False
+        try:
+            first = await reader.read(1)
+            if not first:
+                return
+            exchange.binary_header = first[0] == BINARY_MAGIC
+            if exchange.binary_header:
+                prefix = first + await reader.readexactly(3)
+                header = prefix + await reader.readexactly(int.from_bytes(prefix[2:4], 'little'))
+            else:
+                header = first + await reader.readline()
+            exchange.header_bytes = len(header)
+            if len(header) > MAX_HEADER:
+                exchange.error = 'header too long'
+                await self._reply(writer, {'ok': False, 'error': exchange.error})
+                return
+            try:
+                if not exchange.binary_header:
+                    meta = json.loads(header.decode('utf-8').strip())
+                elif self.proto >= BINARY_HEADER_PROTO and header[1] == BINARY_LAYOUT:
+                    meta = decode_binary_header(header[4:])
+                else:
+                    raise ValueError('binary header')
+            except ValueError:
+                meta = None
+            if isinstance(meta, dict) and meta.get('watch') and self.proto >= WATCH_PROTO:
+                watch = True
+                await self._serve_watch(reader, writer)
+                return
+            if self._busy:
+                exchange.error = 'busy'
+                await self._reply(writer, {'ok': False, 'error': exchange.error})
+                return
+            self._busy = claimed = True
+
+            if meta is None:
+                exchange.error = 'bad header'
+                await self._reply(writer, {'ok': False, 'proto': self.proto, 'error': exchange.error})
+                return
+            exchange.meta = meta
+
+            width, height = self.frame_size
+            incoming_art = meta.get('art_id')
+            image_len = int(meta.get('image_len') or 0)
+            send_art = False
+            if incoming_art is None:
+                changed_frame = self.have_art
+                self.have_art = False
+                self.art_id = None
+                self._canvas_rect = None
+            elif self.have_art and incoming_art == self.art_id:
+                pass
+            elif image_len != self.frame_len or meta.get('width') != width or meta.get('height') != height:
+                exchange.error = f'expected {width}x{height} ({self.frame_len} bytes)'
+            else:
+                send_art = True
+
+            ack = {
+                'ok': exchange.error is None,
+                'proto': self.proto,
+                'send_art': send_art,
+                'w': width,
+                'h': height,
+            }
+            if exchange.error:
+                ack['error'] = exchange.error
+            await self._reply(writer, ack)
+            exchange.acked = time.monotonic()
+            if not send_art:
+                self.shown_push = True
+
+            if send_art:
+                exchange.sent_art = True
+                body = await self._read_body(reader, exchange)
+                if len(body) != self.frame_len:
+                    # Leave art_id alone so the client resends on the next update.
+                    exchange.error = 'short read'
+                    await self._reply(writer, {'ok': False, 'error': 'short read', 'received': len(body)})
+                    return
+                exchange.frame_ok = True
+                exchange.redrawn = self._redraw_area(meta.get('rect'))
+                self.art_id = incoming_art
+                self.have_art = True
+                changed_frame = True
+                stats = {
+                    'recv_ms': round((time.monotonic() - exchange.acked) * 1000),
+                    'reads': exchange.reads,
+                    'swap_ms': 0,
+                    'area': exchange.redrawn,
+                    'heap_free': None,
+                    'gc': self._collected,
+                    'gc_ms': self._last_gc_ms,
+                }
+                self._collected = False
+                self.shown_push = True
+                await self._reply(writer, {'ok': True, 'stats': stats})
+                if self.dump_dir:
+                    self._dump(exchange, body)
+        except (ConnectionError, OSError, asyncio.IncompleteReadError) as exc:
+            exchange.error = str(exc)
+        finally:
+            if claimed:
+                self._busy = False
+            writer.close()
+            if not watch:
+                self._record(exchange, changed_frame)
+
+    def _record(self, exchange: Exchange, changed_frame: bool):
+        """Close out an exchange: time it, charge it to the GC schedule, keep it."""
+        exchange.finished = self._last_exchange = time.monotonic()
+        if changed_frame and self._gc_due_since is None:
+            self._gc_due_since = exchange.finished
+        exchange.art_id = self.art_id
+        exchange.have_art = self.have_art
+        self.exchanges.append(exchange)
+        logger.info(
+            '%s %s%s in %.0fms%s',
+            exchange.meta.get('status', '-'),
+            exchange.meta.get('title', ''),
+            f' + {exchange.frame_bytes} byte frame' if exchange.sent_art else '',
+            (exchange.finished - exchange.started) * 1000,
+            f' ({exchange.error})' if exchange.error else '',
+        )
+
+    async def _serve_watch(self, reader, writer):
+        """As the dock's _serve_watch(): hello, then pings until the client goes."""
+        await self._reply(
+            writer,
+            {
+                'ok': True,
+                'event': 'hello',
+                'proto': self.proto,
+                'art_id': self.art_id if self.have_art else None,
+                'fresh': not self.shown_push,
+            },
+        )
+        self._watchers.append(writer)
+        try:
+            while True:
+                try:
+                    data = await asyncio.wait_for(reader.read(16), WATCH_PING_SECONDS)
+                except TimeoutError:
+                    await self._reply(writer, {'event': 'ping'})
+                    continue
+                if not data:
+                    return
+        finally:
+            if writer in self._watchers:
+                self._watchers.remove(writer)
+
+    def _redraw_area(self, rect) -> int:
+        """What the dock's _present_frame() would redraw, in pixels."""
+        width, height = self.frame_size
+        valid = (
+            isinstance(rect, list | tuple)
+            and len(rect) == 4
+            and rect[2] > 0
+            and rect[3] > 0
+            and rect[0] >= 0
+            and rect[1] >= 0
+            and rect[0] + rect[2] <= width
+            and rect[1] + rect[3] <= height
+        )
+        old, self._canvas_rect = self._canvas_rect, tuple(rect) if valid else None
+        if old is None or not valid:
+            return width * height
+        left, top = min(old[0], rect[0]), min(old[1], rect[1])
+        right = max(old[0] + old[2], rect[0] + rect[2])
+        bottom = max(old[1] + old[3], rect[1] + rect[3])
+        return (right - left) * (bottom - top)
+
+    @staticmethod
+    async def _reply(writer, message: dict):
+        writer.write(json.dumps(message).encode('utf-8') + b'\n')
+        await writer.drain()
+
+
+def _size(value: str) -> tuple[int, int]:
+    width, _, height = value.lower().partition('x')
+    return int(width), int(height)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=TCP_PORT)
+    parser.add_argument('--size', type=_size, default=FRAME_SIZE_DEFAULT, metavar='WxH', help='panel geometry')
+    parser.add_argument('--bandwidth', type=float, metavar='KB/s', help='rate the frame body is read at')
+    parser.add_argument('--window', type=int, metavar='BYTES', help='socket receive buffer')
+    parser.add_argument('--gc-pause', type=float, default=0.0, metavar='SECONDS', help='stall after a frame change')
+    parser.add_argument('--gc-mid-transfer', type=float, default=0.0, metavar='RATE', help='chance a stall hits a body')
+    parser.add_argument('--loss', type=float, default=0.0, metavar='RATE', help='chance a read waits a retransmit')
+    parser.add_argument('--seed', type=int)
+    parser.add_argument('--dump', metavar='DIR', help='save each frame received as a PNG')
+    parser.add_argument('--log', metavar='PATH', help='write every exchange here as JSON on exit')
+    parser.add_argument('--proto', type=int, default=PROTOCOL_VERSION, help='protocol version to report')
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(message)s')
+    dock = DockServer(
+        host=args.host,
+        port=args.port,
+        frame_size=args.size,
+        bandwidth=args.bandwidth * 1024 if args.bandwidth else None,
+        window=args.window,
+        gc_pause=args.gc_pause,
+        gc_mid_transfer=args.gc_mid_transfer,
+        loss=args.loss,
+        dump_dir=args.dump,
+        seed=args.seed,
+        proto=args.proto,
+    )
+    dock.start()
+    logger.info('Listening on %s:%d as a %dx%d dock', args.host, dock.port, *args.size)
+    try:
+        while True:
+            # Rather than an Event: a sleep is what Ctrl+C interrupts on Windows.
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dock.stop()
+        if args.log:
+            with open(args.log, 'w', encoding='utf-8') as file:
+                json.dump([asdict(exchange) for exchange in dock.exchanges], file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
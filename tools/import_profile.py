@@ -0,0 +1,69 @@
+"""Where the client's start-up goes before its first window, by import.
+
+    python -m tools.import_profile [--top N] [--module NAME]
+
+Runs Python's own `-X importtime` over the entry point in a fresh interpreter -
+everything the GUI thread loads before it can show a tray icon - and lists the
+slowest imports by cumulative time, with the total. The client itself records
+when it got as far as its window and its first push under `startup.*` in
+metrics.json; this is the breakdown of the first of those.
+
+Pillow, winrt and QtWinExtras should not appear: the worker and the taskbar
+load them when they are first needed. One that does has been pulled back onto
+the start-up path by an import somewhere.
+"""
+
+import argparse
+import subprocess
+import sys
+
+# Loaded lazily on purpose. See the module docstring.
+LAZY = ('PIL', 'winrt', 'PyQt5.QtWinExtras', 'coloredlogs')
+
+
+def profile(module: str) -> list[tuple[int, int, str]]:
+    """(self µs, cumulative µs, name) for every import `module` makes."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+    if result.returncode:
+        sys.exit(f'Importing {module} failed:\n{result.stderr[-2000:]}')
+
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:') :].split('|')
+        try:
+            own, cumulative = int(fields[0]), int(fields[1])
+        except ValueError:
+            continue  # the header
+        rows.append((own, cumulative, fields[2].rstrip()))
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=25, help='how many imports to list')
+    parser.add_argument('--module', default='vobot_now_playing', help='what to import')
+    args = parser.parse_args()
+
+    rows = profile(args.module)
+    # Top-level imports are the ones not indented under another.
+    total = sum(cumulative for _, cumulative, name in rows if not name.startswith('  '))
+
+    print(f'{args.module}: {len(rows)} modules, {total / 1000:.0f}ms')
+    print(f'{"cumulative":>10}  {"self":>8}  module')
+    for own, cumulative, name in sorted(rows, key=lambda row: row[1], reverse=True)[: args.top]:
+        print(f'{cumulative / 1000:>8.1f}ms  {own / 1000:>6.1f}ms  {name}')
+
+    loaded = sorted({name.strip() for _, _, name in rows if name.strip().startswith(LAZY)})
+    if loaded:
+        print(f'\nOn the start-up path but meant to be lazy: {", ".join(loaded)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,256 @@
+"""Replay a recorded media session trace through the worker, and time it.
+
+    python -m tools.replay TRACE [--set NAME=VALUE ...] [--tail SECONDS] [--json PATH]
+
+Record a trace by running the client with VOBOT_TRACE set to a file path (see
+media_sources/recording.py). The replay drives NotificationsWrapper from that
+trace through the fake backend, against a stand-in dock on a local port, in real
+time - the worker's own timers are part of what is being measured.
+
+For every track it reports how long the dock took to show the right text, and
+the right artwork beside it, plus what getting there cost: pushes, bytes, and
+frames sent only to be replaced. "Right artwork" is the best image the source
+served for that track, ranked the way ArtworkPicker ranks them, and not one it
+had also served for the track before.
+
+--set overrides a constant in ui/notifications.py for the run, so a change to
+ARTWORK_CHASE_LIMIT or SESSION_GRACE_SECONDS can be judged against a real
+player before it is made:
+
+    python -m tools.replay edge-skips.jsonl --set SESSION_GRACE_SECONDS=1.0
+"""
+
+import argparse
+import ast
+import asyncio
+import json
+import logging
+import statistics
+import sys
+import time
+from dataclasses import asdict, dataclass
+
+from media_image import art_id_for, thumbnail_rank
+from media_sources.fake import FakeMediaSource
+from media_sources.recording import read_trace, replay_steps
+from tools.dock_server import DockServer
+from ui import notifications
+
+logger = logging.getLogger('replay')
+
+# How long to keep running after the last record, for the worker to finish
+# chasing artwork and the dock to catch up.
+TAIL_SECONDS = 5.0
+
+
+@dataclass
+class Track:
+    """One thing the dock should have ended up showing."""
+
+    started: float  # seconds into the trace
+    source_id: str | None  # None while nothing is playing
+    title: str = ''
+    artist: str = ''
+    album: str = ''
+    expected_art: str | None = None
+    # Filled in from the dock's side once the replay has run.
+    text_after: float | None = None
+    frame_after: float | None = None
+    pushes: int = 0
+    bytes_sent: int = 0
+    frames: int = 0
+    wasted_frames: int = 0
+
+    @property
+    def label(self) -> str:
+        if self.source_id is None:
+            return '(nothing playing)'
+        return ' - '.join(part for part in (self.artist, self.title) if part) or '(untitled)'
+
+    def shows_text(self, meta: dict) -> bool:
+        if self.source_id is None:
+            return (meta.get('status') or '').upper() == 'IDLE'
+        return (meta.get('title'), meta.get('artist'), meta.get('album')) == (self.title, self.artist, self.album)
+
+
+def expected_tracks(records: list[list], blobs: dict[str, bytes]) -> list[Track]:
+    """What the dock should show over the trace, and from when.
+
+    Times are those of the event that announced each change, matching the
+    shift replay_steps() makes - latency counts from when the player moved.
+
+    A player that is gone for less than SESSION_GRACE_SECONDS and comes back is
+    not expected on the dock at all: bridging that gap is the grace period's
+    job, so it is not scored as a track the dock failed to show.
+    """
+    tracks: list[Track] = []
+    announced: dict[str, float] = {}
+    current: str | None = None
+    served: list[list[str]] = []  # art_ids offered during each track
+
+    for record in records:
+        t, kind = record[0], record[1]
+        if kind == 'current':
+            current = record[2]
+            if current is None and (not tracks or tracks[-1].source_id is not None):
+                tracks.append(Track(started=t, source_id=None))
+                served.append([])
+            if current is not None:
+                announced[current] = t
+        elif kind == 'event':
+            announced[record[2]] = t
+        elif record[2] != current:
+            continue
+        elif kind == 'props':
+            title, artist, album = record[3:6]
+            last = tracks[-1] if tracks else None
+            if last is None or (last.source_id, last.title, last.artist, last.album) != (current, title, artist, album):
+                tracks.append(Track(announced.get(current, t), current, title, artist, album))
+                served.append([])
+        elif kind == 'thumb' and tracks and record[3] is not None:
+            served[-1].append(record[3])
+
+    # A bridged gap is dropped before any artwork is judged. Whatever the player
+    # offered across it is the last track's leftovers, and the next track has to
+    # be compared with that track rather than with the gap, or a leftover passes
+    # for its own cover - which is the Edge skip this scoring is meant to catch.
+    kept: list[Track] = []
+    kept_served: list[list[str]] = []
+    for index, track in enumerate(tracks):
+        if (
+            track.source_id is None
+            and 0 < index < len(tracks) - 1
+            and tracks[index + 1].source_id == tracks[index - 1].source_id
+            and tracks[index + 1].started - track.started < notifications.SESSION_GRACE_SECONDS
+        ):
+            kept_served[-1].extend(served[index])
+            continue
+        kept.append(track)
+        kept_served.append(served[index])
+
+    for index, track in enumerate(kept):
+        offered = kept_served[index]
+        before = set(kept_served[index - 1]) if index else set()
+        own = [blob_id for blob_id in offered if blob_id not in before] or offered
+        if own:
+            best = max(own, key=lambda blob_id: thumbnail_rank(blobs[blob_id]))
+            track.expected_art = art_id_for(blobs[best])
+
+    return kept
+
+
+def score(tracks: list[Track], exchanges, started: float):
+    """Charge each exchange to the track current when it began, and time the tracks."""
+    for index, track in enumerate(tracks):
+        until = tracks[index + 1].started if index + 1 < len(tracks) else float('inf')
+        for exchange in exchanges:
+            at = exchange.started - started
+            if not track.started <= at < until:
+                continue
+            track.pushes += 1
+            track.bytes_sent += exchange.header_bytes + exchange.frame_bytes
+            if exchange.frame_ok:
+                track.frames += 1
+                if exchange.art_id != track.expected_art:
+                    track.wasted_frames += 1
+            if exchange.error or not track.shows_text(exchange.meta):
+                continue
+            done = exchange.finished - started - track.started
+            if track.text_after is None:
+                track.text_after = done
+            if track.frame_after is None and exchange.art_id == track.expected_art:
+                track.frame_after = done
+
+
+async def replay(records, blobs, dock: DockServer, tail: float) -> float:
+    source = FakeMediaSource()
+    steps = replay_steps(records, blobs, source)
+    worker = notifications.NotificationsWrapper(source=source)
+    worker.set_device_address(dock.host, dock.port)
+
+    started = time.monotonic()
+    main = asyncio.create_task(worker.main())
+    await source.run_script(steps)
+    await asyncio.sleep(tail)
+    worker.stop()
+    await main
+    return started
+
+
+def _override(assignment: str):
+    name, _, value = assignment.partition('=')
+    if not hasattr(notifications, name):
+        raise SystemExit(f'ui/notifications.py has no {name}')
+    try:
+        parsed = ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        raise SystemExit(f'Cannot read a value from {assignment!r}') from None
+    logger.info('%s = %r (was %r)', name, parsed, getattr(notifications, name))
+    setattr(notifications, name, parsed)
+
+
+def _seconds(value: float | None) -> str:
+    return f'{value:6.2f}s' if value is not None else '     - '
+
+
+def report(tracks: list[Track], exchanges):
+    print(f'{"at":>7}  {"text":>7}  {"frame":>7}  {"pushes":>6}  {"frames":>6}  {"wasted":>6}  track')
+    for track in tracks:
+        print(
+            f'{track.started:6.2f}s  {_seconds(track.text_after)}  {_seconds(track.frame_after)}  '
+            f'{track.pushes:6d}  {track.frames:6d}  {track.wasted_frames:6d}  {track.label}'
+        )
+
+    text = [track.text_after for track in tracks if track.text_after is not None]
+    frame = [track.frame_after for track in tracks if track.frame_after is not None]
+    print()
+    print(
+        f'Tracks: {len(tracks)}, never showed text: {len(tracks) - len(text)}, '
+        f'never showed art: {len(tracks) - len(frame)}'
+    )
+    if text:
+        print(f'Text:   median {statistics.median(text):.2f}s, worst {max(text):.2f}s')
+    if frame:
+        print(f'Frame:  median {statistics.median(frame):.2f}s, worst {max(frame):.2f}s')
+    sent = sum(exchange.header_bytes + exchange.frame_bytes for exchange in exchanges)
+    frames = sum(1 for exchange in exchanges if exchange.frame_ok)
+    print(
+        f'Sent:   {len(exchanges)} pushes, {frames} frames, {sum(t.wasted_frames for t in tracks)} wasted, '
+        f'{sent / 1024:.0f} KB'
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('trace', help='trace recorded with VOBOT_TRACE set')
+    parser.add_argument('--set', action='append', default=[], metavar='NAME=VALUE', help='override a worker constant')
+    parser.add_argument('--tail', type=float, default=TAIL_SECONDS, help='seconds to run on after the last record')
+    parser.add_argument('--json', metavar='PATH', help='also write the per-track results here')
+    parser.add_argument('-v', '--verbose', action='store_true', help="show the worker's own log")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.WARNING)
+    logger.setLevel(logging.INFO)
+    for assignment in args.set:
+        _override(assignment)
+
+    _, records, blobs = read_trace(args.trace)
+    tracks = expected_tracks(records, blobs)
+
+    dock = DockServer()
+    dock.start()
+    try:
+        started = asyncio.run(replay(records, blobs, dock, args.tail))
+    finally:
+        dock.stop()
+
+    score(tracks, dock.exchanges, started)
+    report(tracks, dock.exchanges)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as file:
+            json.dump([asdict(track) for track in tracks], file, indent=2)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
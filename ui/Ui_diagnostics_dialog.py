@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+
+# Form implementation generated from reading ui file 'ui/diagnostics_dialog.ui'
+#
+# Created by: PyQt5 UI code generator 5.15.11
+#
+# WARNING: Any manual changes made to this file will be lost when pyuic5 is
+# run again.  Do not edit this file unless you know what you are doing.
+
+
+from PyQt5 import QtCore, QtGui, QtWidgets
+
+
+class Ui_DiagnosticsDialog(object):
+    def setupUi(self, DiagnosticsDialog):
+        DiagnosticsDialog.setObjectName("DiagnosticsDialog")
+        DiagnosticsDialog.resize(620, 520)
+        self.layout_dialog = QtWidgets.QVBoxLayout(DiagnosticsDialog)
+        self.layout_dialog.setContentsMargins(20, 20, 20, 20)
+        self.layout_dialog.setSpacing(16)
+        self.layout_dialog.setObjectName("layout_dialog")
+        self.text_report = QtWidgets.QPlainTextEdit(DiagnosticsDialog)
+        self.text_report.setLineWrapMode(QtWidgets.QPlainTextEdit.NoWrap)
+        self.text_report.setReadOnly(True)
+        self.text_report.setObjectName("text_report")
+        self.layout_dialog.addWidget(self.text_report)
+        self.button_box = QtWidgets.QDialogButtonBox(DiagnosticsDialog)
+        self.button_box.setOrientation(QtCore.Qt.Horizontal)
+        self.button_box.setStandardButtons(QtWidgets.QDialogButtonBox.Close)
+        self.button_box.setObjectName("button_box")
+        self.layout_dialog.addWidget(self.button_box)
+
+        self.retranslateUi(DiagnosticsDialog)
+        self.button_box.rejected.connect(DiagnosticsDialog.reject) # type: ignore
+        self.button_box.accepted.connect(DiagnosticsDialog.accept) # type: ignore
+        QtCore.QMetaObject.connectSlotsByName(DiagnosticsDialog)
+
+    def retranslateUi(self, DiagnosticsDialog):
+        _translate = QtCore.QCoreApplication.translate
+        DiagnosticsDialog.setWindowTitle(_translate("DiagnosticsDialog", "Diagnostics"))
@@ -0,0 +1,156 @@
+"""Cover art, prepared for everywhere the window shows it.
+
+One cover becomes several images: the rounded panel in the window, a window
+icon at every size Windows asks for, and the taskbar's hover thumbnail and live
+preview. Each is a smooth scale of the decoded cover, and the GUI thread used to
+do all of them itself on every track change - decoding, scaling and clipping
+while the window it was meant to be repainting waited.
+
+prepare_artwork() does the lot as QImages, which unlike QPixmaps may be built on
+any thread, so the worker runs it on its executor and hands the results over
+ready to display. ArtworkCache keeps them for the last few covers, so going back
+to a recent track costs no image work anywhere.
+"""
+
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from PyQt5.QtCore import QRectF, Qt
+from PyQt5.QtGui import QColor, QImage, QPainter, QPainterPath
+
+import metrics
+
+logger = logging.getLogger(__name__)
+
+# The panel in the main window.
+ART_SIZE = 240
+ART_RADIUS = 10
+
+# What Windows asks a window icon for: 16 in the title bar, 32 on the taskbar,
+# more again on a scaled display, and 48/256 in Alt-Tab and the task switcher.
+ICON_SIZES = (16, 24, 32, 48, 64, 128, 256)
+
+# Windows asks for the thumbnail at whatever size it wants and scales what it
+# gets. Composing at a fixed 16:10 means the aspect never changes under it, so a
+# cover is never stretched; these are generous enough that the downscale is the
+# only resampling that happens.
+THUMBNAIL_SIZE = (320, 200)
+LIVE_PREVIEW_SIZE = (640, 400)
+
+# The client's own panel colour, so the ground behind a square cover on a wide
+# thumbnail looks like part of this app rather than an accident.
+THUMBNAIL_GROUND = QColor(26, 33, 51)
+
+# Covers kept prepared. Each is a megabyte or two with the taskbar images, so
+# this is enough to flip between a few tracks rather than a whole playlist.
+ARTWORK_CACHE_LIMIT = 6
+
+
+@dataclass(frozen=True)
+class Artwork:
+    """One cover, prepared. The taskbar images are only made when wanted."""
+
+    art_id: str
+    panel: QImage  # rounded, ART_SIZE at pixel_ratio
+    pixel_ratio: float
+    icons: tuple[QImage, ...] = ()  # one per ICON_SIZES, or none
+    thumbnail: QImage | None = None
+    live_preview: QImage | None = None
+
+
+def prepare_artwork(thumb_bytes: bytes, art_id: str, pixel_ratio: float, icons: bool, previews: bool) -> Artwork | None:
+    """Decode a cover and make everything the window shows of it. Any thread.
+
+    None if it will not decode.
+    """
+    source = QImage()
+    if not source.loadFromData(thumb_bytes):
+        logger.warning('Could not decode the thumbnail Windows gave us')
+        return None
+    return Artwork(
+        art_id=art_id,
+        panel=rounded_image(source, ART_SIZE, ART_RADIUS, pixel_ratio),
+        pixel_ratio=pixel_ratio,
+        icons=tuple(_scaled(source, size, size) for size in ICON_SIZES) if icons else (),
+        thumbnail=compose_thumbnail(source, THUMBNAIL_SIZE) if previews else None,
+        live_preview=compose_thumbnail(source, LIVE_PREVIEW_SIZE) if previews else None,
+    )
+
+
+def _scaled(image: QImage, width: int, height: int) -> QImage:
+    return image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+
+
+def rounded_image(image: QImage, size: int, radius: int, pixel_ratio: float = 1.0) -> QImage:
+    """Scale artwork to fit a square and clip it to rounded corners."""
+    target = int(size * pixel_ratio)
+    scaled = _scaled(image, target, target)
+
+    out = QImage(target, target, QImage.Format_ARGB32_Premultiplied)
+    out.fill(Qt.transparent)
+
+    x = (target - scaled.width()) // 2
+    y = (target - scaled.height()) // 2
+
+    painter = QPainter(out)
+    painter.setRenderHint(QPainter.Antialiasing)
+    path = QPainterPath()
+    path.addRoundedRect(
+        QRectF(x, y, scaled.width(), scaled.height()),
+        radius * pixel_ratio,
+        radius * pixel_ratio,
+    )
+    painter.setClipPath(path)
+    painter.drawImage(x, y, scaled)
+    painter.end()
+
+    out.setDevicePixelRatio(pixel_ratio)
+    return out
+
+
+def compose_thumbnail(artwork: QImage | None, size) -> QImage:
+    """Fit artwork onto a wide, dark ground for the hover preview."""
+    width, height = size
+    canvas = QImage(width, height, QImage.Format_RGB32)
+    canvas.fill(THUMBNAIL_GROUND)
+    if artwork is None or artwork.isNull():
+        return canvas
+
+    scaled = _scaled(artwork, width, height)
+    painter = QPainter(canvas)
+    painter.drawImage(
+        (width - scaled.width()) // 2,
+        (height - scaled.height()) // 2,
+        scaled,
+    )
+    painter.end()
+    return canvas
+
+
+class ArtworkCache:
+    """Prepared artwork for recent covers. Least recently used goes first.
+
+    Keyed on what was made as well as the cover: the pixel ratio the panel was
+    rounded at, and whether the taskbar images were wanted, which changes with
+    the settings.
+    """
+
+    def __init__(self, limit: int = ARTWORK_CACHE_LIMIT):
+        self._limit = limit
+        self._entries: OrderedDict[tuple, Artwork] = OrderedDict()
+
+    def get(self, art_id, pixel_ratio, icons, previews) -> Artwork | None:
+        key = (art_id, pixel_ratio, icons, previews)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        metrics.increment('artwork_cache.hit' if entry is not None else 'artwork_cache.miss')
+        return entry
+
+    def store(self, artwork: Artwork):
+        key = (artwork.art_id, artwork.pixel_ratio, bool(artwork.icons), artwork.thumbnail is not None)
+        self._entries[key] = artwork
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._limit:
+            self._entries.popitem(last=False)
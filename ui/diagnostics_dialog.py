@@ -0,0 +1,169 @@
+"""How pushes to the dock are going, for someone wondering why it is slow.
+
+The footer only says whether the dock answered. Everything behind that is
+already being recorded - the timings and counters in metrics.py, and the last
+few exchanges in DeviceLink.recent_pushes - so this only reads it: every
+REFRESH_MS while the dialog is open, and not at all otherwise.
+"""
+
+import logging
+import time
+
+from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtGui import QFontDatabase
+from PyQt5.QtWidgets import QApplication, QDialog, QDialogButtonBox
+
+import metrics
+from constants import APP_NAME
+from device_link import PushRecord
+from ui.theme import use_dark_titlebar
+from ui.Ui_diagnostics_dialog import Ui_DiagnosticsDialog
+
+logger = logging.getLogger(__name__)
+
+# Slow enough that watching it costs nothing, quick enough to see a push land.
+REFRESH_MS = 2000
+
+# Exchanges listed, newest first. The rest of the history is in the timings.
+RECENT_SHOWN = 15
+
+
+def format_report(snapshot: dict, pushes: list[PushRecord]) -> str:
+    """The report as plain text, laid out for a fixed-width font."""
+    counters = snapshot['counters']
+    gauges = snapshot['gauges']
+    timings = snapshot['timings']
+    lines = []
+
+    lines.append(f'{"Recent pushes":<24}{"handshake":>10}{"body":>10}{"frame":>10}{"dock rx":>12}')
+    if not pushes:
+        lines.append('  none yet')
+    for push in reversed(pushes[-RECENT_SHOWN:]):
+        outcome = 'ok' if push.ok else (push.error or 'failed')
+        lines.append(
+            f'  {time.strftime("%H:%M:%S", time.localtime(push.at))}  {outcome[:12]:<12}'
+            f'{_ms(push.handshake):>10}{_ms(push.body):>10}'
+            f'{_kb(push.frame_bytes) if push.frame_bytes else "-":>10}'
+            f'{f"{push.dock_kbps:.0f} KB/s" if push.dock_kbps is not None else "-":>12}'
+        )
+
+    lines.append('')
+    lines.append(f'{"Timings since start":<24}{"count":>8}{"p50":>10}{"p90":>10}{"max":>10}')
+    for label, name in (
+        ('push handshake', 'push.handshake'),
+        ('push body', 'push.body'),
+        ('push total', 'push.total'),
+        ('thumbnail read', 'session.read_thumbnail'),
+        ('frame encode', 'frame.encode'),
+        ('dock collection', 'dock.gc'),
+        ('discovery', 'discovery.search'),
+        ('first reply', 'discovery.first_reply'),
+    ):
+        timing = timings.get(name)
+        if timing is None:
+            continue
+        lines.append(
+            f'  {label:<22}{timing["count"]:>8}{_ms_value(timing["p50_ms"]):>10}'
+            f'{_ms_value(timing["p90_ms"]):>10}{_ms_value(timing["max_ms"]):>10}'
+        )
+
+    lines.append('')
+    lines.append(
+        f'Frames      {counters.get("push.frames", 0)} sent, {_kb(counters.get("push.frame_bytes", 0))}; '
+        f'{counters.get("push.deduped", 0)} pushes skipped as unchanged, '
+        f'{counters.get("push.paced", 0)} paced, {counters.get("push.superseded", 0)} superseded; '
+        f'{counters.get("push.failed", 0)} failed, {counters.get("push.rejected", 0)} rejected'
+    )
+    lines.append(
+        f'Caches      frames {_rate(counters, "frame_cache")}  ·  colours {_rate(counters, "colour_cache")}'
+        f'  ·  window art {_rate(counters, "artwork_cache")}'
+    )
+    tracks = counters.get('session.tracks', 0)
+    chases = counters.get('artwork.chase_reads', 0)
+    per_track = f'{chases / tracks:.1f} per track' if tracks else 'none'
+    lines.append(
+        f'Artwork     extra reads {per_track} ({chases} over {tracks} tracks), '
+        f'{counters.get("artwork.chase_exhausted", 0)} gave up'
+    )
+    lines.append(f'Discovery   {counters.get("discovery.searches", 0)} searches')
+
+    dock = []
+    if 'dock.receive_kbps' in gauges:
+        dock.append(f'last frame received at {gauges["dock.receive_kbps"]:.0f} KB/s')
+    if 'dock.heap_free' in gauges:
+        dock.append(f'{_kb(gauges["dock.heap_free"])} heap free')
+    if 'dock.redraw_fraction' in gauges:
+        dock.append(f'redrew {gauges["dock.redraw_fraction"]:.0%} of the panel')
+    lines.append(f'Dock        {"; ".join(dock) if dock else "no frame reports yet"}')
+
+    startup = [
+        f'{stage.replace("_", " ")} {_ms_value(timings[f"startup.{stage}"]["max_ms"])}'
+        for stage in ('imports', 'window', 'first_push')
+        if f'startup.{stage}' in timings
+    ]
+    if startup:
+        lines.append(f'Start-up    {"  ·  ".join(startup)}')
+    return '\n'.join(lines)
+
+
+def _ms(seconds: float | None) -> str:
+    return '-' if seconds is None else _ms_value(seconds * 1000)
+
+
+def _ms_value(ms: float | None) -> str:
+    return '-' if ms is None else f'{ms:.0f}ms'
+
+
+def _kb(size: float) -> str:
+    return f'{size / 1024:.0f} KB' if size < 1024 * 1024 else f'{size / 1024 / 1024:.1f} MB'
+
+
+def _rate(counters: dict, prefix: str) -> str:
+    hits = counters.get(f'{prefix}.hit', 0)
+    total = hits + counters.get(f'{prefix}.miss', 0)
+    return f'{hits / total:.0%} of {total}' if total else 'unused'
+
+
+class DiagnosticsDialog(QDialog, Ui_DiagnosticsDialog):
+    def __init__(self, device_link, parent=None):
+        super().__init__(parent)
+        self.setupUi(self)
+        self.setWindowFlag(Qt.WindowContextHelpButtonHint, False)
+        self.setWindowTitle(f'{APP_NAME} Diagnostics')
+        use_dark_titlebar(self)
+
+        self.text_report.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        button_copy = self.button_box.addButton('Copy', QDialogButtonBox.ActionRole)
+        button_copy.clicked.connect(self.copy_report)
+
+        # Owned by the worker. Only recent_pushes is read from here, and that is
+        # copied whole in one call.
+        self._device = device_link
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.refresh()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self._timer.start()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self._timer.stop()
+
+    def report(self) -> str:
+        return format_report(metrics.snapshot(), list(self._device.recent_pushes))
+
+    def refresh(self):
+        report = self.report()
+        if report == self.text_report.toPlainText():
+            return
+        # Replacing the text scrolls to the top, which would fight anyone
+        # reading further down.
+        scroll = self.text_report.verticalScrollBar().value()
+        self.text_report.setPlainText(report)
+        self.text_report.verticalScrollBar().setValue(scroll)
+
+    def copy_report(self):
+        QApplication.instance().clipboard().setText(self.report())
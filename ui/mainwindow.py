@@ -1,7 +1,9 @@
 import logging
+import math
+import os
 
-from PyQt5.QtCore import QEvent, QRectF, Qt, QThread, QTimer, pyqtSlot
-from PyQt5.QtGui import QIcon, QPainter, QPainterPath, QPixmap
+from PyQt5.QtCore import QEvent, Qt, QThread, QTimer, pyqtSlot
+from PyQt5.QtGui import QIcon, QPainter, QPixmap
 from PyQt5.QtWidgets import (
     QAction,
     QApplication,
@@ -15,6 +17,8 @@ import settings
 from device_link import explain_socket_error
 from paths import APP_ICON
 from ui.about_dialog import AboutDialog
+from ui.artwork import ART_SIZE
+from ui.diagnostics_dialog import DiagnosticsDialog
 from ui.notifications import NotificationsWrapper
 from ui.settings_dialog import SettingsDialog
 from ui.taskbar import TaskbarIntegration
@@ -23,9 +27,6 @@ from ui.Ui_mainwindow import Ui_MainWindow
 
 logger = logging.getLogger(__name__)
 
-ART_SIZE = 240
-ART_RADIUS = 10
-
 # Geometric Shapes block, so these render in Segoe UI without falling back to
 # an emoji font.
 STATUS_GLYPHS = {
@@ -48,9 +49,13 @@ STALE_ART_DIM = 0.45
 # 1.8 seconds - visible as a stutter. Must match `maximum` in mainwindow.ui.
 PROGRESS_STEPS = 1000
 
-# How often the position is recomputed while playing. The bar is around 300px
-# wide, so half a second is under a pixel on a three minute track.
-PROGRESS_INTERVAL_MS = 500
+# The taskbar's bar is drawn across a button about this wide on a scaled display.
+# Minimised, it is the only bar on screen, so its pixels are what set the pace.
+TASKBAR_PROGRESS_PIXELS = 64
+
+# Floor on the wait between redraws. Only reached when a timer fires a hair
+# before the change it was armed for and the next one is a moment away.
+PROGRESS_MIN_MS = 15
 
 
 def format_duration(seconds: float) -> str:
@@ -63,33 +68,6 @@ def format_duration(seconds: float) -> str:
     return f'{minutes}:{secs:02d}'
 
 
-def rounded_pixmap(pixmap: QPixmap, size: int, radius: int, device_pixel_ratio: float = 1.0) -> QPixmap:
-    """Scale artwork to fit a square and clip it to rounded corners."""
-    target = int(size * device_pixel_ratio)
-    scaled = pixmap.scaled(target, target, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-
-    out = QPixmap(target, target)
-    out.fill(Qt.transparent)
-
-    x = (target - scaled.width()) // 2
-    y = (target - scaled.height()) // 2
-
-    painter = QPainter(out)
-    painter.setRenderHint(QPainter.Antialiasing)
-    path = QPainterPath()
-    path.addRoundedRect(
-        QRectF(x, y, scaled.width(), scaled.height()),
-        radius * device_pixel_ratio,
-        radius * device_pixel_ratio,
-    )
-    painter.setClipPath(path)
-    painter.drawPixmap(x, y, scaled)
-    painter.end()
-
-    out.setDevicePixelRatio(device_pixel_ratio)
-    return out
-
-
 def dimmed_pixmap(pixmap: QPixmap, opacity: float = STALE_ART_DIM) -> QPixmap:
     """A darkened copy, for artwork known to belong to the track that just ended.
 
@@ -127,8 +105,6 @@ def placeholder_pixmap(icon: QIcon, size: int, device_pixel_ratio: float = 1.0)
 class MainWindow(QMainWindow, Ui_MainWindow):
     def __init__(self):
         super().__init__()
-        self.setupUi(self)
-        self.setWindowTitle(QApplication.applicationName())
 
         self.app_icon = QIcon(APP_ICON)
         # NOT isNull(): QIcon stores the path lazily and reports a missing file
@@ -138,6 +114,24 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         if not self.app_icon.availableSizes():
             logger.warning('Could not load %s; falling back to a stock icon', APP_ICON)
             self.app_icon = self.style().standardIcon(QStyle.SP_MediaPlay)
+
+        # The tray icon and the worker come before the widgets. Started at login
+        # and minimised, the tray icon and a pushed dock are the whole of what
+        # anyone sees, so they should not queue behind building a window that
+        # may never be shown. The worker's signals are queued to this thread,
+        # so none lands before the widgets they update exist.
+        self.tray_icon = None
+        self.setup_tray()
+
+        self.notifications_wrapper = NotificationsWrapper(state_dir=os.path.dirname(settings.ini_path()))
+        self.notifications_wrapper.art_pixel_ratio = self.devicePixelRatioF()
+        self._notifications_thread = QThread()
+        self._notifications_thread.setObjectName('media-monitor')
+        QApplication.instance().aboutToQuit.connect(self.shutdown_worker)
+        self.setup_notifications()
+
+        self.setupUi(self)
+        self.setWindowTitle(QApplication.applicationName())
         self.setWindowIcon(self.app_icon)
         use_dark_titlebar(self)
 
@@ -147,25 +141,26 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self._tray_hint_shown = False
         self._current_art_id = None
         # The undimmed artwork on show, kept so it can be darkened and restored
-        # without decoding and reclipping the thumbnail again.
+        # without converting the prepared image again.
         self._art_pixmap = None
         self._art_dimmed = False
 
         # The position anchor the display is extrapolating from, and the state
-        # it was read in. See Timeline in ui/notifications.py.
+        # it was read in. See Timeline in media_sources/__init__.py.
         self._timeline = None
         self._timeline_playing = False
+        # Single shot, armed by refresh_progress() for the next moment the
+        # display would change. Precise, because the default coarse timer may
+        # fire 5% early - which for a one second wait is a wasted wakeup that
+        # finds nothing to draw.
         self._progress_timer = QTimer(self)
-        self._progress_timer.setInterval(PROGRESS_INTERVAL_MS)
+        self._progress_timer.setSingleShot(True)
+        self._progress_timer.setTimerType(Qt.PreciseTimer)
         self._progress_timer.timeout.connect(self.refresh_progress)
 
-        # The cover as Windows handed it over, undecorated - the panel's own copy
-        # is rounded and resized for the panel, which is not what the taskbar
-        # icon or the hover thumbnail want.
-        self._art_source = None
-
-        self.tray_icon = None
-        self.setup_tray()
+        # The prepared cover on show, which also carries the taskbar's images.
+        # See ui/artwork.py.
+        self._artwork = None
 
         # Bound to the native window handle on the first showEvent; until then
         # every call on it is a no-op, so nothing has to check.
@@ -176,6 +171,13 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.button_settings.clicked.connect(self.show_settings)
         self.button_hide.clicked.connect(self.hide_to_tray)
 
+        # Where someone looking at "not responding" would think to click.
+        self._diagnostics = None
+        action_diagnostics = QAction('Diagnostics...', self.lbl_device)
+        action_diagnostics.triggered.connect(self.show_diagnostics)
+        self.lbl_device.addAction(action_diagnostics)
+        self.lbl_device.setContextMenuPolicy(Qt.ActionsContextMenu)
+
         self.button_previous.clicked.connect(lambda: self.send_command('previous'))
         self.button_play_pause.clicked.connect(lambda: self.send_command('play_pause'))
         self.button_next.clicked.connect(lambda: self.send_command('next'))
@@ -187,14 +189,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         if geometry:
             self.restoreGeometry(geometry)
 
-        self.notifications_wrapper = NotificationsWrapper()
-        self._notifications_thread = QThread()
-        self._notifications_thread.setObjectName('media-monitor')
-
-        QApplication.instance().aboutToQuit.connect(self.shutdown_worker)
-
         logger.debug('MainWindow initialized')
-        QTimer.singleShot(0, self.setup_notifications)
 
     # -- Worker ------------------------------------------------------------
 
@@ -202,6 +197,7 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.notifications_wrapper.moveToThread(self._notifications_thread)
         self._notifications_thread.started.connect(self.notifications_wrapper.start)
         self.notifications_wrapper.signal_track.connect(self.receive_track)
+        self.notifications_wrapper.signal_timeline.connect(self.receive_timeline)
         self.notifications_wrapper.signal_device_state.connect(self.receive_device_state)
         self.notifications_wrapper.signal_device_discovered.connect(self.receive_discovered_device)
         self._notifications_thread.start()
@@ -241,6 +237,10 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.action_about.triggered.connect(self.show_about)
         menu.addAction(self.action_about)
 
+        self.action_diagnostics = QAction('Diagnostics...', self)
+        self.action_diagnostics.triggered.connect(self.show_diagnostics)
+        menu.addAction(self.action_diagnostics)
+
         menu.addSeparator()
 
         self.action_quit = QAction('Quit', self)
@@ -343,6 +343,16 @@ class MainWindow(QMainWindow, Ui_MainWindow):
     def show_about(self):
         AboutDialog(self).exec_()
 
+    @pyqtSlot()
+    def show_diagnostics(self):
+        # Modeless, so it can be watched while the music changes, and only ever
+        # one: a second click brings the open one forward.
+        if self._diagnostics is None:
+            self._diagnostics = DiagnosticsDialog(self.notifications_wrapper.device, self)
+        self._diagnostics.show()
+        self._diagnostics.raise_()
+        self._diagnostics.activateWindow()
+
     @pyqtSlot()
     def show_settings(self):
         dialog = SettingsDialog(self)
@@ -354,8 +364,11 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # has just said they want to see it.
         if dialog.check_tray_hint.isChecked():
             self._tray_hint_shown = False
+        self.apply_settings()
 
-        self.notifications_wrapper.set_device_address(dialog.host, dialog.port)
+    def apply_settings(self):
+        """Act on settings that have just changed, from the dialog or the file."""
+        self.notifications_wrapper.set_device_address(settings.device_host(), settings.device_port())
         # Everything else the dialog saved is read by the worker on its next
         # push, so nudge it into making one - otherwise turning the ambient light
         # on does nothing visible until the next track change or heartbeat.
@@ -393,22 +406,27 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         self.button_play_pause.setEnabled(track.can_play_pause)
         self.button_next.setEnabled(track.can_next)
 
-        self.set_artwork(track.thumbnail, track.art_id, track.artwork_pending)
+        self.set_artwork(track.artwork, track.art_id, track.artwork_pending)
         self.set_timeline(track.timeline, track.is_playing)
 
         tooltip = ' - '.join(part for part in (track.artist, track.title) if part)
         if self.tray_icon is not None:
             self.tray_icon.setToolTip(tooltip or QApplication.applicationName())
 
-        # After set_artwork, which is what refreshes _art_source.
+        # After set_artwork, which is what refreshes _artwork.
         self.taskbar.set_track(
-            self._art_source,
+            self._artwork,
             'play' if track.is_playing else ('pause' if track.status == 'PAUSED' else 'stop'),
             track.can_previous,
             track.can_next,
             track.can_play_pause,
         )
 
+    @pyqtSlot(object, bool)
+    def receive_timeline(self, timeline, playing):
+        """The position alone moved - a seek, or the scrubber in the player."""
+        self.set_timeline(timeline, playing)
+
     @staticmethod
     def _set_optional(label, text):
         """Empty metadata should collapse rather than leave a hole in the stack."""
@@ -432,7 +450,8 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self.tray_icon.setToolTip(QApplication.applicationName())
         self.taskbar.clear()
 
-    def set_artwork(self, thumb_bytes, art_id, pending=False):
+    def set_artwork(self, artwork, art_id, pending=False):
+        """Show a cover the worker has prepared, or the placeholder for None."""
         if pending:
             # The track changed but its artwork has not arrived. Keep the cover we
             # have and darken it rather than swapping in the leftover the session
@@ -441,35 +460,22 @@ class MainWindow(QMainWindow, Ui_MainWindow):
             self._dim_artwork()
             return
 
-        # Re-clipping the same artwork on every playback event is wasted work -
-        # unless it is currently dimmed, which this call is here to undo.
-        if art_id is not None and art_id == self._current_art_id and not self._art_dimmed:
+        # Re-showing the same artwork on every playback event is wasted work -
+        # unless it is currently dimmed, which this call is here to undo. The
+        # same art_id can come back prepared differently, with the taskbar's
+        # images after a settings change, so that counts as new.
+        if art_id is not None and art_id == self._current_art_id and artwork is self._artwork and not self._art_dimmed:
             return
         self._current_art_id = art_id
         self._art_dimmed = False
+        self._artwork = artwork
 
-        if not thumb_bytes:
+        if artwork is None:
             self._art_pixmap = None
-            self._art_source = None
             self.show_placeholder_art()
             return
 
-        source = QPixmap()
-        if not source.loadFromData(thumb_bytes):
-            logger.warning('Could not decode the thumbnail Windows gave us')
-            self._art_pixmap = None
-            self._art_source = None
-            self.show_placeholder_art()
-            return
-
-        logger.debug('Received thumbnail (%d KB)', len(thumb_bytes) // 1024)
-        self._art_source = source
-        self._art_pixmap = rounded_pixmap(
-            source,
-            ART_SIZE,
-            ART_RADIUS,
-            self.devicePixelRatioF(),
-        )
+        self._art_pixmap = QPixmap.fromImage(artwork.panel)
         self.lbl_art.setPixmap(self._art_pixmap)
         self.lbl_art.setProperty('has_art', 'true')
         restyle(self.lbl_art)
@@ -514,22 +520,23 @@ class MainWindow(QMainWindow, Ui_MainWindow):
 
         A paused source needs no timer - its anchor already is the answer - and
         neither does a window in the tray, which is the normal state here: the
-        dock keeps being fed with nothing on screen, and a repaint every half
-        second for the rest of the day would be the one expensive thing about
-        this feature.
+        dock keeps being fed with nothing on screen, and a repaint every second
+        for the rest of the day would be the one expensive thing about this
+        feature.
         """
+        if not self._progress_ticks():
+            self._progress_timer.stop()
+        elif not self._progress_timer.isActive():
+            # Arms the timer on the way out.
+            self.refresh_progress()
+
+    def _progress_ticks(self) -> bool:
         # Minimised is off screen for the panel but *not* for the taskbar, which
         # is still drawing a progress bar someone can see - so that case keeps
         # ticking. A hidden window has no taskbar button at all, so it does not.
         on_screen = self.isVisible() and not self.isMinimized()
         on_taskbar = self.isVisible() and self.taskbar.shows_progress
-        should_run = self._timeline is not None and self._timeline_playing and (on_screen or on_taskbar)
-        if should_run == self._progress_timer.isActive():
-            return
-        if should_run:
-            self._progress_timer.start()
-        else:
-            self._progress_timer.stop()
+        return self._timeline is not None and self._timeline_playing and (on_screen or on_taskbar)
 
     @pyqtSlot()
     def refresh_progress(self):
@@ -538,6 +545,9 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         The anchor is timestamped, so this is self-correcting: a window that was
         hidden for an hour comes back showing the right position, and no count
         of missed ticks has to be kept.
+
+        Then re-arms the timer for the next visible change, rather than polling:
+        a three minute track needs a redraw about once a second, not twice.
         """
         timeline = self._timeline
         if timeline is None:
@@ -547,16 +557,47 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # `now`s and could disagree about the last second of a track.
         position = timeline.position_at(self._timeline_playing)
         span = timeline.duration
-        fraction = (position - timeline.start) / span if span > 0 else 0.0
+        elapsed = position - timeline.start
+        fraction = elapsed / span if span > 0 else 0.0
 
+        # Qt drops a set that changes nothing, so these only repaint what moved.
         self.progress_position.setValue(round(fraction * PROGRESS_STEPS))
-        self.lbl_elapsed.setText(format_duration(position - timeline.start))
+        self.lbl_elapsed.setText(format_duration(elapsed))
         self.lbl_duration.setText(format_duration(span))
         self.taskbar.set_progress(
             fraction if span > 0 else None,
             self._timeline_playing,
         )
 
+        delay = self._next_progress_change(timeline, elapsed) if self._progress_ticks() else None
+        if delay is None:
+            self._progress_timer.stop()
+        else:
+            self._progress_timer.start(delay)
+
+    def _next_progress_change(self, timeline, elapsed) -> int | None:
+        """Milliseconds until the display next looks different, or None if never.
+
+        Whichever comes first of the elapsed time reaching its next whole second
+        and the bar reaching its next pixel. Off screen only the taskbar's bar is
+        being watched, and that is far narrower than the panel's.
+        """
+        span = timeline.duration
+        if timeline.rate <= 0 or 0 < span <= elapsed:
+            return None
+        on_screen = not self.isMinimized()
+
+        waits = []
+        if on_screen:
+            waits.append(math.floor(elapsed) + 1 - elapsed)
+        if span > 0:
+            pixels = self.progress_position.width() if on_screen else TASKBAR_PROGRESS_PIXELS
+            pixels = max(1, min(pixels, PROGRESS_STEPS))
+            waits.append((math.floor(elapsed / span * pixels) + 1) * span / pixels - elapsed)
+        if not waits:
+            return None
+        return max(PROGRESS_MIN_MS, math.ceil(min(waits) / timeline.rate * 1000))
+
     def show_placeholder_art(self):
         self.lbl_art.setPixmap(
             placeholder_pixmap(self.app_icon, ART_SIZE, self.devicePixelRatioF()),
@@ -608,6 +649,9 @@ class MainWindow(QMainWindow, Ui_MainWindow):
         # First show is where windowHandle() finally exists, which is what the
         # taskbar button and thumbnail toolbar both need. No-ops after that.
         self.taskbar.attach()
+        # The worker rounds artwork for the screen the window is on. A move to
+        # a screen with another scale is picked up at the next cover.
+        self.notifications_wrapper.art_pixel_ratio = self.devicePixelRatioF()
         self.refresh_progress()
         self.sync_progress_timer()
 
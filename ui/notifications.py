@@ -2,35 +2,63 @@
 
 Runs its own asyncio loop on a worker QThread. Everything it learns is handed to
 the UI as signals; the UI never touches WinRT or the socket itself.
+
+The session itself is reached through a MediaSource - WinRT in the shipped
+client, see media_sources/ - so everything below runs unchanged against a
+scripted stand-in on any platform.
 """
 
 import asyncio
 import logging
 import time
 from dataclasses import dataclass
-from datetime import UTC, datetime
 
-import winrt.windows.media.control as media_control
 from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
-from winrt.windows.storage import streams
 
 import discovery
+import last_push
+import metrics
 import settings
-from device_link import DeviceLink, SendResult
-from media_image import ArtworkPicker, ColourCache, FrameCache, art_id_for
+from device_link import PROGRESS_PROTO, DeviceLink, DockWatch, SendResult
+from last_push import LastPush
+from media_image import ArtworkPicker, ColourCache, FrameCache, art_id_for, resize_thumbnail
+from media_sources import (
+    EVENT_PROPERTIES,
+    EVENT_TIMELINE,
+    TRANSPORT_COMMANDS,
+    MediaSource,
+    Timeline,
+    default_source,
+)
+from ui.artwork import Artwork, ArtworkCache, prepare_artwork
 
 logger = logging.getLogger(__name__)
 
 # Windows raises a playback event for seeks and position updates too, so the
 # same track state gets reported several times a second. Identical pushes are
-# skipped, but one is forced through this often so a device that restarted
+# skipped, but the last one is re-sent this often so a device that restarted
 # mid-track picks the display back up without waiting for the next song.
+#
+# A heartbeat re-sends what was last pushed rather than reading the session
+# again, so it costs one header exchange with the dock and nothing of Windows.
+# It is what keeps the dock honest while the poll below is backed off.
+#
+# Not sent while a watch connection to the dock is up: the dock says itself
+# when it has lost what it was showing - see DockWatch and _on_dock_event().
 HEARTBEAT_SECONDS = 30
 
 # Events can be missed - a source that dies without a final notification leaves
-# stale text on the dock, and a device that reboots while playback is paused
-# would otherwise wait for the next track. Re-checking on a timer covers both.
+# stale text on the dock, and a paused source raises no events at all while its
+# artwork may still be arriving. Re-checking on a timer covers both.
+#
+# This is the tightest the poll runs, and where it returns whenever there is
+# something to catch: a failed push, artwork not yet settled, or a paused
+# source. Once the state is settled and the dock has confirmed it, each quiet
+# poll doubles the wait, up to POLL_MAX_SECONDS. A settled, playing track
+# raises events of its own for anything worth seeing, so a full cross-process
+# read every ten seconds was mostly confirming what was already known.
 POLL_SECONDS = 10
+POLL_MAX_SECONDS = 120
 
 # A dock that is merely switched off should not have us broadcasting every time
 # a push fails - that would be every poll.
@@ -79,6 +107,42 @@ ARTWORK_CHASE_INTERVAL = 0.15
 # next to a flash of the wrong track on every skip.
 SESSION_GRACE_SECONDS = 1.5
 
+# How far the dock's position bar may have drifted from the source before an
+# otherwise unchanged push is let through to correct it. The dock counts on by
+# itself from the last anchor, so this only catches a seek or a changed rate,
+# and the bar is about a pixel to the second on a typical track.
+PROGRESS_RESYNC_SECONDS = 2.0
+
+# How long a properties event waits for the rest of its burst before the
+# session is read. A track change raises several, a few milliseconds apart, and
+# a read started on the first one pushes text with the last track's artwork and
+# then reads again. Playback events - play, pause, a seek - are not held: that
+# is the user pressing something, and it should show at once.
+#
+# Stretched to what a handshake with the dock has been costing, up to the
+# maximum. The push holds the loop for that long anyway, so a burst that lands
+# within it would only have queued a second read and push behind the first.
+# Kept well under the half second Firefox leaves its full-size cover on offer -
+# see ARTWORK_CHASE_INTERVAL.
+PROPERTIES_SETTLE_SECONDS = 0.05
+PROPERTIES_SETTLE_MAX_SECONDS = 0.25
+
+# Pushes allowed back to back before they are paced, and the pace: one per
+# PUSH_COST_FACTOR handshakes' worth of time, never closer than the minimum.
+# A track change is two or three pushes - the text, then the artwork as it
+# arrives - and goes through untouched. What gets paced is a stream: a burst of
+# seeks, or a source that keeps changing its position, each of which would
+# otherwise be another round trip to a dock that may take a second to answer.
+PUSH_BURST = 3
+PUSH_COST_FACTOR = 4
+PUSH_INTERVAL_MIN_SECONDS = 0.25
+
+# Timeline events are read at most this often: the first at once, then the
+# latest of any that follow, once this has passed. A seek is one event, but
+# dragging a scrubber is a stream of them, and some sources raise one for every
+# second of plain playback.
+TIMELINE_INTERVAL_SECONDS = 0.25
+
 # Pushed when Windows has no media session at all, so the dock can go back to
 # its placeholder instead of holding the last track for ever.
 IDLE_PAYLOAD = {
@@ -104,59 +168,19 @@ IDLE_PAYLOAD = {
 _NO_LIGHT = object()
 
 
-# Transport commands the UI can ask for, mapped to the session method that
-# performs them. Which are actually usable is reported per-source in TrackInfo.
-TRANSPORT_COMMANDS = {
-    'previous': 'try_skip_previous_async',
-    'next': 'try_skip_next_async',
-    'play_pause': 'try_toggle_play_pause_async',
-}
-
-
-@dataclass(frozen=True)
-class Timeline:
-    """How far into the track the source says it had got, and when it said so.
-
-    `position` is a snapshot rather than a running counter, and the difference
-    matters: Edge publishes one, then leaves it alone for about a minute, raising
-    no event in between. Read twenty seconds apart it is the same number twice,
-    so anything displaying it directly would sit still and then jump.
-
-    `updated_at` is what makes it usable - it says when the snapshot was taken,
-    so a reader can work out how far playback has moved since. Measured against
-    Edge, that extrapolation lands within half a second after a full minute of
-    drift, which is well inside a pixel on screen.
-    """
-
-    position: float  # seconds from the start of the media
-    start: float  # usually 0, but a source may report a window
-    end: float
-    updated_at: datetime
-    rate: float = 1.0
-
-    @property
-    def duration(self) -> float:
-        return self.end - self.start
-
-    def position_at(self, playing: bool, now: datetime | None = None) -> float:
-        """Where playback has reached now, extrapolated from the snapshot.
-
-        Only while playing. A paused source leaves `position` where playback
-        stopped and lets `updated_at` age, so counting from it would run the
-        display on through the pause - a five second pause measured five
-        seconds of error, against hundredths for the extrapolation itself.
-        """
-        if not playing:
-            return self.position
+def _payload_key(payload) -> tuple:
+    """What makes two pushes the same push, for deduping. See _push()."""
+    return tuple(payload.get(key) for key in ('status', 'title', 'artist', 'album', 'art_id', 'light'))
 
-        age = ((now or datetime.now(UTC)) - self.updated_at).total_seconds()
-        if not 0.0 <= age <= self.duration:
-            # Older than the track is long, or dated in the future: the anchor
-            # cannot say anything useful about now, so show what the source
-            # last claimed rather than a number derived from a bad timestamp.
-            return self.position
 
-        return min(self.position + age * self.rate, self.end)
+# What a queued refresh has to do, weakest first. A timeline refresh re-reads
+# only the position, and a heartbeat does the same but re-sends the last push
+# whether or not the position moved. A poll re-reads the session but may reuse
+# the artwork held, and an event may not. See _schedule_refresh().
+REFRESH_TIMELINE = 0
+REFRESH_HEARTBEAT = 1
+REFRESH_POLL = 2
+REFRESH_EVENT = 3
 
 
 @dataclass(frozen=True)
@@ -168,9 +192,10 @@ class TrackInfo:
     album: str
     status: str
     art_id: str | None = None
-    thumbnail: bytes | None = None
+    # Prepared on the worker, so the window only has to put it on screen.
+    artwork: Artwork | None = None
     # Set while the only artwork on offer still belongs to the track that just
-    # ended, and thumbnail is therefore None. The track's own is usually a few
+    # ended, and artwork is therefore None. The track's own is usually a few
     # hundred milliseconds away, so a view is better off marking what it already
     # shows as stale than swapping in a leftover it will replace immediately.
     artwork_pending: bool = False
@@ -193,82 +218,57 @@ class TrackInfo:
         return self.status.replace('_', ' ').title()
 
 
-def _available_controls(playback_info) -> tuple[bool, bool, bool]:
-    """Which transport buttons this source will honour.
+class PollScheduler:
+    """When the session is next re-read, backing off while nothing needs it.
 
-    Reported by Windows per session rather than assumed: a browser tab commonly
-    offers play/pause with no track skipping, and a source that has just started
-    may briefly offer nothing at all.
+    Time is monotonic seconds, passed in rather than read here so the caller
+    decides what "now" is for a whole pass.
     """
-    try:
-        controls = playback_info.controls
-        if controls is None:
-            return False, False, False
-        return (
-            bool(controls.is_previous_enabled),
-            bool(controls.is_next_enabled),
-            bool(controls.is_play_pause_toggle_enabled or controls.is_play_enabled or controls.is_pause_enabled),
-        )
-    except Exception:
-        logger.debug('Could not read the available controls', exc_info=True)
-        return False, False, False
 
+    def __init__(self, now: float = 0.0):
+        self.interval = POLL_SECONDS
+        self.due_at = now + POLL_SECONDS
 
-def _read_timeline(session, playback_info) -> Timeline | None:
-    """The source's playback position, or None if it does not report one.
+    def reschedule(self, now: float, settled: bool):
+        """Arm the next poll after a refresh, widening the gap if it was quiet."""
+        if settled:
+            self.interval = min(self.interval * 2, POLL_MAX_SECONDS)
+        else:
+            self.interval = POLL_SECONDS
+        self.due_at = now + self.interval
 
-    Synchronous and cheap, unlike the media properties and the thumbnail, so it
-    rides along with every refresh the client already does. No subscription to
-    TimelinePropertiesChanged is needed for this: the anchor carries its own
-    timestamp, so one read ten seconds ago is as accurate as one read now. A
-    subscription would only catch a user dragging the source's own scrubber
-    sooner - and it would have to stay off _schedule_refresh(), since a source
-    that fires it every second would turn each one into a full metadata read.
-    """
-    try:
-        timeline = session.get_timeline_properties()
-        start = timeline.start_time.total_seconds()
-        end = timeline.end_time.total_seconds()
-        if end <= start:
-            # Nothing to draw against. A live stream has no end, and plenty of
-            # sources simply leave the timeline empty.
-            return None
+    def tighten(self, now: float):
+        """Something went wrong between polls; look again soon."""
+        self.interval = POLL_SECONDS
+        self.due_at = min(self.due_at, now + POLL_SECONDS)
 
-        updated_at = timeline.last_updated_time
-        if updated_at.tzinfo is None:
-            # Documented as UTC, and winrt does tag it - but an untagged one
-            # reaching position_at() would raise inside a repaint timer.
-            updated_at = updated_at.replace(tzinfo=UTC)
-
-        return Timeline(
-            position=min(max(timeline.position.total_seconds(), start), end),
-            start=start,
-            end=end,
-            updated_at=updated_at,
-            # Podcast apps and browsers both offer speed controls, and the
-            # position advances at that rate rather than in real time.
-            rate=float(playback_info.playback_rate or 1.0),
-        )
-    except Exception:
-        logger.debug('Could not read the timeline properties', exc_info=True)
-        return None
 
+class PushLimiter:
+    """A token bucket for pushes to the dock, refilled at the pace it can take.
+
+    Time is monotonic seconds, passed in as for PollScheduler.
+    """
+
+    def __init__(self, now: float = 0.0):
+        self.tokens = float(PUSH_BURST)
+        self.interval = PUSH_INTERVAL_MIN_SECONDS
+        self._filled_at = now
 
-async def get_thumbnail_data(thumbnail):
-    if thumbnail is None:
-        return None
+    def _refill(self, now: float):
+        self.tokens = min(float(PUSH_BURST), self.tokens + (now - self._filled_at) / self.interval)
+        self._filled_at = now
 
-    with await thumbnail.open_read_async() as stream, stream.get_input_stream_at(0) as input_stream:
-        # Allocate a buffer.
-        logger.debug('Reading into buffer of size: %d bytes', stream.size)
-        buffer = streams.Buffer(stream.size)
-        read_buffer = await input_stream.read_async(buffer, buffer.capacity, streams.InputStreamOptions.NONE)
+    def wait(self, now: float) -> float:
+        """Seconds until the next push may go, 0 if it may go now."""
+        self._refill(now)
+        return 0.0 if self.tokens >= 1.0 else (1.0 - self.tokens) * self.interval
 
-        # Read bytes from IBuffer using DataReader.
-        with streams.DataReader.from_buffer(read_buffer) as data_reader:
-            byte_array = bytearray(read_buffer.length)
-            data_reader.read_bytes(byte_array)
-            return bytes(byte_array)
+    def spend(self, now: float, handshake_cost: float | None):
+        """Account for a push just sent, and re-pace to what the link now costs."""
+        self._refill(now)
+        self.tokens = max(0.0, self.tokens - 1.0)
+        if handshake_cost is not None:
+            self.interval = max(PUSH_INTERVAL_MIN_SECONDS, handshake_cost * PUSH_COST_FACTOR)
 
 
 class NotificationsWrapper(QObject):
@@ -276,34 +276,72 @@ class NotificationsWrapper(QObject):
 
     # Emitted with a TrackInfo, or None when nothing is playing.
     signal_track = pyqtSignal(object)
+    # Emitted with a new Timeline, or None, and whether it is playing, when
+    # only the position has changed. See _refresh_timeline().
+    signal_timeline = pyqtSignal(object, bool)
     # Emitted after every push attempt: (reachable, message).
     signal_device_state = pyqtSignal(bool, str)
     # A dock was found at a new address; the GUI thread owns saving it.
     signal_device_discovered = pyqtSignal(str, int)
 
-    def __init__(self, parent=None):
+    def __init__(self, parent=None, source: MediaSource | None = None, state_dir: str | None = None):
         super().__init__(parent)
+        # The platform's own backend is built in main(), on the worker: on
+        # Windows that is the winrt import, which has no business holding up the
+        # window's first paint.
+        self.source = source
         self.device = DeviceLink()
+        self.device.on_frame_size = self._on_frame_size
+        self._watch = DockWatch(self.device, self._on_dock_event)
         self._artwork = ArtworkPicker()
         self._frames = FrameCache()
         self._colours = ColourCache()
+        self._prepared = ArtworkCache()
+        # What the window's artwork is rounded for. Set from the GUI thread as
+        # the window learns which screen it is on.
+        self.art_pixel_ratio = 1.0
+        # Frames being encoded off the loop, by (art_id, size), so a refresh that
+        # wants one already under way waits for it instead of starting another.
+        self._encoding: dict[tuple, asyncio.Task] = {}
 
         self._loop: asyncio.AbstractEventLoop | None = None
         self._stop_event: asyncio.Event | None = None
         # One refresh at a time; see _schedule_refresh().
         self._refresh_task: asyncio.Task | None = None
-        self._refresh_wanted = False
-        self._refresh_poll = False
+        self._refresh_mode: int | None = None
+        self._poll = PollScheduler(time.monotonic())
+        self._limiter = PushLimiter(time.monotonic())
+        # A properties event waiting out PROPERTIES_SETTLE_SECONDS.
+        self._settle_timer: asyncio.TimerHandle | None = None
+        # Timeline events, held to one read per TIMELINE_INTERVAL_SECONDS.
+        self._timeline_timer: asyncio.TimerHandle | None = None
+        self._timeline_read_at = 0.0
+        # Whether the last refresh left nothing for the poll to catch. See
+        # _refresh_until_settled().
+        self._settled = False
         # An address change that arrived before the loop was up.
         self._pending_address: tuple[str, int] | None = None
 
-        # The manager has to be held for as long as we are listening: letting
-        # it go unsubscribes us from the session-changed event. main() releases
-        # it deliberately on the way out, via _unbind_manager().
-        self._manager = None
-        self._manager_token = None
+        # Where the last confirmed push is kept for the next launch, or None to
+        # neither save nor restore one. See last_push.py.
+        self._state_dir = state_dir
+        # Showing and re-announcing the saved push, at start-up. Every push
+        # waits for it: the dock takes one exchange at a time.
+        self._restoring: asyncio.Task | None = None
+        # Set once a refresh has told the window what is playing, after which
+        # the saved state is too old to show.
+        self._live_shown = False
+        # Whether that was a track, rather than nothing playing: only a track
+        # has a position for a timeline event to move.
+        self._track_shown = False
+        # What the saved copy was last written from.
+        self._saved_key: tuple | None = None
+        self._saved_art_id: str | None = None
+
+        # Set between source.start() and source.stop(), so a callback that
+        # lands after teardown has somewhere to find out it is too late.
+        self._listening = False
         self._session = None
-        self._session_tokens: tuple | None = None
         # Which player we are following, by AUMID - the session object itself is
         # replaced wholesale on a track change, so it cannot be the identity.
         self._session_id: str | None = None
@@ -312,6 +350,10 @@ class NotificationsWrapper(QObject):
 
         self._last_sent_key: tuple | None = None
         self._last_sent_at: float = 0.0
+        # What the dock last confirmed, for the heartbeat to re-send as it is.
+        self._last_payload: dict | None = None
+        self._last_frame: bytes | None = None
+        self._heartbeat_at: float | None = None
         self._last_device_ok: bool | None = None
         self._last_discovery_at: float = 0.0
 
@@ -390,13 +432,12 @@ class NotificationsWrapper(QObject):
         asyncio.create_task(self._run_command(command))
 
     async def _run_command(self, command: str):
-        method_name = TRANSPORT_COMMANDS.get(command)
         session = self._session
-        if session is None or method_name is None:
+        if session is None or command not in TRANSPORT_COMMANDS:
             logger.debug('Ignoring transport command %r', command)
             return
         try:
-            accepted = await getattr(session, method_name)()
+            accepted = await session.run_command(command)
             logger.info(
                 'Transport command %s: %s',
                 command,
@@ -416,8 +457,35 @@ class NotificationsWrapper(QObject):
         self._last_sent_key = None
         self._last_device_ok = None
         self._schedule_refresh()
+        asyncio.create_task(self._watch.restart())
 
-    def _schedule_refresh(self, poll: bool = False):
+    def _on_dock_event(self, event: dict):
+        """Something the dock reported over the watch connection.
+
+        A hello from a dock that has shown nothing since it started, or that
+        holds other artwork than we last sent, has lost what it was showing -
+        it restarted, or the app did. So has one whose watch connection just
+        dropped, as far as we can tell. Either way the last push goes again,
+        as a heartbeat would have sent it, only without the wait.
+        """
+        kind = event.get('event')
+        if kind == 'command':
+            metrics.increment('watch.commands')
+            self._start_command(event.get('command'))
+        elif kind == 'hello':
+            if self._last_payload is not None and (
+                event.get('fresh') or event.get('art_id') != self.device.device_art_id
+            ):
+                logger.info('Dock has lost what it was showing; re-sending')
+                self._schedule_refresh(REFRESH_HEARTBEAT)
+        elif kind == 'resumed':
+            self._schedule_refresh(REFRESH_HEARTBEAT)
+        elif kind == 'lost':
+            # Back to the timer until the connection is up again.
+            if self._last_payload is not None:
+                self._heartbeat_at = time.monotonic() + HEARTBEAT_SECONDS
+
+    def _schedule_refresh(self, mode: int = REFRESH_EVENT):
         """Ask for a refresh, collapsing a burst of events into one.
 
         A single track change raises a handful of WinRT events in the same
@@ -426,34 +494,62 @@ class NotificationsWrapper(QObject):
         just sets a flag, and runs exactly once more when it finishes, so the
         last state is never missed but the middle of a burst is not fetched.
 
-        Every refresh goes through here, the poll included. get_now_playing()
-        awaits twice on cross-process calls, so two runs overlapping would
-        interleave on the artwork and dedupe state - and the loser would write
-        back the metadata it read before the track changed.
+        Every refresh goes through here, the poll and the heartbeat included.
+        get_now_playing() awaits twice on cross-process calls, so two runs
+        overlapping would interleave on the artwork and dedupe state - and the
+        loser would write back the metadata it read before the track changed.
         """
         # A handler can still fire while the loop is winding down; starting a
         # push from there would only race the teardown.
         if self._stop_event is not None and self._stop_event.is_set():
             return
+        metrics.increment('refresh.requested')
 
-        # An event refresh outranks a poll: a poll may reuse the artwork
-        # already held, an event may not, so a poll must not downgrade one.
-        self._refresh_poll = poll and (self._refresh_poll or not self._refresh_wanted)
-        self._refresh_wanted = True
+        # The strongest request wins: a poll may reuse the artwork already held
+        # and an event may not, so a poll must not downgrade one - and a
+        # heartbeat reads nothing at all, so it must not downgrade either.
+        if self._refresh_mode is None or mode > self._refresh_mode:
+            self._refresh_mode = mode
         if self._refresh_task is not None and not self._refresh_task.done():
             return
         self._refresh_task = asyncio.create_task(self._refresh_until_settled())
 
     async def _refresh_until_settled(self):
-        while self._refresh_wanted:
-            self._refresh_wanted = False
-            poll, self._refresh_poll = self._refresh_poll, False
-            await self.get_now_playing(poll=poll)
+        while self._refresh_mode is not None:
+            mode, self._refresh_mode = self._refresh_mode, None
+            metrics.increment('refresh.run')
+            # How many requests each run has answered: the burst of events a
+            # track change raises is meant to collapse into very few reads.
+            metrics.set_gauge(
+                'refresh.coalescing_ratio',
+                round(metrics.counter('refresh.requested') / metrics.counter('refresh.run'), 2),
+            )
+            if mode == REFRESH_TIMELINE:
+                await self._refresh_timeline()
+                continue
+            if mode == REFRESH_HEARTBEAT:
+                await self._heartbeat()
+                continue
+            self._settled = False
+            with metrics.timed('refresh.poll' if mode == REFRESH_POLL else 'refresh.event'):
+                await self.get_now_playing(poll=mode == REFRESH_POLL)
+            # Only a refresh that reached the dock and was confirmed counts as
+            # quiet. Anything else - a failed push, a dropped read - keeps the
+            # poll at its tightest.
+            settled = self._settled and bool(self._last_device_ok) and self._last_sent_key is not None
+            # Only a poll that found nothing to do widens the gap. Events arrive
+            # in bursts, and letting each one count as a quiet poll would take
+            # the interval to its maximum on a single track change.
+            if mode == REFRESH_POLL:
+                self._poll.reschedule(time.monotonic(), settled)
+            elif not settled:
+                self._poll.tighten(time.monotonic())
+            logger.debug('Next poll in %ds', self._poll.interval)
 
     async def _cancel_refresh(self):
         """Drop any refresh still in flight, so nothing pushes as we tear down."""
         task, self._refresh_task = self._refresh_task, None
-        self._refresh_wanted = False
+        self._refresh_mode = None
         if task is None or task.done():
             return
         task.cancel()
@@ -472,80 +568,74 @@ class NotificationsWrapper(QObject):
             self._pending_address = None
             self.device.set_address(host, port)
 
-        self._manager = await media_control.GlobalSystemMediaTransportControlsSessionManager.request_async()
-        self._manager_token = self._manager.add_current_session_changed(self._on_current_session_changed)
+        if self._state_dir is not None:
+            self._restoring = asyncio.create_task(self._restore_last_push())
+
+        if self.source is None:
+            self.source = default_source()
+        await self.source.start(self._on_current_session_changed)
+        self._listening = True
 
-        self._bind_session(self._manager.get_current_session())
+        self._bind_session(self.source.current_session())
         self._schedule_refresh()
+        self._watch.start()
         logger.info('Listening for media session changes.')
 
-        # Wake on stop, otherwise re-check on the poll interval.
+        # Wake on stop, otherwise on whichever of the poll and the heartbeat is
+        # due first. No heartbeat while the dock is watched.
         while not self._stop_event.is_set():
+            now = time.monotonic()
+            wake_at = self._poll.due_at
+            if self._heartbeat_at is not None and not self._watch.connected:
+                wake_at = min(wake_at, self._heartbeat_at)
             try:
-                await asyncio.wait_for(self._stop_event.wait(), timeout=POLL_SECONDS)
+                await asyncio.wait_for(self._stop_event.wait(), timeout=max(0.0, wake_at - now))
             except TimeoutError:
-                self._schedule_refresh(poll=True)
+                # Both pushed forward as they are requested rather than when the
+                # refresh ends, so one still running cannot have this spin.
+                now = time.monotonic()
+                if now >= self._poll.due_at:
+                    self._poll.due_at = now + self._poll.interval
+                    self._schedule_refresh(REFRESH_POLL)
+                elif self._heartbeat_at is not None and now >= self._heartbeat_at and not self._watch.connected:
+                    self._heartbeat_at = now + HEARTBEAT_SECONDS
+                    self._schedule_refresh(REFRESH_HEARTBEAT)
 
         # Detach before cancelling: a handler that fired in between would
         # otherwise queue a refresh onto a loop that is about to close.
         self._cancel_session_grace()
         self._bind_session(None)
-        self._unbind_manager()
+        self._cancel_settle()
+        if self._timeline_timer is not None:
+            self._timeline_timer.cancel()
+        self._listening = False
+        self.source.stop()
+        await self._watch.stop()
         await self._cancel_refresh()
+        if self._restoring is not None:
+            self._restoring.cancel()
+        for task in list(self._encoding.values()):
+            task.cancel()
         logger.info('Stopped listening.')
 
     # -- Session plumbing --------------------------------------------------
 
-    def _unbind_manager(self):
-        """Let go of the session manager and its subscription.
-
-        Left attached, WinRT keeps a delegate into this process alive until it
-        exits, and can call it while the loop is already closing.
-
-        This does not silence the "Exception ignored in
-        _DeleteDummyThreadOnDel.__del__" pair sometimes printed on exit. That
-        comes from the Thread objects CPython fabricates for the Windows
-        thread-pool threads WinRT calls back on: they stay registered until
-        those threads die, which is never, so they are collected during
-        interpreter finalization after threading's own globals have gone. The
-        message is harmless and not ours to fix - but unhooking is still right.
-        """
-        manager, token = self._manager, self._manager_token
-        self._manager = None
-        self._manager_token = None
-        if manager is None or token is None:
-            return
-        try:
-            manager.remove_current_session_changed(token)
-        except Exception:
-            logger.debug('Could not detach from the session manager', exc_info=True)
-
     def _bind_session(self, session):
         """Attach change handlers to the current session, detaching the old one."""
-        if self._session is not None and self._session_tokens is not None:
-            properties_token, playback_token = self._session_tokens
-            try:
-                self._session.remove_media_properties_changed(properties_token)
-                self._session.remove_playback_info_changed(playback_token)
-            except Exception:
-                # The old session may already be gone; nothing to unhook.
-                logger.debug('Could not detach from the previous session', exc_info=True)
+        if self._session is not None:
+            self._session.unsubscribe()
 
         self._session = session
-        self._session_tokens = None
-        self._session_id = session.source_app_user_model_id if session is not None else None
+        self._session_id = session.source_id if session is not None else None
 
         if session is None:
             logger.info('No active media session.')
             return
 
-        self._session_tokens = (
-            session.add_media_properties_changed(self._on_session_event),
-            session.add_playback_info_changed(self._on_session_event),
-        )
-        logger.debug('Bound to media session %s', session.source_app_user_model_id)
+        session.subscribe(self._on_session_event)
+        logger.debug('Bound to media session %s', session.source_id)
 
-    def _on_current_session_changed(self, sender, args):
+    def _on_current_session_changed(self):
         """The user switched player, or the last one closed."""
         loop = self._loop
         if loop is None:
@@ -553,11 +643,11 @@ class NotificationsWrapper(QObject):
         loop.call_soon_threadsafe(self._handle_session_change)
 
     def _handle_session_change(self):
-        if self._manager is None:
+        if not self._listening:
             return
 
-        session = self._manager.get_current_session()
-        new_id = session.source_app_user_model_id if session is not None else None
+        session = self.source.current_session()
+        new_id = session.source_id if session is not None else None
 
         if new_id is not None and new_id == self._session_id:
             # Same player, but usually a brand new session object: a source that
@@ -595,11 +685,11 @@ class NotificationsWrapper(QObject):
         """Commit the loss of a session, unless the player comes back first."""
         await asyncio.sleep(SESSION_GRACE_SECONDS)
         self._session_grace = None
-        if self._manager is None:
+        if not self._listening:
             return
 
-        session = self._manager.get_current_session()
-        new_id = session.source_app_user_model_id if session is not None else None
+        session = self.source.current_session()
+        new_id = session.source_id if session is not None else None
         if new_id == self._session_id:
             # Back without ever raising the event that would have told us.
             logger.debug('Session %s is back', self._session_id)
@@ -616,32 +706,130 @@ class NotificationsWrapper(QObject):
         if task is not None and not task.done():
             task.cancel()
 
-    def _on_session_event(self, sender, args):
+    def _on_session_event(self, event):
         """WinRT calls this on a pool thread - hop back onto our loop."""
         loop = self._loop
         if loop is None:
             return
-        loop.call_soon_threadsafe(self._schedule_refresh)
+        loop.call_soon_threadsafe(self._handle_session_event, event)
+
+    def _handle_session_event(self, event):
+        """Refresh for a session event: playback at once, properties once settled.
+
+        Each properties event restarts the wait, so a burst is read once, after
+        its last event. A playback event refreshes straight away and takes any
+        properties still waiting with it, since that read covers them too. A
+        timeline event only re-reads the position, and not at all while a full
+        read is waiting, which reads the position as well.
+        """
+        if event == EVENT_TIMELINE:
+            if self._settle_timer is None:
+                self._schedule_timeline()
+            return
+        if event != EVENT_PROPERTIES:
+            self._cancel_settle()
+            self._schedule_refresh()
+            return
+        if self._settle_timer is not None:
+            self._settle_timer.cancel()
+        cost = self.device.handshake_cost or 0.0
+        wait = min(max(PROPERTIES_SETTLE_SECONDS, cost), PROPERTIES_SETTLE_MAX_SECONDS)
+        self._settle_timer = asyncio.get_running_loop().call_later(wait, self._properties_settled)
+
+    def _properties_settled(self):
+        self._settle_timer = None
+        self._schedule_refresh()
+
+    def _cancel_settle(self):
+        timer, self._settle_timer = self._settle_timer, None
+        if timer is not None:
+            timer.cancel()
+
+    def _schedule_timeline(self):
+        if self._timeline_timer is not None:
+            # One is already waiting, and will read whatever is latest.
+            return
+        wait = max(0.0, self._timeline_read_at + TIMELINE_INTERVAL_SECONDS - time.monotonic())
+        self._timeline_timer = asyncio.get_running_loop().call_later(wait, self._timeline_due)
+
+    def _timeline_due(self):
+        self._timeline_timer = None
+        self._timeline_read_at = time.monotonic()
+        self._schedule_refresh(REFRESH_TIMELINE)
 
     # -- Reporting ---------------------------------------------------------
 
-    async def _push(self, payload, frame_bytes):
+    async def _heartbeat(self):
+        """Re-send the last confirmed push, without reading the session again.
+
+        The dock answers a header for artwork it already holds without asking
+        for the body, so a healthy one costs a round trip. One that restarted
+        asks for the frame, and gets the one that was sent last time. The
+        position is brought up to date on the way, since a heartbeat stands in
+        for any timeline refresh queued behind it.
+        """
+        if self._last_payload is None:
+            return
+        logger.debug('Heartbeat')
+        await self._refresh_timeline(force=True)
+
+    async def _refresh_timeline(self, force: bool = False):
+        """Re-anchor the position in the window and on the dock, and nothing else.
+
+        What a timeline event gets instead of a refresh. The playback info and
+        the timeline are all it reads, both synchronous and cheap. The artwork,
+        frames and dedupe key are left alone: the dock is sent the last
+        confirmed push with the new anchor, which _push() lets through only if
+        the bar has moved, or if `force`d by the heartbeat. A dock too old to
+        draw the bar is sent the push unchanged.
+        """
+        payload = self._last_payload
+        session = self._session
+        if session is not None and self._session_grace is None and self._track_shown:
+            playback = session.playback_info()
+            timeline = session.timeline(playback)
+            previous = payload.get('timeline') if payload is not None else None
+            if timeline is not None and previous is not None and timeline.end != previous.end:
+                # A different length is a different track, arriving ahead of its
+                # properties event. That wants a proper read, not a new anchor
+                # on the last track's text.
+                self._schedule_refresh()
+                return
+            self.signal_timeline.emit(timeline, playback.status == 'PLAYING')
+            if payload is not None and self.device.protocol >= PROGRESS_PROTO:
+                payload = {key: value for key, value in payload.items() if key != 'timeline'}
+                if timeline is not None:
+                    payload['timeline'] = timeline
+        if payload is not None:
+            await self._push(payload, self._last_frame, force=force)
+
+    async def _push(self, payload, frame_bytes, force: bool = False):
         """Send one state to the dock, skipping anything it already has.
 
         Beyond saving the round trip, deduping keeps the device from re-applying
-        identical text to a label that is mid-scroll. The heartbeat forces one
-        through periodically so a device that restarted picks the display back
+        identical text to a label that is mid-scroll. A repeat is let through
+        once HEARTBEAT_SECONDS have passed, and `force` lets the heartbeat
+        through regardless, so a device that restarted picks the display back
         up without waiting for the next song.
         """
+        if self._restoring is not None:
+            await self._restoring
+
         # 'light' is in the key because it can change on its own: the user moves
         # the brightness slider, or switches the feature off, while the track and
         # its artwork stay exactly as they are. Without it that push looks like a
         # repeat and is dropped for up to HEARTBEAT_SECONDS. It is a tuple or
         # None for the same reason - this key has to be hashable.
-        payload_key = tuple(payload.get(key) for key in ('status', 'title', 'artist', 'album', 'art_id', 'light'))
+        payload_key = _payload_key(payload)
         now = time.monotonic()
-        if payload_key == self._last_sent_key and now - self._last_sent_at < HEARTBEAT_SECONDS:
+        if (
+            not force
+            and payload_key == self._last_sent_key
+            and now - self._last_sent_at < HEARTBEAT_SECONDS
+            and not self._progress_moved(payload)
+        ):
             logger.debug('No change since last push; skipping')
+            metrics.increment('push.deduped')
             return
 
         if not self.device.host:
@@ -650,17 +838,143 @@ class NotificationsWrapper(QObject):
                 self._report_device(SendResult(False, 'No dock configured'))
                 return
 
-        logger.info('Pushing: %s', payload)
+        # Past the allowance, wait for the bucket. A read asked for while
+        # waiting will find newer state than this and push that instead, so
+        # this one is dropped - unless forced, which is a dock that has lost its
+        # display and must be sent something whatever the next read finds. A
+        # timeline refresh or a heartbeat only re-sends the last push with a new
+        # anchor, so it supersedes a push that would only have moved the bar.
+        wait = self._limiter.wait(time.monotonic())
+        if wait > 0:
+            metrics.increment('push.paced')
+            logger.debug('Pacing pushes; waiting %.0fms', wait * 1000)
+            await asyncio.sleep(wait)
+            pending = self._refresh_mode
+            if not force and pending is not None and (pending >= REFRESH_POLL or payload_key == self._last_sent_key):
+                metrics.increment('push.superseded')
+                return
+            now = time.monotonic()
+
+        # The whole payload only at debug: at info this is the one line per push
+        # an installed copy writes to its log file, and the timeline and light
+        # say little there.
+        logger.info(
+            'Pushing %s: %r by %r, art %s', payload['status'], payload['title'], payload['artist'], payload['art_id']
+        )
+        logger.debug('Payload: %s', payload)
         result = self.device.send(payload, frame_bytes)
+        self._limiter.spend(time.monotonic(), self.device.handshake_cost)
         if result:
             self._last_sent_key = payload_key
             self._last_sent_at = now
+            self._last_payload = payload
+            self._last_frame = frame_bytes
+            self._heartbeat_at = now + HEARTBEAT_SECONDS
+            if payload_key != self._saved_key:
+                self._save_last_push(payload, payload_key)
         else:
-            # Retry on the next event rather than waiting for a change.
+            # Retry on the next event rather than waiting for a change, and do
+            # not wait out a backed-off poll for that event either.
             self._last_sent_key = None
+            self._last_payload = None
+            self._last_frame = None
+            self._heartbeat_at = None
+            self._poll.tighten(time.monotonic())
             await self._maybe_rediscover()
         self._report_device(result)
 
+    def _save_last_push(self, payload, payload_key):
+        """Keep a confirmed push for the next launch. Only called on a change.
+
+        Written here on the loop rather than handed off: it is two small files,
+        once per track, and writes from two threads could cross.
+        """
+        if self._state_dir is None:
+            return
+        art_id = payload.get('art_id')
+        thumbnail = None
+        if art_id is not None and art_id != self._saved_art_id:
+            # The picker holds the bytes this art_id was made from, except while
+            # the artwork is pending - and then art_id is the dock's previous
+            # one, which was saved with its own thumbnail already.
+            current = self._artwork.current
+            if art_id_for(current) == art_id:
+                thumbnail = current
+                self._saved_art_id = art_id
+        last_push.save(
+            self._state_dir,
+            LastPush(
+                host=self.device.host,
+                port=self.device.port,
+                protocol=self.device.protocol,
+                frame_size=self.device.frame_size,
+                payload=payload,
+                thumbnail=thumbnail,
+            ),
+        )
+        self._saved_key = payload_key
+
+    async def _restore_last_push(self):
+        """Show the last run's final push, and pick up what it learned of the dock.
+
+        Runs alongside binding the session, which on Windows is the slow part of
+        starting. The window gets the saved track at once, unless the session
+        has already been read by the time its cover is ready. The link gets the
+        dock's protocol and frame size, so the first push goes binary and the
+        watch connection opens without a JSON round trip first.
+
+        Nothing is sent to the dock. The saved payload has no timeline, so a
+        restored header would not spare the first read's push, which has to
+        start the position bar. And that push costs no frame if the dock still
+        holds the artwork: it answers the art_id by not asking for one.
+        """
+        try:
+            last = last_push.load(self._state_dir)
+            if last is None or last.payload.get('status') == 'IDLE':
+                return
+            payload = last.payload
+            self._saved_key = _payload_key(payload)
+            self._saved_art_id = payload.get('art_id') if last.thumbnail is not None else None
+
+            artwork = None
+            if last.thumbnail is not None and not self._live_shown:
+                artwork = await self._prepare_artwork(last.thumbnail, payload['art_id'])
+            if not self._live_shown:
+                self.signal_track.emit(
+                    TrackInfo(
+                        title=payload.get('title', ''),
+                        artist=payload.get('artist', ''),
+                        album=payload.get('album', ''),
+                        status=payload.get('status', ''),
+                        art_id=payload.get('art_id'),
+                        artwork=artwork,
+                    )
+                )
+
+            if (last.host, last.port) != (self.device.host, self.device.port):
+                return
+            self.device.restore(last.frame_size, last.protocol)
+        except Exception:
+            logger.exception('Could not restore the last push')
+
+    def _progress_moved(self, payload) -> bool:
+        """Whether the dock's position bar has drifted from the source.
+
+        The timeline stays out of the dedupe key: every read dates a new anchor,
+        and the dock counts on from the one it was sent. This compares where
+        that anchor and the new one put playback now, which only differ after a
+        seek or a change of rate.
+        """
+        previous = self._last_payload.get('timeline') if self._last_payload else None
+        timeline = payload.get('timeline')
+        if timeline is None or previous is None:
+            return (timeline is None) != (previous is None)
+        playing = payload['status'] == 'PLAYING'
+        return (
+            timeline.end != previous.end
+            or abs(timeline.position_at(playing) - previous.position_at(playing)) > PROGRESS_RESYNC_SECONDS
+        )
+
     async def _maybe_rediscover(self):
         """After a failed push, see whether the dock simply moved."""
         if not settings.auto_discover():
@@ -692,6 +1006,7 @@ class NotificationsWrapper(QObject):
         self.device.set_address(device.host, device.port)
         self._last_sent_key = None
         self._last_device_ok = None
+        await self._watch.restart()
         self.signal_device_discovered.emit(device.host, device.port)
         return True
 
@@ -702,6 +1017,8 @@ class NotificationsWrapper(QObject):
         if ok == self._last_device_ok:
             return
         self._last_device_ok = ok
+        if ok:
+            metrics.startup('first_push')
         self.signal_device_state.emit(ok, message)
 
     async def _read_media_properties(self, session):
@@ -731,8 +1048,10 @@ class NotificationsWrapper(QObject):
         window and the dock holding the previous player's last track.
         """
         try:
-            properties = await session.try_get_media_properties_async()
+            with metrics.timed('session.read_properties'):
+                properties = await session.read_properties()
         except Exception:
+            metrics.increment('session.unreadable')
             # Read from what we bound rather than from the session itself, which
             # is in no state to be asked anything else.
             session_id = self._session_id or 'unknown'
@@ -769,8 +1088,8 @@ class NotificationsWrapper(QObject):
                 return
 
             session = self._session
-            if session is None and self._manager is not None:
-                session = self._manager.get_current_session()
+            if session is None and self._listening:
+                session = self.source.current_session()
                 if session is not None:
                     self._bind_session(session)
 
@@ -787,6 +1106,8 @@ class NotificationsWrapper(QObject):
                 if self._session is not session or self._session_grace is not None:
                     logger.debug('Session changed while reading; dropping the read')
                     return
+                self._live_shown = True
+                self._track_shown = False
                 self.signal_track.emit(None)
                 # Tell the dock too, so it drops the last track's artwork and
                 # goes back to its placeholder rather than showing a stale one.
@@ -794,15 +1115,18 @@ class NotificationsWrapper(QObject):
                 self._frames.clear()
                 self._colours.clear()
                 await self._push(dict(IDLE_PAYLOAD), None)
+                # A player starting raises the session-changed event, so there
+                # is nothing here for a poll to catch.
+                self._settled = True
                 return
 
-            playback_info = session.get_playback_info()
-            status = playback_info.playback_status
-            timeline = _read_timeline(session, playback_info)
+            playback_info = session.playback_info()
+            status = playback_info.status
+            timeline = session.timeline(playback_info)
 
-            title = media_props.title or ''
-            artist = media_props.artist or ''
-            album = media_props.album_title or ''
+            title = media_props.title
+            artist = media_props.artist
+            album = media_props.album
             track_key = (title, artist, album)
 
             # The chase allowance belongs to the track, so it is reset here rather
@@ -811,6 +1135,8 @@ class NotificationsWrapper(QObject):
             if track_key != self._chase_key:
                 self._chase_key = track_key
                 self._chases = 0
+                # What the chase reads are counted against.
+                metrics.increment('session.tracks')
 
             # A poll tick re-reads the metadata cheaply, but the thumbnail is a
             # cross-process stream read - worth skipping once we hold artwork
@@ -825,9 +1151,11 @@ class NotificationsWrapper(QObject):
                 self._artwork.key == track_key and self._artwork.settled and self._artwork.best_area >= GOOD_ART_AREA
             )
             if poll and holding_good_art:
+                metrics.increment('session.thumbnail_skipped')
                 thumb_bytes = self._artwork.current
             else:
-                raw_thumb = await get_thumbnail_data(media_props.thumbnail)
+                with metrics.timed('session.read_thumbnail'):
+                    raw_thumb = await session.read_thumbnail(media_props)
                 if raw_thumb:
                     thumb_bytes = self._artwork.best_for(track_key, raw_thumb)
                 elif self._artwork.key == track_key:
@@ -887,46 +1215,53 @@ class NotificationsWrapper(QObject):
                 )
                 art_id = self.device.device_art_id
                 frame_bytes = None
+                artwork = None
                 width, height = self.device.frame_size
             elif thumb_bytes:
-                frame_bytes, width, height = self._frames.frame_for(
-                    thumb_bytes,
-                    art_id,
-                    self.device.frame_size,
+                (frame_bytes, width, height), artwork = await asyncio.gather(
+                    self._frame(thumb_bytes, art_id, self.device.frame_size),
+                    self._prepare_artwork(thumb_bytes, art_id),
                 )
+                if self._session is not session or self._session_grace is not None:
+                    # Encoding awaits too, and the same teardown race applies.
+                    logger.debug('Session changed while encoding %r; dropping the read', title)
+                    return
                 if frame_bytes is None:
                     # Undecodable. Announcing an art_id we cannot then supply
                     # would only earn a geometry error from the device.
                     art_id = None
-                    self._frames.clear()
                     self._colours.clear()
             else:
+                # FrameCache is left alone: it is keyed by artwork, so a track
+                # with none does not invalidate what it holds, and the cover
+                # coming back is then a cache hit.
                 logger.debug('No thumbnail available.')
                 frame_bytes, width, height = None, 0, 0
-                self._frames.clear()
+                artwork = None
                 self._colours.clear()
 
-            can_previous, can_next, can_play_pause = _available_controls(playback_info)
+            self._live_shown = True
+            self._track_shown = True
             self.signal_track.emit(
                 TrackInfo(
                     title=title,
                     artist=artist,
                     album=album,
-                    status=status.name,
+                    status=status,
                     art_id=art_id,
                     # Withheld rather than downgraded: the window keeps the image it
                     # has and marks it stale, instead of flashing up a 60x60 leftover.
-                    thumbnail=None if artwork_pending else thumb_bytes,
+                    artwork=artwork,
                     artwork_pending=artwork_pending,
                     timeline=timeline,
-                    can_previous=can_previous,
-                    can_next=can_next,
-                    can_play_pause=can_play_pause,
+                    can_previous=playback_info.can_previous,
+                    can_next=playback_info.can_next,
+                    can_play_pause=playback_info.can_play_pause,
                 )
             )
 
             payload = {
-                'status': status.name,
+                'status': status,
                 'title': title,
                 'artist': artist,
                 'album': album,
@@ -934,16 +1269,121 @@ class NotificationsWrapper(QObject):
                 'width': width,
                 'height': height,
             }
+            # The anchor, not a position: DeviceLink turns it into one at send
+            # time, so a heartbeat re-sending this payload is still accurate.
+            if timeline is not None:
+                payload['timeline'] = timeline
             light = self._light_spec(thumb_bytes, art_id, artwork_pending)
             if light is not _NO_LIGHT:
                 payload['light'] = light
             await self._push(payload, frame_bytes)
 
+            # Settled enough to back the poll off: the artwork is this track's
+            # own and good enough to stop looking for a better one, and the
+            # source is not paused - a paused source raises no events, so a
+            # cover it publishes late is only ever found by polling.
+            self._settled = (
+                not artwork_pending
+                and status != 'PAUSED'
+                and self._artwork.key == track_key
+                and self._artwork.settled
+                and self._artwork.best_area >= GOOD_ART_AREA
+            )
+
             await self._chase_artwork(artwork_pending)
 
         except Exception:
             logger.exception('Failed to read or push the current media session')
 
+    # -- Frames ------------------------------------------------------------
+
+    async def _frame(self, thumb_bytes, art_id, size):
+        """The encoded frame for this artwork at this size, encoding it if need be.
+
+        Resize and pack run on the executor rather than the loop: a frame is
+        tens of milliseconds of Pillow work, and the loop is also what answers
+        WinRT events and transport commands.
+        """
+        cached = self._frames.get(art_id, size)
+        if cached is not None:
+            return cached
+        return await self._prepare_frame(thumb_bytes, art_id, size)
+
+    async def _prepare_artwork(self, thumb_bytes, art_id):
+        """The window's images of this cover, made on the executor.
+
+        Only the taskbar images the settings ask for, which are read here so a
+        change to them is picked up by the refresh refresh_settings() causes.
+        """
+        pixel_ratio = self.art_pixel_ratio
+        icons = settings.taskbar_artwork_icon()
+        previews = settings.taskbar_media_controls()
+        artwork = self._prepared.get(art_id, pixel_ratio, icons, previews)
+        if artwork is None:
+            loop = asyncio.get_running_loop()
+            with metrics.timed('artwork.prepare'):
+                artwork = await loop.run_in_executor(
+                    None, prepare_artwork, thumb_bytes, art_id, pixel_ratio, icons, previews
+                )
+            if artwork is not None:
+                self._prepared.store(artwork)
+        return artwork
+
+    def _prepare_frame(self, thumb_bytes, art_id, size) -> asyncio.Task:
+        """Start encoding a frame, or join an encode of it already under way."""
+        key = (art_id, size)
+        task = self._encoding.get(key)
+        if task is None:
+            task = asyncio.create_task(self._encode_frame(thumb_bytes, art_id, size))
+            self._encoding[key] = task
+        return task
+
+    async def _encode_frame(self, thumb_bytes, art_id, size):
+        try:
+            loop = asyncio.get_running_loop()
+            with metrics.timed('frame.encode'):
+                entry = await loop.run_in_executor(None, resize_thumbnail, thumb_bytes, size)
+            self._frames.store(art_id, size, entry)
+            return entry
+        finally:
+            self._encoding.pop((art_id, size), None)
+
+    def _on_frame_size(self, size):
+        """The dock reported a geometry we were not encoding for.
+
+        Called from inside DeviceLink.send(), mid-push, which is the earliest
+        anything can know. That push may still have gone through - a header
+        with no frame behind it is answered as usual - but any frame it carried
+        was the old size and refused, and the next one needs the new size
+        either way. So rather than leave the frame to be encoded on the next
+        media event, start it now and push again as soon as it is ready. Polls
+        reuse the artwork held, so that push costs no thumbnail read.
+
+        Encoding starts a task, which only the loop's own thread may do. A
+        send() made anywhere else has the call handed over to the loop.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is not self._loop:
+            if self._loop is not None:
+                self._loop.call_soon_threadsafe(self._on_frame_size, size)
+            return
+        thumb_bytes = self._artwork.current
+        art_id = art_id_for(thumb_bytes)
+        if art_id is None or self._frames.get(art_id, size) is not None:
+            return
+        logger.debug('Encoding %s for the new %dx%d geometry ahead of the next push', art_id, *size)
+        task = self._prepare_frame(thumb_bytes, art_id, size)
+        task.add_done_callback(self._after_geometry_encode)
+
+    def _after_geometry_encode(self, task: asyncio.Task):
+        if task.cancelled() or task.exception() is not None:
+            return
+        self._last_sent_key = None
+        self._schedule_refresh(REFRESH_POLL)
+
     def _light_spec(self, thumb_bytes, art_id, artwork_pending: bool):
         """What to tell the dock about its ambient light, if anything.
 
@@ -993,6 +1433,7 @@ class NotificationsWrapper(QObject):
             return
 
         self._chases += 1
+        metrics.increment('artwork.chase_reads')
         if self._chases >= ARTWORK_CHASE_LIMIT:
             # Out of allowance, so publish whatever is true now rather than going
             # round again on every later read. Either this track and the one
@@ -1007,6 +1448,7 @@ class NotificationsWrapper(QObject):
                 self._chases,
             )
             self._artwork.keep_as_own()
+            metrics.increment('artwork.chase_exhausted')
             self._schedule_refresh()
             return
 
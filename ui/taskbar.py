@@ -50,23 +50,12 @@ import logging
 
 from PyQt5.QtCore import QObject, QRectF, Qt, pyqtSignal
 from PyQt5.QtGui import QBrush, QColor, QIcon, QPainter, QPainterPath, QPen, QPixmap
-from PyQt5.QtWinExtras import QWinTaskbarButton, QWinThumbnailToolBar, QWinThumbnailToolButton
 
 import settings
+from ui.artwork import LIVE_PREVIEW_SIZE, THUMBNAIL_SIZE, Artwork, compose_thumbnail
 
 logger = logging.getLogger(__name__)
 
-# Windows asks for the thumbnail at whatever size it wants and scales what it
-# gets. Composing at a fixed 16:10 means the aspect never changes under it, so a
-# cover is never stretched; these are generous enough that the downscale is the
-# only resampling that happens.
-THUMBNAIL_SIZE = (320, 200)
-LIVE_PREVIEW_SIZE = (640, 400)
-
-# The client's own panel colour, so the ground behind a square cover on a wide
-# thumbnail looks like part of this app rather than an accident.
-THUMBNAIL_GROUND = QColor(26, 33, 51)
-
 # Drawn large and scaled down: the badge lands at 16x16 on a standard DPI and
 # more on a scaled display, and Windows picks whichever it wants from the icon.
 BADGE_SIZE = 32
@@ -77,10 +66,6 @@ BADGE_STROKE = 0.05
 
 PROGRESS_STEPS = 1000
 
-# What Windows asks a window icon for: 16 in the title bar, 32 on the taskbar,
-# more again on a scaled display, and 48/256 in Alt-Tab and the task switcher.
-ICON_SIZES = (16, 24, 32, 48, 64, 128, 256)
-
 # DWM window attributes behind the iconic thumbnail.
 # https://learn.microsoft.com/en-us/windows/win32/api/dwmapi/ne-dwmapi-dwmwindowattribute
 DWMWA_FORCE_ICONIC_REPRESENTATION = 7
@@ -162,6 +147,9 @@ def _stop_path(size):
 
 _BADGE_PATHS = {'play': _play_path, 'pause': _pause_path, 'stop': _stop_path}
 
+# Every glyph the toolbar can show. See _transport_icon().
+_TRANSPORT_GLYPHS = ('previous', 'play', 'pause', 'next')
+
 
 def badge_icon(kind: str) -> QIcon:
     """A transport glyph for the taskbar button's corner.
@@ -197,50 +185,29 @@ def badge_icon(kind: str) -> QIcon:
     return icon
 
 
-def _icon_from_artwork(artwork: QPixmap) -> QIcon:
+def _icon_from_artwork(artwork: Artwork) -> QIcon:
     """Build a window icon from a cover, at the sizes Windows actually asks for.
 
     Handing over one 544x544 pixmap and letting Windows shrink it is visibly
-    worse than doing the reduction here: this is a smooth scale per size, where
-    the shell's own is not, and 16px is small enough for the difference to
-    decide whether a cover is recognisable at all - which is the entire reason
-    for putting it there.
+    worse than doing the reduction ourselves: the worker makes a smooth scale
+    per size, where the shell's own is not, and 16px is small enough for the
+    difference to decide whether a cover is recognisable at all - which is the
+    entire reason for putting it there.
     """
     icon = QIcon()
-    for size in ICON_SIZES:
-        icon.addPixmap(
-            artwork.scaled(
-                size,
-                size,
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation,
-            )
-        )
+    for image in artwork.icons:
+        icon.addPixmap(QPixmap.fromImage(image))
     return icon
 
 
-def compose_thumbnail(artwork: QPixmap | None, size) -> QPixmap:
-    """Fit artwork onto a wide, dark ground for the hover preview."""
-    width, height = size
-    canvas = QPixmap(width, height)
-    canvas.fill(THUMBNAIL_GROUND)
-    if artwork is None or artwork.isNull():
-        return canvas
-
-    scaled = artwork.scaled(
-        width,
-        height,
-        Qt.KeepAspectRatio,
-        Qt.SmoothTransformation,
-    )
-    painter = QPainter(canvas)
-    painter.drawPixmap(
-        (width - scaled.width()) // 2,
-        (height - scaled.height()) // 2,
-        scaled,
-    )
-    painter.end()
-    return canvas
+def _preview_pixmap(artwork: Artwork | None, live: bool) -> QPixmap:
+    """The prepared hover preview, or the bare ground while there is none."""
+    image = None
+    if artwork is not None:
+        image = artwork.live_preview if live else artwork.thumbnail
+    if image is None:
+        image = compose_thumbnail(None, LIVE_PREVIEW_SIZE if live else THUMBNAIL_SIZE)
+    return QPixmap.fromImage(image)
 
 
 class TaskbarIntegration(QObject):
@@ -255,13 +222,24 @@ class TaskbarIntegration(QObject):
         self._thumbbar = None
         self._buttons = {}
         self._app_icon = window.windowIcon()
-        # cacheKey() of the artwork the icon was last built from, or None for
-        # the app mark. See _apply_icon().
-        self._icon_key = None
+        # The artwork the icon was last built from, or None for the app mark.
+        # See _apply_icon().
+        self._icon_artwork = None
         self._have_progress = False
+        # What the bar was last set to, as (value, playing). See set_progress().
+        self._progress_shown = None
         # Whether the hover preview is currently ours rather than Windows' own.
         self._iconic_enabled = False
 
+        # Every glyph drawn once, at attach. They never change, and the badge
+        # would otherwise be painted afresh on every play/pause.
+        self._badges = {}
+        self._transport = {}
+        # The hover previews as pixmaps, for the artwork they were made from.
+        # Windows asks for them again on every hover. See _preview().
+        self._preview_artwork = None
+        self._previews = {}
+
         # What is playing, held rather than acted on directly, so that toggling
         # a setting can re-apply it without waiting for the next track.
         self._artwork = None
@@ -289,6 +267,10 @@ class TaskbarIntegration(QObject):
             return
 
         try:
+            # Here rather than at the top: a client that starts in the tray may
+            # never show its window, and then never needs QtWinExtras at all.
+            from PyQt5.QtWinExtras import QWinTaskbarButton, QWinThumbnailToolBar
+
             self._button = QWinTaskbarButton(self)
             self._button.setWindow(handle)
 
@@ -302,13 +284,15 @@ class TaskbarIntegration(QObject):
             self._thumbbar = None
             return
 
+        self._badges = {kind: badge_icon(kind) for kind in _BADGE_PATHS}
+        self._transport = {kind: _transport_icon(kind) for kind in _TRANSPORT_GLYPHS}
         logger.debug('Taskbar integration attached')
         self.apply_settings()
 
     # -- State -------------------------------------------------------------
 
     def set_track(self, artwork, status, can_previous, can_next, can_play_pause):
-        """Artwork is the undecorated cover, or None."""
+        """Artwork is the prepared cover, or None."""
         self._artwork = artwork
         self._status = status
         self._enabled = {
@@ -338,17 +322,23 @@ class TaskbarIntegration(QObject):
 
         media = settings.taskbar_media_controls()
 
-        if media and self._status:
-            self._button.setOverlayIcon(badge_icon(self._status))
-            self._button.setOverlayAccessibleDescription(self._status)
-        else:
+        # Compared by cacheKey, which the copies of one QIcon share, so a refresh
+        # that changes nothing here makes no call to the shell.
+        badge = self._badges.get(self._status) if media else None
+        if badge is not None:
+            if self._button.overlayIcon().cacheKey() != badge.cacheKey():
+                self._button.setOverlayIcon(badge)
+                self._button.setOverlayAccessibleDescription(self._status)
+        elif not self._button.overlayIcon().isNull():
             self._button.clearOverlayIcon()
 
         if media:
             self._create_buttons()
             for key, button in self._buttons.items():
                 button.setEnabled(self._enabled[key])
-            self._buttons['play_pause'].setIcon(_transport_icon('pause' if self._status == 'play' else 'play'))
+            glyph = self._transport['pause' if self._status == 'play' else 'play']
+            if self._buttons['play_pause'].icon().cacheKey() != glyph.cacheKey():
+                self._buttons['play_pause'].setIcon(glyph)
         else:
             self._destroy_buttons()
 
@@ -362,6 +352,8 @@ class TaskbarIntegration(QObject):
         """Add the transport buttons, if they are not already there."""
         if self._buttons or self._thumbbar is None:
             return
+        from PyQt5.QtWinExtras import QWinThumbnailToolButton
+
         for name, glyph, tip in (
             ('previous', 'previous', 'Previous'),
             ('play_pause', 'play', 'Play / Pause'),
@@ -369,7 +361,7 @@ class TaskbarIntegration(QObject):
         ):
             button = QWinThumbnailToolButton(self._thumbbar)
             button.setToolTip(tip)
-            button.setIcon(_transport_icon(glyph))
+            button.setIcon(self._transport[glyph])
             # The preview should not vanish on a click: the point of these is
             # transport control without going to the window, and pausing then
             # wanting next means re-hovering otherwise.
@@ -441,11 +433,20 @@ class TaskbarIntegration(QObject):
             if self._have_progress:
                 self._button.progress().setVisible(False)
                 self._have_progress = False
+                self._progress_shown = None
+            return
+
+        # The window calls this on every redraw of its own bar, which is far
+        # more often than this one moves. Each setter below is a trip to the
+        # shell, so an unchanged bar is left alone entirely.
+        shown = (round(max(0.0, min(1.0, fraction)) * PROGRESS_STEPS), playing)
+        if shown == self._progress_shown:
             return
+        self._progress_shown = shown
 
         progress = self._button.progress()
         progress.setRange(0, PROGRESS_STEPS)
-        progress.setValue(round(max(0.0, min(1.0, fraction)) * PROGRESS_STEPS))
+        progress.setValue(shown[0])
         progress.setVisible(True)
         self._have_progress = True
         # Paused turns the bar yellow, which is exactly the distinction wanted
@@ -470,6 +471,7 @@ class TaskbarIntegration(QObject):
         if not settings.taskbar_progress() and self._have_progress:
             self._button.progress().setVisible(False)
             self._have_progress = False
+            self._progress_shown = None
 
     # -- Internals ---------------------------------------------------------
 
@@ -480,32 +482,42 @@ class TaskbarIntegration(QObject):
         put artwork there - and it is also the Alt-Tab and title bar icon, which
         is the trade being made.
 
-        Guarded on the identity of the pixmap, not on whether there is one. That
-        distinction is the whole point: a guard on "are we showing artwork?"
-        is true for every track after the first, so the first cover would stick
-        for the rest of the session. QPixmap.cacheKey() changes whenever a new
-        cover is decoded and stays put when the panel re-uses the one it holds,
-        which is exactly the question being asked.
+        Guarded on the identity of the artwork, not on whether there is one.
+        That distinction is the whole point: a guard on "are we showing
+        artwork?" is true for every track after the first, so the first cover
+        would stick for the rest of the session. The worker hands over a new
+        Artwork whenever it prepares a cover and the same one again from its
+        cache, which is exactly the question being asked.
         """
         artwork = self._artwork
-        if not (settings.taskbar_artwork_icon() and artwork is not None and not artwork.isNull()):
+        if not (settings.taskbar_artwork_icon() and artwork is not None and artwork.icons):
             artwork = None
 
-        key = artwork.cacheKey() if artwork is not None else None
-        if key == self._icon_key:
+        if artwork is self._icon_artwork:
             return
-        self._icon_key = key
+        self._icon_artwork = artwork
         self._window.setWindowIcon(_icon_from_artwork(artwork) if artwork is not None else self._app_icon)
 
     def _push_thumbnail(self):
         if self._thumbbar is None or not self._iconic_enabled:
             return
-        self._thumbbar.setIconicThumbnailPixmap(
-            compose_thumbnail(self._artwork, THUMBNAIL_SIZE),
-        )
-        self._thumbbar.setIconicLivePreviewPixmap(
-            compose_thumbnail(self._artwork, LIVE_PREVIEW_SIZE),
-        )
+        self._thumbbar.setIconicThumbnailPixmap(self._preview(live=False))
+        self._thumbbar.setIconicLivePreviewPixmap(self._preview(live=True))
+
+    def _preview(self, live: bool) -> QPixmap:
+        """The hover preview for what is playing, converted once per cover.
+
+        Keyed on the identity of the prepared artwork, like _apply_icon(): the
+        worker hands over a new Artwork for each cover it prepares, so an
+        unchanged one means an unchanged preview.
+        """
+        if self._artwork is not self._preview_artwork:
+            self._preview_artwork = self._artwork
+            self._previews = {}
+        pixmap = self._previews.get(live)
+        if pixmap is None:
+            pixmap = self._previews[live] = _preview_pixmap(self._artwork, live)
+        return pixmap
 
     # Windows asks for these; it does not always stop asking the moment the
     # attributes are cleared. Answering anyway is what made disabling look
@@ -518,17 +530,13 @@ class TaskbarIntegration(QObject):
         if not self._iconic_enabled:
             logger.debug('Thumbnail requested while off - refused')
             return
-        self._thumbbar.setIconicThumbnailPixmap(
-            compose_thumbnail(self._artwork, THUMBNAIL_SIZE),
-        )
+        self._thumbbar.setIconicThumbnailPixmap(self._preview(live=False))
 
     def _send_live_preview(self):
         if not self._iconic_enabled:
             logger.debug('Live preview requested while off - refused')
             return
-        self._thumbbar.setIconicLivePreviewPixmap(
-            compose_thumbnail(self._artwork, LIVE_PREVIEW_SIZE),
-        )
+        self._thumbbar.setIconicLivePreviewPixmap(self._preview(live=True))
 
 
 def _transport_icon(kind: str) -> QIcon:
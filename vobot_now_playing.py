@@ -10,11 +10,12 @@ from PyQt5.QtCore import QThread
 from PyQt5.QtGui import QIcon
 from PyQt5.QtWidgets import QMessageBox
 
+import metrics
 import settings
 import single_instance
 from app_setup import app
 from constants import APP_NAME, ORG_NAME, VERSION
-from init_logging import logger
+from init_logging import add_file_sink, logger
 from paths import APP_ICON
 from ui.mainwindow import MainWindow
 from ui.message_boxes import message_box_error, message_box_ok
@@ -69,6 +70,7 @@ def except_hook(cls, exception, tb):
 
 
 if __name__ == '__main__':
+    metrics.startup('imports')
     app.setApplicationName(APP_NAME)
     app.setApplicationVersion(VERSION)
     app.setOrganizationName(ORG_NAME)
@@ -79,6 +81,9 @@ if __name__ == '__main__':
 
     # Needs the names above, since they decide the settings folder.
     settings.init()
+    # Beside the settings file, where anyone asked for it can find it.
+    metrics.start_snapshots(os.path.join(os.path.dirname(settings.ini_path()), 'metrics.json'))
+    add_file_sink(os.path.join(os.path.dirname(settings.ini_path()), 'log.jsonl'))
 
     # Error handling stuff.
     sys.excepthook = except_hook
@@ -103,9 +108,13 @@ if __name__ == '__main__':
         sys.exit(0)
 
     ui = MainWindow()
+    settings.watch(ui.apply_settings)
     if settings.start_minimized() and ui.tray_icon is not None:
         logger.info('Starting hidden in the notification area.')
     else:
         ui.show()
+    metrics.startup('window')
 
-    sys.exit(app.exec_())
+    exit_code = app.exec_()
+    metrics.stop_snapshots()
+    sys.exit(exit_code)